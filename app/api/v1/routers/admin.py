@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Query, Response, Security
+from app.core import config
+from app.core.security import get_current_active_user
+from app.db.models.users import User
+from app.services.profiler import MEDIA_TYPES, ProfileFormat, ProfilerServices
+from typing import Annotated
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+)
+
+
+def _profile_response(body: bytes, format: ProfileFormat, name: str) -> Response:
+    extension = "pstats" if format == "pstats" else "txt"
+    return Response(
+        content=body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{extension}"'},
+    )
+
+
+@router.post("/profile", response_class=Response)
+async def profile_worker(_: Annotated[User, Security(
+    get_current_active_user, scopes=["admin:read"]
+)],
+        seconds: Annotated[float, Query(gt=0, le=config.PROFILER_MAX_SECONDS)] = 10,
+        interval_ms: Annotated[float, Query(ge=1, le=1000)] = config.PROFILER_DEFAULT_INTERVAL_MS,
+        format: ProfileFormat = "collapsed",
+        include_idle: bool = False):
+    """
+    Profile the worker serving this request for a few seconds.
+
+    Only the worker that receives the call is sampled; other processes are not.
+
+    Args:
+        seconds (float): How long to sample.
+        interval_ms (float): Time between samples.
+        format (ProfileFormat): "collapsed" stacks for flame graphs, or a "pstats" file.
+        include_idle (bool): Keep samples of idle threads.
+
+    Returns:
+        Response: The profile as a file.
+    """
+    profile = await ProfilerServices.profile(seconds, interval_ms)
+    return _profile_response(ProfilerServices.render(profile, format, include_idle), format, "profile")
+
+
+@router.get("/profiles/{profile_id}", response_class=Response)
+def read_request_profile(profile_id: str, _: Annotated[User, Security(
+    get_current_active_user, scopes=["admin:read"]
+)],
+        format: ProfileFormat = "collapsed",
+        include_idle: bool = False):
+    """
+    Download the profile of a request sampled through the profiling header.
+
+    Args:
+        profile_id (str): The request's ``X-Profile-Id`` response header.
+        format (ProfileFormat): "collapsed" stacks for flame graphs, or a "pstats" file.
+        include_idle (bool): Keep samples of idle threads.
+
+    Returns:
+        Response: The profile as a file.
+    """
+    profile = ProfilerServices.get_request_profile(profile_id)
+    return _profile_response(ProfilerServices.render(profile, format, include_idle), format, profile_id)
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from app.db.session import SessionDep
 from app.services.users import UserServices
-from app.services.auth import verify_password, create_access_token
-from app.schemas.auth import Token, TokenPayload
+from app.services.auth import verify_password_async
+from app.services.tokens import TokenServices
+from app.core.security import get_current_token
+from app.schemas.auth import Token, TokenPayload, TokenRefresh
 from app.schemas.users import UserCreate
+from app.core.metrics import LOGINS
 from typing import Annotated
 
 router = APIRouter(
@@ -13,30 +17,59 @@ router = APIRouter(
 )
 
 @router.post("/login", response_model=Token)
-def login_user(session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+async def login_user(session: SessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
     """
-    Authenticate a user and return an access token.
+    Authenticate a user and return an access token and a refresh token.
 
     Args:
         form_data (OAuth2PasswordRequestForm): Form data containing username and password.
 
     Returns:
-        Token: Access token and token type.
+        Token: Access token, refresh token and token type.
 
     Raises:
-        HTTPException: If the credentials are invalid.
+        HTTPException: If the credentials are invalid or the password pool is saturated.
     """
-    user = UserServices.get_user(session, form_data.username)
-    if not user or not verify_password(form_data.password, user.password):
+    user = await run_in_threadpool(UserServices.get_user, session, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.password):
+        LOGINS.labels("failure").inc()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    LOGINS.labels("success").inc()
     
-    access_token = create_access_token(
-        TokenPayload(sub=user.username, scopes=form_data.scopes),
-    )
-    return Token(access_token=access_token, token_type="bearer")
+    return await run_in_threadpool(TokenServices.issue_tokens, session, user, form_data.scopes)
+
+@router.post("/refresh", response_model=Token)
+def refresh_token(session: SessionDep, data: TokenRefresh):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    Args:
+        data (TokenRefresh): The refresh token returned by login or the previous refresh.
+
+    Returns:
+        Token: Access token, refresh token and token type.
+
+    Raises:
+        HTTPException: If the refresh token is invalid, expired, revoked or reused.
+    """
+    return TokenServices.refresh(session, data.refresh_token)
+
+@router.post("/logout", response_model=None)
+def logout_user(session: SessionDep, payload: Annotated[TokenPayload, Depends(get_current_token)]):
+    """
+    Revoke the current access token and its refresh tokens.
+
+    Args:
+        payload (TokenPayload): The decoded access token.
+
+    Returns:
+        dict: A message indicating successful logout.
+    """
+    TokenServices.logout(session, payload)
+    return {"detail": "Logged out successfully"}
 
 @router.post("/register", response_model=None)
-def register_user(session: SessionDep, form_data: UserCreate):
+async def register_user(session: SessionDep, form_data: UserCreate):
     """
     Register a new user.
 
@@ -46,5 +79,5 @@ def register_user(session: SessionDep, form_data: UserCreate):
     Returns:
         dict: A message indicating successful user creation.
     """
-    UserServices.create_user(session, form_data)
+    await UserServices.create_user(session, form_data)
     return {"detail": "User created successfully"}
\ No newline at end of file
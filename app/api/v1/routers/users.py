@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, Security
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Security
+from fastapi.responses import StreamingResponse
+from app.core import config
+from app.core.etag import conditional_response, make_etag
+from app.core.responses import ORJSONResponse
 from app.core.security import get_current_active_user
 from app.schemas.users import *
-from typing import Annotated
+from app.schemas.pagination import Page
+from typing import Annotated, Any, AsyncIterator
 from app.services.users import UserServices, RoleServices, ScopeServices
+from app.services.export import ExportServices, ExportFormat, MEDIA_TYPES
+from app.services.versions import VersionServices
 from app.db.models.users import Role, User
 from app.db.session import SessionDep
 
@@ -11,19 +19,35 @@ router = APIRouter(
     prefix="/users",
 )
 
+PageLimit = Annotated[int, Query(ge=1, le=config.PAGINATION_MAX_LIMIT)]
+
+
+def _export_response(chunks, format: ExportFormat, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'},
+    )
+
 
 @router.get("/me", response_model=UserPublic)
-def read_current_user(current_user: Annotated[User, Security(
+def read_current_user(request: Request, current_user: Annotated[User, Security(
     get_current_active_user,
     scopes=["user:read"]
 )]):
     """
     Get the current authenticated user's information.
 
+    Answers 304 when ``If-None-Match`` holds the current ETag.
+
     Returns:
         UserPublic: The public information of the current user.
     """
-    return current_user
+    etag = make_etag(
+        "me", current_user.id, current_user.username, current_user.first_name,
+        current_user.last_name, current_user.disabled, current_user.updated_at,
+    )
+    return conditional_response(request, etag, UserPublic, lambda: current_user)
 
 
 @router.patch("/me", response_model=UserPublic)
@@ -61,20 +85,43 @@ def create_role(session: SessionDep, form_data: RoleCreate, _: Annotated[User, S
     return RoleServices.create_role(session, form_data)
 
 
+@router.get("/roles/export", response_class=StreamingResponse)
+def export_roles(_: Annotated[User, Security(
+    get_current_active_user, scopes=["role:read"]
+)],
+        format: ExportFormat = "ndjson"):
+    """
+    Stream every role with its scope names.
+
+    Args:
+        format (ExportFormat): Either "ndjson" or "csv".
+
+    Returns:
+        StreamingResponse: The rendered rows, sent as they are read.
+    """
+    return _export_response(ExportServices.export_roles(format), format, "roles")
+
+
 @router.get("/roles/{id}", response_model=RolePublic_Admin)
-def read_role(session: SessionDep, id: int, _: Annotated[User, Security(
+def read_role(session: SessionDep, request: Request, id: int, _: Annotated[User, Security(
     get_current_active_user, scopes=["role:read"]
 )],):
     """
     Get a role by ID.
 
+    Answers 304 when ``If-None-Match`` holds the current ETag.
+
     Args:
         id (int): The ID of the role to retrieve.
 
     Returns:
         RolePublic_Admin: The public information of the retrieved role.
     """
-    return RoleServices.get_role(session, id)
+    etag = VersionServices.get_etag(session, ("role", "user", "scope"), "role", id)
+    return conditional_response(
+        request, etag, RolePublic_Admin,
+        lambda: RoleServices.get_role(session, id, loader="selectin"),
+    )
 
 
 @router.patch("/roles/{id}", response_model=RolePublic_Admin)
@@ -110,17 +157,134 @@ def delete_role(session: SessionDep, id: int, _: Annotated[User, Security(
     return RoleServices.delete_role(session, id)
 
 
-@router.get("/roles", response_model=list[RolePublic])
-def list_roles(session: SessionDep, _: Annotated[User, Security(
-    get_current_active_user, scopes=["role:read"]
+@router.post("/roles/{id}/users", response_model=MembershipResult)
+def add_role_users(session: SessionDep, id: int, form_data: MembershipUpdate, _: Annotated[User, Security(
+    get_current_active_user, scopes=["role:update"]
+)],):
+    """
+    Add users to a role, skipping existing links.
+
+    Args:
+        id (int): The ID of the role.
+        form_data (MembershipUpdate): The usernames.
+
+    Returns:
+        MembershipResult: How many links were added and removed, and the names that matched nothing.
+    """
+    return RoleServices.change_role_users(session, id, "add", form_data.names)
+
+
+@router.put("/roles/{id}/users", response_model=MembershipResult)
+def replace_role_users(session: SessionDep, id: int, form_data: MembershipUpdate, _: Annotated[User, Security(
+    get_current_active_user, scopes=["role:update"]
+)],):
+    """
+    Replace the users holding a role with exactly the given ones.
+
+    Args:
+        id (int): The ID of the role.
+        form_data (MembershipUpdate): The usernames.
+
+    Returns:
+        MembershipResult: How many links were added and removed, and the names that matched nothing.
+    """
+    return RoleServices.change_role_users(session, id, "replace", form_data.names)
+
+
+@router.delete("/roles/{id}/users", response_model=MembershipResult)
+def remove_role_users(session: SessionDep, id: int, form_data: MembershipUpdate, _: Annotated[User, Security(
+    get_current_active_user, scopes=["role:update"]
 )],):
     """
-    List all roles.
+    Remove users from a role.
+
+    Args:
+        id (int): The ID of the role.
+        form_data (MembershipUpdate): The usernames.
+
+    Returns:
+        MembershipResult: How many links were added and removed, and the names that matched nothing.
+    """
+    return RoleServices.change_role_users(session, id, "remove", form_data.names)
+
+
+@router.post("/roles/{id}/scopes", response_model=MembershipResult)
+def add_role_scopes(session: SessionDep, id: int, form_data: MembershipUpdate, _: Annotated[User, Security(
+    get_current_active_user, scopes=["role:update"]
+)],):
+    """
+    Add scopes to a role, skipping existing links.
+
+    Args:
+        id (int): The ID of the role.
+        form_data (MembershipUpdate): The scope names.
+
+    Returns:
+        MembershipResult: How many links were added and removed, and the names that matched nothing.
+    """
+    return RoleServices.change_role_scopes(session, id, "add", form_data.names)
+
+
+@router.put("/roles/{id}/scopes", response_model=MembershipResult)
+def replace_role_scopes(session: SessionDep, id: int, form_data: MembershipUpdate, _: Annotated[User, Security(
+    get_current_active_user, scopes=["role:update"]
+)],):
+    """
+    Replace the scopes granted by a role with exactly the given ones.
+
+    Args:
+        id (int): The ID of the role.
+        form_data (MembershipUpdate): The scope names.
 
     Returns:
-        list[RolePublic]: A list of all roles' public information.
+        MembershipResult: How many links were added and removed, and the names that matched nothing.
     """
-    return RoleServices.get_all_roles(session)
+    return RoleServices.change_role_scopes(session, id, "replace", form_data.names)
+
+
+@router.delete("/roles/{id}/scopes", response_model=MembershipResult)
+def remove_role_scopes(session: SessionDep, id: int, form_data: MembershipUpdate, _: Annotated[User, Security(
+    get_current_active_user, scopes=["role:update"]
+)],):
+    """
+    Remove scopes from a role.
+
+    Args:
+        id (int): The ID of the role.
+        form_data (MembershipUpdate): The scope names.
+
+    Returns:
+        MembershipResult: How many links were added and removed, and the names that matched nothing.
+    """
+    return RoleServices.change_role_scopes(session, id, "remove", form_data.names)
+
+
+@router.get("/roles", response_model=Page[RolePublic])
+def list_roles(session: SessionDep, request: Request, _: Annotated[User, Security(
+    get_current_active_user, scopes=["role:read"]
+)],
+        limit: PageLimit = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: str | None = None,
+        name: str | None = None):
+    """
+    List roles, one keyset page at a time.
+
+    Answers 304 when ``If-None-Match`` holds the current ETag.
+
+    Args:
+        limit (int): Maximum number of roles to return.
+        cursor (str | None): `next_cursor` of the previous page.
+        name (str | None): Only return roles whose name starts with this.
+
+    Returns:
+        Page[RolePublic]: A page of roles' public information.
+    """
+    etag = VersionServices.get_etag(session, ("role",), "roles", limit, cursor, name)
+    return conditional_response(
+        request, etag, Page[RolePublic],
+        lambda: RoleServices.list_roles(session, limit=limit, cursor=cursor, name=name),
+        lambda: RoleServices.list_role_rows(session, limit=limit, cursor=cursor, name=name),
+    )
 
 
 @router.post("/scopes", response_model=ScopePublic_Admin)
@@ -139,20 +303,43 @@ def create_scope(session: SessionDep, form_data: ScopeCreate, _: Annotated[User,
     return ScopeServices.create_scope(session, form_data)
 
 
+@router.get("/scopes/export", response_class=StreamingResponse)
+def export_scopes(_: Annotated[User, Security(
+    get_current_active_user, scopes=["scope:read"]
+)],
+        format: ExportFormat = "ndjson"):
+    """
+    Stream every scope with its role names.
+
+    Args:
+        format (ExportFormat): Either "ndjson" or "csv".
+
+    Returns:
+        StreamingResponse: The rendered rows, sent as they are read.
+    """
+    return _export_response(ExportServices.export_scopes(format), format, "scopes")
+
+
 @router.get("/scopes/{id}", response_model=ScopePublic_Admin)
-def read_scope(session: SessionDep, id: int, _: Annotated[User, Security(
+def read_scope(session: SessionDep, request: Request, id: int, _: Annotated[User, Security(
     get_current_active_user, scopes=["scope:read"]
 )],):
     """
     Get a scope by ID.
 
+    Answers 304 when ``If-None-Match`` holds the current ETag.
+
     Args:
         id (int): The ID of the scope to retrieve.
 
     Returns:
         ScopePublic_Admin: The public information of the retrieved scope.
     """
-    return ScopeServices.get_scope(session, id)
+    etag = VersionServices.get_etag(session, ("scope", "role", "user"), "scope", id)
+    return conditional_response(
+        request, etag, ScopePublic_Admin,
+        lambda: ScopeServices.get_scope(session, id, loader="selectin"),
+    )
 
 
 @router.patch("/scopes/{id}", response_model=ScopePublic_Admin)
@@ -188,17 +375,82 @@ def delete_scope(session: SessionDep, id: int, _: Annotated[User, Security(
     return ScopeServices.delete_scope(session, id)
 
 
-@router.get("/scopes", response_model=list[ScopePublic])
-def list_scopes(session: SessionDep, _: Annotated[User, Security(
+@router.get("/scopes", response_model=Page[ScopePublic])
+def list_scopes(session: SessionDep, request: Request, _: Annotated[User, Security(
     get_current_active_user, scopes=["scope:read"]
-)]):
+)],
+        limit: PageLimit = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: str | None = None,
+        name: str | None = None):
+    """
+    List scopes, one keyset page at a time.
+
+    Answers 304 when ``If-None-Match`` holds the current ETag.
+
+    Args:
+        limit (int): Maximum number of scopes to return.
+        cursor (str | None): `next_cursor` of the previous page.
+        name (str | None): Only return scopes whose name starts with this.
+
+    Returns:
+        Page[ScopePublic]: A page of scopes' public information.
+    """
+    etag = VersionServices.get_etag(session, ("scope",), "scopes", limit, cursor, name)
+    return conditional_response(
+        request, etag, Page[ScopePublic],
+        lambda: ScopeServices.list_scopes(session, limit=limit, cursor=cursor, name=name),
+        lambda: ScopeServices.list_scope_rows(session, limit=limit, cursor=cursor, name=name),
+    )
+
+
+async def _bulk_items(request: Request) -> AsyncIterator[Any]:
+    """
+    Yield the items of a JSON array body, or the raw lines of an NDJSON body as they arrive.
+    """
+    if request.headers.get("content-type", "").startswith(MEDIA_TYPES["ndjson"]):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield line
+        if buffer.strip():
+            yield buffer
+        return
+    try:
+        items = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array or NDJSON")
+    for item in items:
+        yield item
+
+
+@router.post("/bulk",
+             tags=['admin'],
+             response_model=BulkCreateResult,
+             openapi_extra={"requestBody": {"required": True, "content": {
+                 "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/UserCreate"}}},
+                 MEDIA_TYPES["ndjson"]: {"schema": {"$ref": "#/components/schemas/UserCreate"}},
+             }}})
+async def bulk_create_users(
+        session: SessionDep,
+        request: Request,
+        _: Annotated[User, Security(
+            get_current_active_user, scopes=["admin:create"]
+        )]):
     """
-    List all scopes.
+    Create many users at once from a JSON array or an NDJSON upload.
+
+    Args:
+        request (Request): The request whose body holds the users to create.
 
     Returns:
-        list[ScopePublic]: A list of all scopes' public information.
+        BulkCreateResult: The number of created users and the rows that were rejected.
     """
-    return ScopeServices.get_all_scopes(session)
+    return await UserServices.bulk_create_users(session, _bulk_items(request))
 
 
 @router.patch("/{username}",
@@ -224,15 +476,61 @@ def update_user(
     return UserServices.admin_update_user(session, username, form_data)
 
 
-@router.get("", response_model=list[UserPublic])
+@router.get("", response_model=Page[UserPublic])
 def list_users(session: SessionDep, _: Annotated[User, Security(
     get_current_active_user,
     scopes=["admin:read"]
-)]):
+)],
+        limit: PageLimit = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: str | None = None,
+        username: str | None = None,
+        disabled: bool | None = None,
+        role: str | None = None):
+    """
+    List users, one keyset page at a time.
+
+    Args:
+        limit (int): Maximum number of users to return.
+        cursor (str | None): `next_cursor` of the previous page.
+        username (str | None): Only return users whose username starts with this.
+        disabled (bool | None): Only return users with this disabled flag.
+        role (str | None): Only return users holding the role with this name.
+
+    Returns:
+        Page[UserPublic]: A page of users' public information.
     """
-    List all users.
+    if config.FAST_JSON_ENABLED:
+        return ORJSONResponse(UserServices.list_user_rows(
+            session,
+            limit=limit,
+            cursor=cursor,
+            username=username,
+            disabled=disabled,
+            role=role,
+        ))
+    return UserServices.list_users(
+        session,
+        limit=limit,
+        cursor=cursor,
+        username=username,
+        disabled=disabled,
+        role=role,
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_users(_: Annotated[User, Security(
+    get_current_active_user,
+    scopes=["admin:read"]
+)],
+        format: ExportFormat = "ndjson"):
+    """
+    Stream every user with their role names.
+
+    Args:
+        format (ExportFormat): Either "ndjson" or "csv".
 
     Returns:
-        list[UserPublic]: A list of all users' public information.
+        StreamingResponse: The rendered rows, sent as they are read.
     """
-    return UserServices.get_all_users(session)
+    return _export_response(ExportServices.export_users(format), format, "users")
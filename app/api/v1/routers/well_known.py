@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Response
+from app.core import config
+from app.core.keys import key_ring
+
+router = APIRouter(
+    prefix="/.well-known",
+    tags=["auth"],
+)
+
+@router.get("/jwks.json")
+def read_jwks(response: Response):
+    """
+    Publish the public keys that verify our access tokens.
+
+    Sibling services fetch this document (honouring its max-age) and verify
+    tokens locally against the key matching each token's ``kid`` header.
+
+    Returns:
+        dict: The JSON Web Key Set.
+    """
+    response.headers["Cache-Control"] = f"public, max-age={config.JWKS_MAX_AGE}"
+    return key_ring.jwks()
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from app.db.session import AsyncSessionDep
+from app.services.users_async import AsyncUserServices
+from app.services.auth import verify_password_async
+from app.services.tokens import TokenServices
+from app.schemas.auth import Token
+from app.core.metrics import LOGINS
+from typing import Annotated
+
+router = APIRouter(
+    prefix="/v2/auth",
+    tags=["auth", "v2"],
+)
+
+@router.post("/login", response_model=Token)
+async def login_user(session: AsyncSessionDep, form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
+    """
+    Authenticate a user and return an access token and a refresh token.
+
+    Tokens are issued exactly as on /auth/login, so they can be refreshed and
+    revoked through the same endpoints.
+
+    Args:
+        form_data (OAuth2PasswordRequestForm): Form data containing username and password.
+
+    Returns:
+        Token: Access token, refresh token and token type.
+
+    Raises:
+        HTTPException: If the credentials are invalid or the password pool is saturated.
+    """
+    user = await AsyncUserServices.get_user(session, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.password):
+        LOGINS.labels("failure").inc()
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    LOGINS.labels("success").inc()
+
+    return await session.run_sync(TokenServices.issue_tokens, user, form_data.scopes)
@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Security
+from app.core import config
+from app.core.security import get_current_active_user_async
+from app.schemas.users import *
+from app.schemas.pagination import Page
+from typing import Annotated
+from app.services.users_async import AsyncUserServices, AsyncRoleServices, AsyncScopeServices
+from app.db.models.users import User
+from app.db.session import AsyncSessionDep
+from app.api.v1.routers.users import PageLimit
+
+router = APIRouter(
+    tags=["users", "v2"],
+    prefix="/v2/users",
+)
+
+
+@router.get("/me", response_model=UserPublic)
+async def read_current_user(current_user: Annotated[User, Security(
+    get_current_active_user_async,
+    scopes=["user:read"]
+)]):
+    """
+    Get the current authenticated user's information.
+
+    Returns:
+        UserPublic: The public information of the current user.
+    """
+    return current_user
+
+
+@router.get("/roles/{id}", response_model=RolePublic_Admin)
+async def read_role(session: AsyncSessionDep, id: int, _: Annotated[User, Security(
+    get_current_active_user_async, scopes=["role:read"]
+)],):
+    """
+    Get a role by ID.
+
+    Args:
+        id (int): The ID of the role to retrieve.
+
+    Returns:
+        RolePublic_Admin: The public information of the retrieved role.
+    """
+    return await AsyncRoleServices.get_role(session, id)
+
+
+@router.get("/roles", response_model=Page[RolePublic])
+async def list_roles(session: AsyncSessionDep, _: Annotated[User, Security(
+    get_current_active_user_async, scopes=["role:read"]
+)],
+        limit: PageLimit = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: str | None = None,
+        name: str | None = None):
+    """
+    List roles, one keyset page at a time.
+
+    Args:
+        limit (int): Maximum number of roles to return.
+        cursor (str | None): `next_cursor` of the previous page.
+        name (str | None): Only return roles whose name starts with this.
+
+    Returns:
+        Page[RolePublic]: A page of roles' public information.
+    """
+    return await AsyncRoleServices.list_roles(session, limit=limit, cursor=cursor, name=name)
+
+
+@router.get("/scopes/{id}", response_model=ScopePublic_Admin)
+async def read_scope(session: AsyncSessionDep, id: int, _: Annotated[User, Security(
+    get_current_active_user_async, scopes=["scope:read"]
+)],):
+    """
+    Get a scope by ID.
+
+    Args:
+        id (int): The ID of the scope to retrieve.
+
+    Returns:
+        ScopePublic_Admin: The public information of the retrieved scope.
+    """
+    return await AsyncScopeServices.get_scope(session, id)
+
+
+@router.get("/scopes", response_model=Page[ScopePublic])
+async def list_scopes(session: AsyncSessionDep, _: Annotated[User, Security(
+    get_current_active_user_async, scopes=["scope:read"]
+)],
+        limit: PageLimit = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: str | None = None,
+        name: str | None = None):
+    """
+    List scopes, one keyset page at a time.
+
+    Args:
+        limit (int): Maximum number of scopes to return.
+        cursor (str | None): `next_cursor` of the previous page.
+        name (str | None): Only return scopes whose name starts with this.
+
+    Returns:
+        Page[ScopePublic]: A page of scopes' public information.
+    """
+    return await AsyncScopeServices.list_scopes(session, limit=limit, cursor=cursor, name=name)
+
+
+@router.get("", response_model=Page[UserPublic])
+async def list_users(session: AsyncSessionDep, _: Annotated[User, Security(
+    get_current_active_user_async,
+    scopes=["admin:read"]
+)],
+        limit: PageLimit = config.PAGINATION_DEFAULT_LIMIT,
+        cursor: str | None = None,
+        username: str | None = None,
+        disabled: bool | None = None,
+        role: str | None = None):
+    """
+    List users, one keyset page at a time.
+
+    Args:
+        limit (int): Maximum number of users to return.
+        cursor (str | None): `next_cursor` of the previous page.
+        username (str | None): Only return users whose username starts with this.
+        disabled (bool | None): Only return users with this disabled flag.
+        role (str | None): Only return users holding the role with this name.
+
+    Returns:
+        Page[UserPublic]: A page of users' public information.
+    """
+    return await AsyncUserServices.list_users(
+        session,
+        limit=limit,
+        cursor=cursor,
+        username=username,
+        disabled=disabled,
+        role=role,
+    )
@@ -8,7 +8,7 @@ from app.db.models.users import User, Role, Scope
 from app.services.auth import hash_password
 from app.core import config
 from app.services.users import RoleServices
-from app.db.repositories.users import RoleRepository, ScopeRepository, UserRepository
+from app.db.repositories.users import RoleRepository, ScopeRepository, UserRepository, EffectiveScopeRepository
 
 def create_admin_user():
     """
@@ -50,6 +50,8 @@ def create_admin_user():
             roles={user_role, admin_role}
         )
         session.add(new_user)
+        session.flush()
+        EffectiveScopeRepository.refresh_users(session, [new_user.id])
         session.commit()
         session.refresh(new_user)
         print("Admin user created successfully.")
@@ -75,9 +77,67 @@ def init_db():
         )
     print("Default roles and scopes created successfully.")
 
+def rebuild_effective_scopes():
+    """
+    Rebuild the `user_effective_scope` table from the role and scope assignments.
+    """
+    with next(get_session()) as session:
+        count = EffectiveScopeRepository.rebuild(session)
+    print(f"Effective scopes rebuilt ({count} grants).")
+
+def verify_effective_scopes():
+    """
+    Check the `user_effective_scope` table against the role and scope assignments.
+
+    Raises:
+        SystemExit: If the table is out of date.
+    """
+    with next(get_session()) as session:
+        missing, stale = EffectiveScopeRepository.verify(session)
+    if missing or stale:
+        print(f"Effective scopes are inconsistent: {missing} missing, {stale} stale. Run rebuild_effective_scopes.")
+        sys.exit(1)
+    print("Effective scopes are consistent.")
+
+def generate_signing_key():
+    """
+    Generate a new JWT signing key in `JWT_KEYS_DIR`, named by a fresh ``kid``.
+
+    The key is published in the JWKS right away; it only signs tokens once it
+    is the newest private key or is set as `JWT_ACTIVE_KID`.
+    """
+    from datetime import datetime
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if not config.JWT_KEYS_DIR:
+        print("JWT_KEYS_DIR is not set.")
+        return
+    key_type = input("Key type (ed25519/rsa) [ed25519]: ").strip().lower() or "ed25519"
+    if key_type == "rsa":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif key_type == "ed25519":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        print("Unsupported key type.")
+        return
+    kid = datetime.now().strftime("%Y%m%d%H%M%S") + f"-{key_type}"
+    os.makedirs(config.JWT_KEYS_DIR, exist_ok=True)
+    path = os.path.join(config.JWT_KEYS_DIR, f"{kid}.pem")
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as f:
+        f.write(private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ))
+    print(f"Signing key {kid} written to {path}.")
+
 commands = {
     "create_admin_user": create_admin_user,
-    "init_db": init_db
+    "init_db": init_db,
+    "generate_signing_key": generate_signing_key,
+    "rebuild_effective_scopes": rebuild_effective_scopes,
+    "verify_effective_scopes": verify_effective_scopes,
 }
 
 if __name__ == "__main__":
@@ -0,0 +1,489 @@
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from app.core import config
+
+
+logger = logging.getLogger(__name__)
+
+
+_MISSING = object()
+# Backend failures are logged at most once per interval per namespace.
+_ERROR_LOG_INTERVAL = 60.0
+
+
+class TTLCache:
+    """
+    A thread-safe, in-process cache bounded by both age (TTL) and size (LRU).
+
+    Entries older than ``ttl`` seconds are treated as missing, and once the cache
+    holds ``maxsize`` entries the least recently used one is evicted.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retrieve a value from the cache.
+
+        Args:
+            key (Hashable): Cache key.
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: The cached value, or ``default`` if missing or expired.
+        """
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        """
+        Store a value in the cache, evicting the least recently used entry if full.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to store.
+            ttl (float | None, optional): Lifetime of this entry in seconds, capped
+                at the cache's TTL. Defaults to the cache's TTL.
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.maxsize <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """
+        Remove a value from the cache if present.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every value from the cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and the current size.
+
+        Returns:
+            dict: ``hits``, ``misses`` and ``size``.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """
+    Storage behind one or more `CacheNamespace` objects.
+
+    Values are stored as given by backends with ``stores_objects`` set, and as
+    bytes (encoded by the namespace) otherwise. Backends with ``blocking`` set
+    do network I/O and should be called off the event loop.
+    """
+
+    stores_objects = False
+    blocking = False
+
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        """Return the value stored under ``key``, or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float):
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+
+    @abstractmethod
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        """Store ``value`` only if ``key`` is absent; return whether it was stored."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove ``key`` if present."""
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Return the counter stored under ``key``, 0 if unset."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Increment the counter under ``key`` and return its new value."""
+
+    @abstractmethod
+    def publish(self, channel: str, message: str):
+        """Broadcast ``message`` to every subscriber of ``channel``, in every worker."""
+
+    @abstractmethod
+    def subscribe(self, channel: str, callback: Callable[[str], None]):
+        """Run ``callback`` with each message published on ``channel``."""
+
+    def start(self):
+        """Start delivering published messages; called once the worker is up."""
+
+    def close(self):
+        """Stop delivering messages and release connections."""
+
+
+class LocalCacheBackend(CacheBackend):
+    """
+    An in-process backend: an LRU of live objects, with in-memory counters
+    and synchronous publish/subscribe. Each worker has its own copy.
+    """
+
+    stores_objects = True
+
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=float("inf"))
+        self._counters: dict[str, int] = {}
+        self._subscribers: dict[str, list[Callable[[str], None]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._cache.set(key, value, ttl=ttl)
+
+    def add(self, key: str, value: Any, ttl: float) -> bool:
+        with self._lock:
+            if self._cache.get(key) is not None:
+                return False
+            self._cache.set(key, value, ttl=ttl)
+            return True
+
+    def delete(self, key: str):
+        self._cache.delete(key)
+
+    def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters[key] = self._counters.get(key, 0) + 1
+            return value
+
+    def publish(self, channel: str, message: str):
+        for callback in self._subscribers.get(channel, ()):
+            callback(message)
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    A backend on a Redis-protocol server, shared by every worker and pod.
+
+    Published messages are received by a background thread started with
+    `start`; until then namespaces rely on re-reading their generation.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str | None = None, client=None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("CACHE_BACKEND=redis requires the redis package") from e
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self._subscribers: dict[str, list[Callable[[str], None]]] = {}
+        self._listener = None
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        if ttl > 0:
+            self._client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    def add(self, key: str, value: bytes, ttl: float) -> bool:
+        return bool(self._client.set(key, value, px=max(1, int(ttl * 1000)), nx=True))
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+    def get_counter(self, key: str) -> int:
+        return int(self._client.get(key) or 0)
+
+    def incr(self, key: str) -> int:
+        return self._client.incr(key)
+
+    def publish(self, channel: str, message: str):
+        self._client.publish(channel, message)
+
+    def subscribe(self, channel: str, callback: Callable[[str], None]):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def _dispatch(self, message: dict):
+        channel = message["channel"].decode()
+        data = message["data"].decode()
+        for callback in self._subscribers.get(channel, ()):
+            try:
+                callback(data)
+            except Exception:
+                logger.exception("Cache invalidation handler failed for %s", channel)
+
+    def start(self):
+        if self._listener is not None or not self._subscribers:
+            return
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{channel: self._dispatch for channel in self._subscribers})
+        self._listener = pubsub.run_in_thread(sleep_time=1, daemon=True)
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        self._client.close()
+
+
+class CacheNamespace:
+    """
+    A named group of cache entries with a shared TTL, on any `CacheBackend`.
+
+    Keys are stored as ``<prefix>:<name>:<generation>:<key>``. `clear` bumps
+    the generation, which makes every old entry unreachable in all workers at
+    once, and broadcasts it so workers stop using their cached generation.
+    `get_or_set` lets one caller per key load a missing value while the others
+    wait for it (single-flight), across workers when the backend is shared.
+
+    Backend errors (e.g. Redis being unreachable) never reach the caller:
+    reads count as misses so `get_or_set` falls through to its loader, and
+    failed writes, deletes and clears are logged and skipped, leaving stale
+    entries to expire with the TTL.
+    """
+
+    def __init__(self,
+                 backend: CacheBackend,
+                 name: str,
+                 ttl: float,
+                 encode: Callable[[Any], bytes] = lambda value: json.dumps(value).encode(),
+                 decode: Callable[[bytes], Any] = json.loads):
+        self.backend = backend
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._error_logged_at = float("-inf")
+        self._encode = encode
+        self._decode = decode
+        self._prefix = f"{config.CACHE_PREFIX}:{name}"
+        self._channel = f"{self._prefix}:invalidate"
+        self._generation: int | None = None
+        self._generation_read_at = 0.0
+        self._flights: dict[str, threading.Lock] = {}
+        self._flights_lock = threading.Lock()
+        backend.subscribe(self._channel, self._on_invalidate)
+
+    @property
+    def blocking(self) -> bool:
+        """
+        Whether calls do network I/O and should be kept off the event loop.
+        """
+        return self.backend.blocking
+
+    def _on_invalidate(self, message: str):
+        self._generation = None
+
+    def _try(self, action: str, fn: Callable, *args, default: Any = None) -> Any:
+        """Call the backend, logging and returning ``default`` if it fails."""
+        try:
+            return fn(*args)
+        except Exception:
+            self.errors += 1
+            now = time.monotonic()
+            if now - self._error_logged_at >= _ERROR_LOG_INTERVAL:
+                self._error_logged_at = now
+                logger.warning("Cache %s: %s failed; bypassing the cache", self.name, action, exc_info=True)
+            return default
+
+    def _key(self, key: Hashable) -> str | None:
+        now = time.monotonic()
+        if self._generation is None or now - self._generation_read_at >= config.CACHE_GENERATION_TTL:
+            # without a current generation, entries dropped by a `clear` could be served
+            self._generation = self._try("reading the generation", self.backend.get_counter, f"{self._prefix}:generation")
+            if self._generation is None:
+                return None
+            self._generation_read_at = now
+        return f"{self._prefix}:{self._generation}:{key}"
+
+    def _read(self, full_key: str | None, default: Any) -> Any:
+        value = None if full_key is None else self._try("get", self.backend.get, full_key)
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value if self.backend.stores_objects else self._decode(value)
+
+    def _write(self, full_key: str | None, value: Any, ttl: float | None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if full_key is None or ttl <= 0:
+            return
+        self._try("set", self.backend.set, full_key, value if self.backend.stores_objects else self._encode(value), ttl)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Retrieve a value from the cache.
+
+        Args:
+            key (Hashable): Cache key.
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: The cached value, or ``default`` if missing or expired.
+        """
+        return self._read(self._key(key), default)
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        """
+        Store a value in the cache.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to store.
+            ttl (float | None, optional): Lifetime of this entry in seconds, capped
+                at the namespace's TTL. Defaults to the namespace's TTL.
+        """
+        self._write(self._key(key), value, ttl)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any], ttl: float | None = None) -> Any:
+        """
+        Retrieve a value, loading and storing it on a miss with single-flight.
+
+        The entry is written under the generation current when loading began,
+        so a `clear` during the load cannot be overwritten by stale data.
+
+        Args:
+            key (Hashable): Cache key.
+            loader (Callable[[], Any]): Produces the value on a miss.
+            ttl (float | None, optional): Lifetime of the entry. Defaults to the namespace's TTL.
+
+        Returns:
+            Any: The cached or loaded value.
+        """
+        full_key = self._key(key)
+        if full_key is None:
+            return loader()
+        value = self._read(full_key, _MISSING)
+        if value is not _MISSING:
+            return value
+        with self._flights_lock:
+            flight = self._flights.setdefault(full_key, threading.Lock())
+        with flight:
+            try:
+                value = self._read(full_key, _MISSING)
+                if value is not _MISSING:
+                    return value
+                lock_key = f"{full_key}:lock"
+                owner = self._try("lock", self.backend.add, lock_key, b"1", config.CACHE_LOCK_TIMEOUT)
+                if owner is False:
+                    # another worker is loading it; wait for its result, then load anyway
+                    deadline = time.monotonic() + config.CACHE_LOCK_TIMEOUT
+                    while time.monotonic() < deadline:
+                        time.sleep(0.02)
+                        value = self._read(full_key, _MISSING)
+                        if value is not _MISSING:
+                            return value
+                try:
+                    value = loader()
+                    self._write(full_key, value, ttl)
+                    return value
+                finally:
+                    if owner:
+                        self._try("unlock", self.backend.delete, lock_key)
+            finally:
+                with self._flights_lock:
+                    self._flights.pop(full_key, None)
+
+    def delete(self, key: Hashable):
+        """
+        Remove a value from the cache if present.
+
+        Args:
+            key (Hashable): Cache key.
+        """
+        full_key = self._key(key)
+        if full_key is not None:
+            self._try("delete", self.backend.delete, full_key)
+
+    def clear(self):
+        """
+        Invalidate every value of the namespace, in every worker.
+        """
+        self._try("clear", self.backend.incr, f"{self._prefix}:generation")
+        self._generation = None
+        self._try("publish", self.backend.publish, self._channel, "clear")
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters.
+
+        Returns:
+            dict: ``hits``, ``misses`` and backend ``errors``.
+        """
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+def _create_cache_backend() -> CacheBackend:
+    if config.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(config.CACHE_REDIS_URL)
+    return LocalCacheBackend(maxsize=config.CACHE_LOCAL_MAXSIZE)
+
+
+# Shared by every namespace; "local" keeps entries per worker, "redis" shares
+# them (and their invalidation) across workers and pods.
+cache_backend = _create_cache_backend()
+
+# Effective scope names per user id, used by the authorization hot path.
+user_scopes_cache = CacheNamespace(
+    cache_backend,
+    "user_scopes",
+    ttl=config.USER_SCOPES_CACHE_TTL,
+    encode=lambda scopes: json.dumps(sorted(scopes)).encode(),
+    decode=lambda data: frozenset(json.loads(data)),
+)
+
+# Validated access token payloads keyed by token digest, so the signature check
+# and pydantic validation run once per token rather than once per request.
+# Always in-process: verifying locally is cheaper than a network round trip.
+token_cache = TTLCache(
+    maxsize=config.TOKEN_CACHE_MAXSIZE,
+    ttl=config.TOKEN_CACHE_TTL,
+)
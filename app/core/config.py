@@ -5,6 +5,42 @@ SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
 
+# When set, tokens are signed with the asymmetric keys (RSA/EC/Ed25519 PEM files)
+# in this directory and published at /.well-known/jwks.json instead of HS256.
+JWT_KEYS_DIR = os.getenv("JWT_KEYS_DIR", "")
+JWT_ACTIVE_KID = os.getenv("JWT_ACTIVE_KID", "")
+JWT_KEYS_RELOAD_SECONDS = float(os.getenv("JWT_KEYS_RELOAD_SECONDS", 60))
+JWKS_MAX_AGE = int(os.getenv("JWKS_MAX_AGE", 300))
+
+# Refresh tokens rotate on every use; replaying a used one revokes its whole family.
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", 14))
+# Encode the scopes requested at login as a bitmask claim (``smask``) over the
+# interned scope bits (``scope_bit``) instead of a list of names.
+TOKEN_SCOPE_MASK = os.getenv("TOKEN_SCOPE_MASK", "false").lower() == "true"
+# Revoked token ids are mirrored in memory (Bloom filter + exact set): new rows are
+# pulled every REVOCATION_SYNC_SECONDS and the whole list is rebuilt, dropping
+# expired entries, every REVOCATION_REBUILD_SECONDS.
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", 10))
+# Ids are assigned on insert but become visible on commit, so each sync re-reads
+# this many ids below the highest one seen to catch rows that committed late.
+REVOCATION_SYNC_ID_LOOKBACK = int(os.getenv("REVOCATION_SYNC_ID_LOOKBACK", 1000))
+# The rebuild is the backstop for anything the lookback misses, so it always runs
+# well within an access token's lifetime.
+REVOCATION_REBUILD_SECONDS = min(
+    float(os.getenv("REVOCATION_REBUILD_SECONDS", 3600)), ACCESS_TOKEN_EXPIRE_MINUTES * 60 / 2
+)
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", 100000))
+REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", 0.001))
+
+# bcrypt work runs on a dedicated pool ("thread" or "process") so it cannot
+# exhaust the threadpool shared by every sync endpoint.
+PASSWORD_POOL_KIND = os.getenv("PASSWORD_POOL_KIND", "thread")
+PASSWORD_POOL_WORKERS = int(os.getenv("PASSWORD_POOL_WORKERS", os.cpu_count() or 1))
+PASSWORD_POOL_QUEUE_LIMIT = int(os.getenv("PASSWORD_POOL_QUEUE_LIMIT", 64))
+# Bulk imports hash at most this many passwords at a time, through the same
+# slots as logins, so interactive requests keep the rest of the pool.
+PASSWORD_BULK_CONCURRENCY = int(os.getenv("PASSWORD_BULK_CONCURRENCY", max(1, PASSWORD_POOL_WORKERS // 2)))
+
 ALLOW_ORIGINS = [i for i in os.getenv("ALLOW_ORIGINS", "").split(",") if i]
 ALLOW_METHODS = [i for i in os.getenv("ALLOW_METHODS", "").split(",") if i]
 ALLOW_HEADERS = [i for i in os.getenv("ALLOW_HEADERS", "").split(",") if i]
@@ -13,6 +49,108 @@ ALLOW_CREDENTIALS = os.getenv("ALLOW_CREDENTIALS", "false").lower() == "true"
 DATABASE_URL = os.getenv("DATABASE_URL")
 
 
+def _async_database_url(url: str | None) -> str | None:
+    """Map a sync driver URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    if not url:
+        return url
+    scheme, sep, rest = url.partition("://")
+    if scheme.startswith("postgresql"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+# Connection pool sizing; size + overflow should cover the worker's concurrency.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", -1))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+DB_POOL_WAIT_WARN_MS = float(os.getenv("DB_POOL_WAIT_WARN_MS", 100))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", 0))
+
+# Per-request SQL instrumentation: statements slower than DB_SLOW_QUERY_MS are
+# logged, and requests over the query-count or latency budget are flagged
+# (0 disables a budget). SERVER_TIMING_ENABLED also sends the timings back in a
+# Server-Timing header to every client, anonymous ones included, so it exposes
+# query counts and database timings: only enable it where clients are trusted.
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 100))
+REQUEST_QUERY_BUDGET = int(os.getenv("REQUEST_QUERY_BUDGET", 20))
+REQUEST_LATENCY_BUDGET_MS = float(os.getenv("REQUEST_LATENCY_BUDGET_MS", 500))
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+# Prometheus metrics at /metrics. For several worker processes, also set
+# PROMETHEUS_MULTIPROC_DIR to an empty directory shared by the workers.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+# OpenTelemetry spans around routes, services, repositories, bcrypt, JWT and
+# SQL statements; requires opentelemetry-sdk (and
+# opentelemetry-exporter-otlp-proto-http for "otlp"). When disabled nothing is
+# wrapped. TRACING_EXPORTER is "otlp", "file" (JSON lines in TRACING_FILE) or
+# "console"; TRACING_SAMPLE_RATIO applies to traces not started upstream.
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "fastapi-scaffold")
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "otlp")
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", 1.0))
+
+# Sampling profiler. POST /admin/profile samples the worker for at most
+# PROFILER_MAX_SECONDS. Requests whose PROFILER_REQUEST_HEADER holds
+# PROFILER_REQUEST_SECRET are profiled with probability
+# PROFILER_REQUEST_SAMPLE_RATE (0, or an empty secret, turns this off) and the
+# last PROFILER_KEEP results are kept for PROFILER_KEEP_SECONDS.
+PROFILER_MAX_SECONDS = float(os.getenv("PROFILER_MAX_SECONDS", 60))
+PROFILER_DEFAULT_INTERVAL_MS = float(os.getenv("PROFILER_DEFAULT_INTERVAL_MS", 10))
+PROFILER_REQUEST_HEADER = os.getenv("PROFILER_REQUEST_HEADER", "X-Profile")
+PROFILER_REQUEST_SAMPLE_RATE = float(os.getenv("PROFILER_REQUEST_SAMPLE_RATE", 0))
+PROFILER_REQUEST_SECRET = os.getenv("PROFILER_REQUEST_SECRET", "")
+PROFILER_KEEP = int(os.getenv("PROFILER_KEEP", 20))
+PROFILER_KEEP_SECONDS = float(os.getenv("PROFILER_KEEP_SECONDS", 600))
+
+# Serve the asyncio-native /v2 API next to the sync one.
+ASYNC_API_ENABLED = os.getenv("ASYNC_API_ENABLED", "false").lower() == "true"
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+
+PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", 50))
+PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", 500))
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+# Rows hashed, inserted and committed together by POST /users/bulk.
+BULK_CREATE_CHUNK_SIZE = int(os.getenv("BULK_CREATE_CHUNK_SIZE", 1000))
+
+SCOPE_CATALOG_REFRESH_SECONDS = float(os.getenv("SCOPE_CATALOG_REFRESH_SECONDS", 300))
+
+TOKEN_CACHE_TTL = float(os.getenv("TOKEN_CACHE_TTL", 300))
+TOKEN_CACHE_MAXSIZE = int(os.getenv("TOKEN_CACHE_MAXSIZE", 10000))
+# Seconds to remember tokens that failed validation; 0 disables negative caching.
+TOKEN_CACHE_NEGATIVE_TTL = float(os.getenv("TOKEN_CACHE_NEGATIVE_TTL", 0))
+
+# Backend of the shared caches: "local" (per-worker LRU) or "redis".
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local")
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+CACHE_PREFIX = os.getenv("CACHE_PREFIX", "fastapi-scaffold")
+CACHE_LOCAL_MAXSIZE = int(os.getenv("CACHE_LOCAL_MAXSIZE", os.getenv("USER_SCOPES_CACHE_MAXSIZE", 10000)))
+# How long a worker trusts its copy of a namespace generation between
+# invalidation broadcasts.
+CACHE_GENERATION_TTL = float(os.getenv("CACHE_GENERATION_TTL", 5))
+# How long one loader may hold a key before waiting workers load it themselves.
+CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", 5))
+
+USER_SCOPES_CACHE_TTL = float(os.getenv("USER_SCOPES_CACHE_TTL", 60))
+
+# Rendered JSON of read endpoints, keyed by ETag; 0 disables the body cache
+# (304 answers still work).
+RESPONSE_CACHE_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", 1024))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 300))
+
+# Render JSON with orjson and build list pages straight from column rows,
+# skipping ORM hydration and response_model revalidation. The bytes sent are
+# the same as with the default path.
+FAST_JSON_ENABLED = os.getenv("FAST_JSON_ENABLED", "false").lower() == "true"
+
+
 BASIC_DEFAULT_PERMISSIONS = [("user:create", "can create user"),
                             ("user:read", "can read user"),
                             ("user:update", "can update user"),
@@ -0,0 +1,97 @@
+import hashlib
+from typing import Any, Callable
+from fastapi import HTTPException, Request, Response, status
+from pydantic import TypeAdapter
+from app.core import config
+from app.core.cache import TTLCache
+from app.core.responses import dumps
+
+
+# Rendered JSON bodies keyed by ETag. Every ETag is derived from the data
+# versions it depends on, so a write makes the old entries unreachable and the
+# LRU ages them out.
+rendered_cache = TTLCache(
+    maxsize=config.RESPONSE_CACHE_MAXSIZE,
+    ttl=config.RESPONSE_CACHE_TTL,
+)
+
+_adapters: dict[Any, TypeAdapter] = {}
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values a response is derived from.
+
+    Args:
+        *parts (Any): Versions, IDs, timestamps and query parameters.
+
+    Returns:
+        str: A quoted ETag.
+    """
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's ``If-None-Match`` header matches an ETag.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The current ETag of the resource.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix is ignored
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def conditional_response(request: Request,
+                         etag: str,
+                         model: Any,
+                         render: Callable[[], Any],
+                         render_rows: Callable[[], Any] | None = None) -> Response:
+    """
+    Answer 304 if the client has the current ETag, else a JSON body of ``model``.
+
+    ``render`` is only called on a miss of both the client and the rendered
+    body cache, so a 304 or a cached body skips loading and serializing.
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The current ETag of the resource.
+        model (Any): Response model type the rendered value is serialized as.
+        render (Callable[[], Any]): Loads the value to serialize.
+        render_rows (Callable[[], Any] | None, optional): Loads the value as
+            plain JSON-ready data already shaped like ``model``; used instead
+            of ``render`` when `FAST_JSON_ENABLED` is set. Defaults to None.
+
+    Returns:
+        Response: A 304 or a 200 with the JSON body.
+
+    Raises:
+        HTTPException: If ``render`` finds nothing.
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = rendered_cache.get(etag)
+    if body is None:
+        fast = config.FAST_JSON_ENABLED and render_rows is not None
+        value = render_rows() if fast else render()
+        if value is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+        if fast:
+            body = dumps(value)
+        else:
+            adapter = _adapters.get(model)
+            if adapter is None:
+                adapter = _adapters[model] = TypeAdapter(model)
+            body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+        rendered_cache.set(etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+from jwt.algorithms import ECAlgorithm, OKPAlgorithm, RSAAlgorithm
+from app.core import config
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any | None = None
+
+
+def _algorithm_for(public_key) -> tuple[str, type]:
+    """Map a public key type to its JWS algorithm and PyJWT algorithm class."""
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return "RS256", RSAAlgorithm
+    if isinstance(public_key, (ed25519.Ed25519PublicKey, ed448.Ed448PublicKey)):
+        return "EdDSA", OKPAlgorithm
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}[public_key.curve.name], ECAlgorithm
+    raise ValueError(f"Unsupported key type {type(public_key).__name__}")
+
+
+class KeyRing:
+    """
+    Asymmetric JWT keys loaded from a directory of PEM files, one per ``kid``.
+
+    ``<kid>.pem`` holds a private key that can sign and verify; ``<kid>.pub.pem``
+    holds a public key that only verifies (e.g. a retired signing key whose
+    tokens have not expired yet). Tokens are signed with ``JWT_ACTIVE_KID``, or
+    with the most recently added private key when it is unset.
+
+    Rotating without downtime: add the new private key, wait for the JWKS
+    max-age so verifiers have fetched it, make it active, then replace the old
+    ``.pem`` with its ``.pub.pem`` and delete that once its tokens expired.
+    """
+
+    def __init__(self, keys_dir: str, active_kid: str | None, reload_seconds: float):
+        self.keys_dir = keys_dir
+        self.active_kid = active_kid or None
+        self.reload_seconds = reload_seconds
+        self._keys: dict[str, SigningKey] = {}
+        self._active: SigningKey | None = None
+        self._fingerprint: tuple = ()
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Whether tokens are signed with the key ring rather than the shared secret.
+        """
+        return bool(self.keys_dir)
+
+    def _scan(self) -> tuple:
+        entries = []
+        for name in os.listdir(self.keys_dir):
+            if name.endswith(".pem"):
+                path = os.path.join(self.keys_dir, name)
+                entries.append((name, os.path.getmtime(path)))
+        return tuple(sorted(entries))
+
+    def reload(self, force: bool = False):
+        """
+        Re-read the key directory if it changed since the last load.
+
+        Args:
+            force (bool, optional): Reload even if the directory looks unchanged. Defaults to False.
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            fingerprint = self._scan()
+            if fingerprint == self._fingerprint and self._active is not None and not force:
+                return
+            keys: dict[str, tuple[SigningKey, float]] = {}
+            for name, mtime in fingerprint:
+                with open(os.path.join(self.keys_dir, name), "rb") as f:
+                    data = f.read()
+                if name.endswith(".pub.pem"):
+                    kid = name[:-len(".pub.pem")]
+                    private_key, public_key = None, serialization.load_pem_public_key(data)
+                else:
+                    kid = name[:-len(".pem")]
+                    private_key = serialization.load_pem_private_key(data, password=None)
+                    public_key = private_key.public_key()
+                if kid in keys and keys[kid][0].private_key is not None:
+                    continue
+                algorithm, _ = _algorithm_for(public_key)
+                keys[kid] = (SigningKey(kid, algorithm, public_key, private_key), mtime)
+
+            signers = {kid: (key, mtime) for kid, (key, mtime) in keys.items() if key.private_key is not None}
+            if self.active_kid:
+                active = signers.get(self.active_kid, (None, 0))[0]
+            else:
+                active = max(signers.values(), key=lambda item: item[1], default=(None, 0))[0]
+            if active is None:
+                raise RuntimeError(f"No private signing key available in {self.keys_dir}")
+
+            removed = set(self._keys) - set(keys)
+            self._keys = {kid: key for kid, (key, _) in keys.items()}
+            self._active = active
+            self._fingerprint = fingerprint
+        logger.info("Loaded %d JWT keys, signing with %s", len(self._keys), active.kid)
+        if removed:
+            for listener in self._listeners:
+                listener(removed)
+
+    def _reload_if_due(self):
+        if self._checked_at is not None and time.monotonic() - self._checked_at < self.reload_seconds:
+            return
+        try:
+            self.reload()
+        except Exception:
+            if self._active is None:
+                # nothing loaded yet: fail loudly and retry on the next call
+                self._checked_at = None
+                raise
+            # a rotation in progress (half-written PEM, missing directory,
+            # JWT_ACTIVE_KID set before its file lands) must not fail requests;
+            # keep serving the previous ring and retry after the interval
+            logger.exception("Reloading JWT keys from %s failed; keeping the previous keys", self.keys_dir)
+
+    def signing_key(self) -> SigningKey:
+        """
+        Return the key new tokens are signed with.
+
+        Returns:
+            SigningKey: The active key.
+        """
+        self._reload_if_due()
+        return self._active
+
+    def verification_key(self, kid: str | None) -> SigningKey | None:
+        """
+        Return the key that verifies tokens carrying ``kid``.
+
+        Args:
+            kid (str | None): The ``kid`` header of the token.
+
+        Returns:
+            SigningKey | None: The key, or None if the ``kid`` is unknown.
+        """
+        self._reload_if_due()
+        return self._keys.get(kid)
+
+    def jwks(self) -> dict:
+        """
+        Return the public half of every key as a JSON Web Key Set.
+
+        Returns:
+            dict: A JWKS document.
+        """
+        if not self.enabled:
+            return {"keys": []}
+        self._reload_if_due()
+        keys = []
+        for key in self._keys.values():
+            _, algorithm_cls = _algorithm_for(key.public_key)
+            jwk = algorithm_cls.to_jwk(key.public_key, as_dict=True)
+            jwk.update(kid=key.kid, alg=key.algorithm, use="sig")
+            keys.append(jwk)
+        return {"keys": keys}
+
+    def subscribe(self, listener):
+        """
+        Register a callback run with the set of ``kid`` values removed by a reload.
+
+        Args:
+            listener (Callable[[set[str]], None]): The callback.
+        """
+        self._listeners.append(listener)
+
+
+key_ring = KeyRing(
+    keys_dir=config.JWT_KEYS_DIR,
+    active_kid=config.JWT_ACTIVE_KID,
+    reload_seconds=config.JWT_KEYS_RELOAD_SECONDS,
+)
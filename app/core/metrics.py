@@ -0,0 +1,147 @@
+import os
+import time
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# With PROMETHEUS_MULTIPROC_DIR set (before the app is imported), every worker
+# process writes its samples to files in that directory and /metrics merges
+# them, so any worker can answer a scrape. The directory must be emptied
+# before the server starts.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+_PASSWORD_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+_FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+LOGINS = Counter(
+    "auth_logins_total",
+    "Password logins, by result.",
+    ["result"],
+)
+PASSWORD_HASH_DURATION = Histogram(
+    "auth_password_hash_seconds",
+    "Time spent in bcrypt, by operation.",
+    ["operation"],
+    buckets=_PASSWORD_BUCKETS,
+)
+TOKEN_DECODE_DURATION = Histogram(
+    "auth_token_decode_seconds",
+    "Time to decode an access token, by token cache result.",
+    ["cache"],
+    buckets=_FAST_BUCKETS,
+)
+AUTH_REJECTIONS = Counter(
+    "auth_rejections_total",
+    "Requests rejected while resolving the current user, by reason.",
+    ["reason"],
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections opened beyond the pool size, as of the last checkout.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTS = Counter(
+    "db_pool_connects_total",
+    "New database connections opened.",
+    ["pool"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting for a connection.",
+    ["pool"],
+    buckets=(0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up waiting for a connection.",
+    ["pool"],
+)
+
+
+def render_metrics() -> bytes:
+    """
+    Render every metric in the Prometheus text format.
+
+    Returns:
+        bytes: The exposition, merged across workers in multiprocess mode.
+    """
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead(pid: int):
+    """
+    Drop the live gauges of a worker that exited; call it from the process manager.
+
+    Args:
+        pid (int): Process ID of the exited worker.
+    """
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
+
+
+class MetricsMiddleware:
+    """
+    Track in-flight requests and request latency per route template.
+
+    Paths that match no route are grouped under one label so random URLs
+    cannot grow the number of series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(time.perf_counter() - started)
+
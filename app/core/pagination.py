@@ -0,0 +1,78 @@
+import base64
+import binascii
+import json
+from typing import Sequence
+from fastapi import HTTPException, status
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the keyset position after which the next page starts.
+
+    Args:
+        last_id (int): ID of the last item on the current page.
+
+    Returns:
+        str: An opaque, URL-safe cursor.
+    """
+    raw = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str | None) -> int | None:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str | None): The opaque cursor sent by the client.
+
+    Returns:
+        int | None: The ID after which to continue, or None for the first page.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = json.loads(raw)["id"]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        last_id = None
+    if not isinstance(last_id, int):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return last_id
+
+
+def paginate(rows: Sequence, limit: int) -> dict:
+    """
+    Build a page from rows fetched with ``limit + 1``.
+
+    The extra row only signals that another page exists; it is not returned.
+
+    Args:
+        rows (Sequence): Rows ordered by ID, at most ``limit + 1`` of them.
+        limit (int): Page size requested by the client.
+
+    Returns:
+        dict: The page items and the cursor of the next page, if any.
+    """
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(items[-1].id) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def paginate_rows(rows: Sequence, limit: int) -> dict:
+    """
+    Build a page of plain dicts from column rows fetched with ``limit + 1``.
+
+    Args:
+        rows (Sequence): `Row` objects including an ``id`` column, ordered by ID.
+        limit (int): Page size requested by the client.
+
+    Returns:
+        dict: The page items as dicts keyed by column name, and the next cursor.
+    """
+    page = paginate(rows, limit)
+    page["items"] = [row._asdict() for row in page["items"]]
+    return page
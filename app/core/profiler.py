@@ -0,0 +1,215 @@
+import hmac
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from types import CodeType
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import config
+from app.core.cache import TTLCache
+
+
+# Python frames idle threads sit in: pool workers waiting for a job and the
+# event loop waiting for I/O. Their samples are dropped unless asked for.
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+}
+
+
+def _label(code: CodeType) -> str:
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(stack: tuple[CodeType, ...]) -> bool:
+    leaf = stack[-1]
+    return (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES
+
+
+class Profile:
+    """
+    Stack samples taken by a `SamplingProfiler`.
+
+    Stacks are tuples of code objects from the thread's entry point down to
+    the function that was running, so samples aggregate per function.
+    """
+
+    def __init__(self, samples: Counter, interval: float, duration: float):
+        self.samples = samples
+        self.interval = interval
+        self.duration = duration
+
+    def stacks(self, include_idle: bool = False):
+        """Yield ``(stack, count)`` pairs, skipping idle threads unless asked."""
+        for stack, count in self.samples.items():
+            if include_idle or not _is_idle(stack):
+                yield stack, count
+
+    def collapsed(self, include_idle: bool = False) -> str:
+        """
+        Render the samples in the collapsed-stack format read by flamegraph.pl,
+        speedscope and similar tools: ``frame;frame;frame count`` per line.
+
+        Args:
+            include_idle (bool, optional): Keep samples of idle threads. Defaults to False.
+
+        Returns:
+            str: One line per distinct stack, root frame first.
+        """
+        lines = Counter()
+        for stack, count in self.stacks(include_idle):
+            lines[";".join(_label(code).replace(";", ":") for code in stack)] += count
+        return "".join(f"{line} {count}\n" for line, count in sorted(lines.items()))
+
+    def pstats(self, include_idle: bool = False) -> bytes:
+        """
+        Render the samples as a marshalled `pstats` file, for ``pstats.Stats``,
+        snakeviz and the like.
+
+        Sample counts stand in for call counts, and times are estimated as
+        samples times the sampling interval.
+
+        Args:
+            include_idle (bool, optional): Keep samples of idle threads. Defaults to False.
+
+        Returns:
+            bytes: The stats in the format written by ``cProfile.Profile.dump_stats``.
+        """
+        stats: dict[tuple, list] = {}
+
+        def key(code: CodeType) -> tuple[str, int, str]:
+            return code.co_filename, code.co_firstlineno, getattr(code, "co_qualname", code.co_name)
+
+        for stack, count in self.stacks(include_idle):
+            seconds = count * self.interval
+            seen = set()
+            for code in stack:
+                func = key(code)
+                entry = stats.setdefault(func, [0, 0, 0.0, 0.0, {}])
+                # recursive frames are counted once per sample
+                if func not in seen:
+                    seen.add(func)
+                    entry[0] += count
+                    entry[1] += count
+                    entry[3] += seconds
+            stats[key(stack[-1])][2] += seconds
+            for caller, callee in zip(stack, stack[1:]):
+                edges = stats[key(callee)][4]
+                nc, cc, tt, ct = edges.get(key(caller), (0, 0, 0.0, 0.0))
+                edges[key(caller)] = (nc + count, cc + count, tt, ct + seconds)
+        return marshal.dumps({func: tuple(entry) for func, entry in stats.items()})
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stacks of every thread of the process.
+
+    A daemon thread reads ``sys._current_frames()`` every ``interval``
+    seconds, so the profiled code runs unmodified and the cost is bounded by
+    the sampling rate rather than by the number of calls.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._samples = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._started = 0.0
+
+    def start(self):
+        """Start sampling in a background thread."""
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Profile:
+        """
+        Stop sampling.
+
+        Returns:
+            Profile: The samples taken since `start`.
+        """
+        self._stop.set()
+        self._thread.join()
+        return Profile(self._samples, self.interval, time.perf_counter() - self._started)
+
+    def _run(self):
+        own = threading.get_ident()
+        samples = self._samples
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack.reverse()
+                samples[tuple(stack)] += 1
+
+
+# Sampling every thread is process-wide, so one profile runs at a time per worker.
+profiler_lock = threading.Lock()
+
+# Results of profiled requests, by the id sent back in the X-Profile-Id header.
+request_profiles = TTLCache(maxsize=config.PROFILER_KEEP, ttl=config.PROFILER_KEEP_SECONDS)
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile a sample of the requests that ask for it with `PROFILER_REQUEST_HEADER`.
+
+    Only requests whose header holds `PROFILER_REQUEST_SECRET` qualify, so
+    anonymous clients cannot hold `profiler_lock` (and block
+    ``POST /admin/profile``) or make every thread be sampled.
+
+    The profile covers every thread while the request runs, so concurrent
+    requests show up in it too. It is stored in `request_profiles` and its id
+    is returned in the ``X-Profile-Id`` header; a request that is not sampled,
+    or arrives while another profile runs, is served normally.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.header = config.PROFILER_REQUEST_HEADER.lower().encode("latin-1")
+        self.secret = config.PROFILER_REQUEST_SECRET.encode("latin-1")
+
+    def _authorized(self, scope: Scope) -> bool:
+        if not self.secret:
+            return False
+        for name, value in scope["headers"]:
+            if name == self.header:
+                return hmac.compare_digest(value, self.secret)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or not self._authorized(scope)
+            or random.random() >= config.PROFILER_REQUEST_SAMPLE_RATE
+            or not profiler_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        profiler = SamplingProfiler(config.PROFILER_DEFAULT_INTERVAL_MS / 1000)
+
+        async def send_with_id(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_profiles.set(profile_id, profiler.stop())
+            profiler_lock.release()
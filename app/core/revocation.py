@@ -0,0 +1,143 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime
+from typing import Iterable
+from app.core import config
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter over strings.
+
+    Sized for ``capacity`` items at a false positive rate of ``error_rate``;
+    it never gives false negatives, so a miss is a definitive "not present".
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str):
+        """
+        Add an item to the filter.
+
+        Args:
+            item (str): The item.
+        """
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """
+    An in-memory mirror of the ``revoked_token`` table.
+
+    Lookups go through a Bloom filter first, so the common case (a token that
+    was never revoked) costs a few hashes; hits are confirmed against an exact
+    mapping of id to expiry. New rows are pulled incrementally by primary key,
+    re-reading a window below ``last_id`` for rows whose transaction committed
+    after a higher id had already been synced; ``apply`` is idempotent, so the
+    repeats are harmless. A periodic full rebuild drops expired entries.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, rebuild_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_seconds = rebuild_seconds
+        self.last_id = 0
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._entries: dict[str, datetime] = {}
+        self._rebuilt_at: float | None = None
+        self._lock = threading.Lock()
+
+    def is_revoked(self, token_id: str | None) -> bool:
+        """
+        Check whether a token id (``jti``) or token family id is revoked.
+
+        Args:
+            token_id (str | None): The id to check.
+
+        Returns:
+            bool: True if the id is revoked and has not expired yet.
+        """
+        if not token_id or token_id not in self._bloom:
+            return False
+        expires_at = self._entries.get(token_id)
+        return expires_at is not None and expires_at > datetime.now()
+
+    def add(self, token_id: str, expires_at: datetime):
+        """
+        Mark an id as revoked in this process without waiting for the next sync.
+
+        Args:
+            token_id (str): The revoked id.
+            expires_at (datetime): When the revoked token would have expired anyway.
+        """
+        with self._lock:
+            self._bloom.add(token_id)
+            self._entries[token_id] = expires_at
+
+    def apply(self, rows: Iterable[tuple[int, str, datetime]]):
+        """
+        Merge newly revoked rows into the list.
+
+        Args:
+            rows (Iterable[tuple[int, str, datetime]]): ``(id, jti, expires_at)`` rows.
+        """
+        with self._lock:
+            for row_id, token_id, expires_at in rows:
+                self._bloom.add(token_id)
+                self._entries[token_id] = expires_at
+                self.last_id = max(self.last_id, row_id)
+
+    def replace(self, rows: Iterable[tuple[int, str, datetime]]):
+        """
+        Rebuild the list from scratch out of the unexpired revoked rows.
+
+        Args:
+            rows (Iterable[tuple[int, str, datetime]]): ``(id, jti, expires_at)`` rows.
+        """
+        rows = list(rows)
+        bloom = BloomFilter(max(self.capacity, len(rows)), self.error_rate)
+        entries = {}
+        last_id = 0
+        for row_id, token_id, expires_at in rows:
+            bloom.add(token_id)
+            entries[token_id] = expires_at
+            last_id = max(last_id, row_id)
+        with self._lock:
+            self._bloom, self._entries = bloom, entries
+            self.last_id = max(self.last_id, last_id)
+            self._rebuilt_at = time.monotonic()
+
+    def needs_rebuild(self) -> bool:
+        """
+        Whether the list was never built or is older than ``rebuild_seconds``.
+
+        Returns:
+            bool: True if the list should be rebuilt.
+        """
+        return self._rebuilt_at is None or time.monotonic() - self._rebuilt_at >= self.rebuild_seconds
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+revocation_list = RevocationList(
+    capacity=config.REVOCATION_BLOOM_CAPACITY,
+    error_rate=config.REVOCATION_BLOOM_ERROR_RATE,
+    rebuild_seconds=config.REVOCATION_REBUILD_SECONDS,
+)
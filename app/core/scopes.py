@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Callable, Iterable
+from app.core import config
+
+
+_MISSING = object()
+# Distinct scope sets whose masks are memoized between catalog loads.
+_MASK_MEMO_SIZE = 4096
+
+
+class ScopeCatalog:
+    """
+    The live catalog of scope names and descriptions.
+
+    Loaded outside of import time (during `lifespan` and then on a schedule), so
+    worker boot does not depend on the database. Writes to scopes mark it stale,
+    and listeners are told whenever its contents change.
+
+    Each scope is also interned to a bit (persisted in ``scope_bit`` and never
+    reused, so every worker agrees and a live token's mask keeps its meaning),
+    letting a set of scopes be compared as one integer mask.
+    """
+
+    def __init__(self, max_age: float):
+        self.max_age = max_age
+        self.version = 0
+        self._scopes: dict[str, str] = {}
+        # bit positions and the masks memoized against them, swapped together
+        self._interned: tuple[dict[str, int], dict] = ({}, {})
+        self._loaded_at: float | None = None
+        self._stale = True
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[dict[str, str]], None]] = []
+
+    @property
+    def scopes(self) -> dict[str, str]:
+        """
+        The scope names and descriptions of the last successful load.
+        """
+        return self._scopes
+
+    def needs_refresh(self) -> bool:
+        """
+        Whether the catalog was never loaded, was invalidated or is older than ``max_age``.
+
+        Returns:
+            bool: True if the catalog should be reloaded.
+        """
+        return (
+            self._stale
+            or self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.max_age
+        )
+
+    def load(self, scopes: dict[str, str], bits: dict[str, int] | None = None):
+        """
+        Replace the catalog contents, notifying listeners if anything changed.
+
+        Args:
+            scopes (dict[str, str]): Scope names mapped to their descriptions.
+            bits (dict[str, int] | None, optional): Scope names mapped to their
+                bit position. Defaults to keeping the current ones.
+        """
+        with self._lock:
+            bits_changed = bits is not None and bits != self._interned[0]
+            if bits_changed:
+                self._interned = (dict(bits), {})
+            changed = scopes != self._scopes
+            if changed:
+                self._scopes = dict(scopes)
+            if changed or bits_changed:
+                self.version += 1
+            self._loaded_at = time.monotonic()
+            self._stale = False
+        if changed:
+            for listener in self._listeners:
+                listener(self._scopes)
+
+    def mask(self, names: Iterable[str]) -> int | None:
+        """
+        Compile scope names into a bitmask.
+
+        Masks are memoized per distinct set of names until the next load, so
+        repeat checks cost one dictionary lookup.
+
+        Args:
+            names (Iterable[str]): Scope names; a frozenset or a sequence.
+
+        Returns:
+            int | None: The mask, or None if a name is not in the catalog.
+        """
+        key = names if isinstance(names, frozenset) else tuple(names)
+        bits, masks = self._interned
+        mask = masks.get(key, _MISSING)
+        if mask is _MISSING:
+            mask = 0
+            for name in key:
+                bit = bits.get(name)
+                if bit is None:
+                    mask = None
+                    break
+                mask |= 1 << bit
+            if len(masks) >= _MASK_MEMO_SIZE:
+                masks.clear()
+            masks[key] = mask
+        return mask
+
+    def bit(self, name: str) -> int | None:
+        """
+        Return the bit a scope is interned to.
+
+        Args:
+            name (str): Scope name.
+
+        Returns:
+            int | None: The bit position, or None if the name is not in the catalog.
+        """
+        return self._interned[0].get(name)
+
+    def invalidate(self):
+        """
+        Mark the catalog stale so the next refresh reloads it.
+        """
+        self._stale = True
+
+    def subscribe(self, listener: Callable[[dict[str, str]], None]):
+        """
+        Register a callback run with the new contents whenever the catalog changes.
+
+        Args:
+            listener (Callable[[dict[str, str]], None]): The callback.
+        """
+        self._listeners.append(listener)
+
+
+scope_catalog = ScopeCatalog(max_age=config.SCOPE_CATALOG_REFRESH_SECONDS)
@@ -1,18 +1,32 @@
 from fastapi import Depends, HTTPException, status, Security
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
-from app.db.session import SessionDep, get_session
+from app.db.session import SessionDep, AsyncSessionDep
+from app.core.metrics import AUTH_REJECTIONS
+from app.core.scopes import scope_catalog
+from app.core.revocation import revocation_list
+from app.core.tracing import traced
 from app.services.auth import decode_access_token
 from app.services.users import UserServices, ScopeServices, RoleServices
+from app.services.users_async import AsyncUserServices, AsyncScopeServices
 from app.db.models.users import User
+from app.schemas.auth import TokenPayload
 from typing import Annotated
 
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/auth/login",
-    scopes=ScopeServices.get_all_scopes_dict(next(get_session())),
+    scopes=scope_catalog.scopes,
 )
 
 
+def _publish_scopes(scopes: dict[str, str]):
+    # keep the OpenAPI security scheme in step with the live catalog
+    oauth2_scheme.model.flows.password.scopes = dict(scopes)
+
+scope_catalog.subscribe(_publish_scopes)
+
+
+@traced(layer="security")
 def get_current_user(
         db: SessionDep,
         security_scopes: SecurityScopes,
@@ -32,32 +46,144 @@ def get_current_user(
     Raises:
         HTTPException: If the token is invalid, user is not found, or required scopes are not met.
     """
+    authenticate_value = _authenticate_value(security_scopes)
+    payload = _decode_token(token, authenticate_value)
+    user = UserServices.get_user(db, payload.sub)
+    _ensure_user(user, authenticate_value)
+    user_scopes = ScopeServices.get_user_scopes(db, user)
+    try:
+        _check_scopes(security_scopes, payload, user_scopes, authenticate_value)
+    except HTTPException:
+        AUTH_REJECTIONS.labels("missing_scope").inc()
+        raise
+    return user
+
+
+@traced(layer="security")
+async def get_current_user_async(
+        db: AsyncSessionDep,
+        security_scopes: SecurityScopes,
+        token: Annotated[str, Depends(oauth2_scheme)]
+) -> User:
+    """
+    Asyncio variant of `get_current_user`, used by the /v2 API.
+
+    Args:
+        db (AsyncSessionDep): Asyncio database session dependency.
+        security_scopes (SecurityScopes): Security scopes required for the endpoint.
+        token (str): OAuth2 token provided by the user.
+
+    Returns:
+        User: The authenticated user.
+
+    Raises:
+        HTTPException: If the token is invalid, user is not found, or required scopes are not met.
+    """
+    authenticate_value = _authenticate_value(security_scopes)
+    payload = _decode_token(token, authenticate_value)
+    user = await AsyncUserServices.get_user(db, payload.sub)
+    _ensure_user(user, authenticate_value)
+    user_scopes = await AsyncScopeServices.get_user_scopes(db, user)
+    try:
+        _check_scopes(security_scopes, payload, user_scopes, authenticate_value)
+    except HTTPException:
+        AUTH_REJECTIONS.labels("missing_scope").inc()
+        raise
+    return user
+
+
+def get_current_token(token: Annotated[str, Depends(oauth2_scheme)]) -> TokenPayload:
+    """
+    Retrieve the decoded payload of the provided access token.
+
+    Args:
+        token (str): OAuth2 token provided by the user.
+
+    Returns:
+        TokenPayload: The decoded token.
+
+    Raises:
+        HTTPException: If the token is invalid or revoked.
+    """
+    return _decode_token(token, "Bearer")
+
+
+def _authenticate_value(security_scopes: SecurityScopes) -> str:
     if security_scopes.scopes:
-        authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
-    else:
-        authenticate_value = "Bearer"
+        return f'Bearer scope="{security_scopes.scope_str}"'
+    return "Bearer"
+
+
+def _decode_token(token: str, authenticate_value: str) -> TokenPayload:
     payload = decode_access_token(token)
-    if not payload:
+    # revoked ids are checked in memory; see `TokenServices.sync_revocations`
+    if not payload or revocation_list.is_revoked(payload.jti) or revocation_list.is_revoked(payload.fid):
+        AUTH_REJECTIONS.labels("invalid_token").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": authenticate_value},
         )
-    user = UserServices.get_user(db, payload.sub)
+    return payload
+
+
+def _ensure_user(user: User | None, authenticate_value: str):
     if not user:
+        AUTH_REJECTIONS.labels("unknown_user").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": authenticate_value},
         )
-    user_scopes = ScopeServices.get_user_scopes(db, user.username)
+
+
+def _check_scopes(security_scopes: SecurityScopes,
+                  payload: TokenPayload,
+                  user_scopes: frozenset[str],
+                  authenticate_value: str):
+    """
+    Check the endpoint's required scopes against the token and the user's grants.
+
+    The requirement, the grants and the token's scopes are compiled to catalog
+    bitmasks (memoized per distinct set), so the check is one AND and compare.
+    Scopes the catalog does not know yet fall back to set lookups (and bit
+    tests of an ``smask`` token), and mark the catalog stale so it is reloaded.
+
+    Raises:
+        HTTPException: If a required scope is missing.
+    """
+    if not security_scopes.scopes:
+        return
+    restricted = bool(payload.scopes) or bool(payload.smask)
+    required = scope_catalog.mask(security_scopes.scopes)
+    granted = scope_catalog.mask(user_scopes)
+    if payload.smask is not None:
+        token_mask = payload.smask
+    else:
+        token_mask = scope_catalog.mask(payload.scopes) if payload.scopes else None
+
+    if required is not None and granted is not None and (token_mask is not None or not restricted):
+        if restricted:
+            # the token's scopes only count where the user still holds them
+            missing = required & ~(token_mask & granted)
+            detail = "You did not provide the necessary permissions"
+        else:
+            missing = required & ~granted
+            detail = "Not enough permissions"
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=detail,
+                headers={"WWW-Authenticate": authenticate_value},
+            )
+        return
+
+    # e.g. a scope created on another worker, or a check before the first load
+    scope_catalog.invalidate()
     for scope in security_scopes.scopes:
         # validate against payload scopes if provided
-        if len(payload.scopes) != 0:
-            # verify if the authenticity of the payload scopes
-            valid_payload_scopes = [
-                s for s in payload.scopes if s in user_scopes]
-            if scope not in valid_payload_scopes:
+        if restricted:
+            if scope not in user_scopes or not _token_grants(payload, scope):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="You did not provide the necessary permissions",
@@ -70,7 +196,14 @@ def get_current_user(
                 detail="Not enough permissions",
                 headers={"WWW-Authenticate": authenticate_value},
             )
-    return user
+
+
+def _token_grants(payload: TokenPayload, scope: str) -> bool:
+    # an ``smask`` token carries no scope names, only bits over the catalog
+    if payload.smask is not None:
+        bit = scope_catalog.bit(scope)
+        return bit is not None and bool(payload.smask >> bit & 1)
+    return scope in payload.scopes
 
 
 def get_current_active_user(
@@ -95,3 +228,22 @@ def get_current_active_user(
             detail="Inactive user",
         )
     return current_user
+
+
+async def get_current_active_user_async(
+    current_user: Annotated[User, Depends(get_current_user_async)],
+        security_scopes: SecurityScopes):
+    """
+    Asyncio variant of `get_current_active_user`, used by the /v2 API.
+
+    Args:
+        current_user (User): The current authenticated user.
+        security_scopes (SecurityScopes): Security scopes required for the endpoint.
+
+    Returns:
+        User: The active user.
+
+    Raises:
+        HTTPException: If the user is inactive.
+    """
+    return get_current_active_user(current_user, security_scopes)
@@ -0,0 +1,99 @@
+import logging
+import time
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import config
+from app.db.query_stats import QueryStats, current_query_stats, shorten_statement
+
+
+logger = logging.getLogger(__name__)
+
+
+def _route_path(scope: Scope) -> str:
+    # the router stores the matched route in the scope; unmatched paths are logged as-is
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope["path"]
+
+
+def server_timing(stats: QueryStats, total_seconds: float) -> str:
+    """
+    Format request and database timings as a ``Server-Timing`` header value.
+
+    Args:
+        stats (QueryStats): Statements executed for the request.
+        total_seconds (float): Time spent in the app so far.
+
+    Returns:
+        str: The header value, durations in milliseconds.
+    """
+    return (
+        f'db;dur={stats.seconds * 1000:.3f};desc="{stats.count} queries", '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.3f}, "
+        f"app;dur={total_seconds * 1000:.3f}"
+    )
+
+
+class QueryTimingMiddleware:
+    """
+    Count the SQL statements and database time of each request.
+
+    The totals are sent in a ``Server-Timing`` header and logged per route;
+    requests over `REQUEST_QUERY_BUDGET` queries or `REQUEST_LATENCY_BUDGET_MS`
+    are logged as warnings along with their slowest statement.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if config.SERVER_TIMING_ENABLED:
+                    # a streamed body may run more queries after the headers are sent
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stats, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self._log(scope, status_code, stats, time.perf_counter() - started)
+
+    @staticmethod
+    def _log(scope: Scope, status_code: int, stats: QueryStats, seconds: float):
+        route = f"{scope['method']} {_route_path(scope)}"
+        fields = {
+            "route": route,
+            "status": status_code,
+            "duration_ms": round(seconds * 1000, 3),
+            "db_queries": stats.count,
+            "db_ms": round(stats.seconds * 1000, 3),
+            "db_slowest_ms": round(stats.slowest_seconds * 1000, 3),
+        }
+        over_queries = 0 < config.REQUEST_QUERY_BUDGET < stats.count
+        over_latency = 0 < config.REQUEST_LATENCY_BUDGET_MS < seconds * 1000
+        if over_queries or over_latency:
+            fields["db_slowest_statement"] = shorten_statement(stats.slowest_statement or "")
+            fields["over_query_budget"] = over_queries
+            fields["over_latency_budget"] = over_latency
+            logger.warning(
+                "%s over budget: %d queries, %.1f ms (db %.1f ms)",
+                route, stats.count, seconds * 1000, stats.seconds * 1000, extra=fields,
+            )
+        else:
+            logger.debug(
+                "%s: %d queries, %.1f ms (db %.1f ms)",
+                route, stats.count, seconds * 1000, stats.seconds * 1000, extra=fields,
+            )
@@ -0,0 +1,239 @@
+import functools
+import inspect
+from typing import Callable, TypeVar
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core import config
+
+
+# Everything here is a no-op unless TRACING_ENABLED is set: the decorators
+# hand back the undecorated function or class, so disabled tracing adds no
+# call overhead, and the OpenTelemetry packages are only imported when enabled.
+ENABLED = config.TRACING_ENABLED
+
+_STATEMENT_MAX_LENGTH = 1000
+
+T = TypeVar("T")
+
+_provider = None
+
+
+def setup_tracing():
+    """
+    Install the tracer provider with the configured sampler and exporter.
+
+    Raises:
+        RuntimeError: If tracing is enabled but OpenTelemetry is not installed,
+            or `TRACING_EXPORTER` is unknown.
+    """
+    global _provider
+    if not ENABLED or _provider is not None:
+        return
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError as e:
+        raise RuntimeError("TRACING_ENABLED requires the opentelemetry-sdk package") from e
+
+    if config.TRACING_EXPORTER == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise RuntimeError("TRACING_EXPORTER=otlp requires opentelemetry-exporter-otlp-proto-http") from e
+        exporter = OTLPSpanExporter(endpoint=config.TRACING_OTLP_ENDPOINT)
+    elif config.TRACING_EXPORTER == "file":
+        exporter = ConsoleSpanExporter(
+            out=open(config.TRACING_FILE, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    elif config.TRACING_EXPORTER == "console":
+        exporter = ConsoleSpanExporter()
+    else:
+        raise RuntimeError(f"Unknown TRACING_EXPORTER {config.TRACING_EXPORTER!r}")
+
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": config.TRACING_SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(config.TRACING_SAMPLE_RATIO)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(_provider)
+
+
+def shutdown_tracing():
+    """
+    Flush the spans still buffered and stop the exporter.
+    """
+    if _provider is not None:
+        _provider.shutdown()
+
+
+@functools.cache
+def _tracer():
+    from opentelemetry import trace
+    return trace.get_tracer("app")
+
+
+def traced(name: str | None = None, layer: str | None = None) -> Callable[[T], T]:
+    """
+    Run a function inside a span named after it.
+
+    Coroutines and generators are covered until they finish; a generator's
+    span is not made current, as it may be resumed from another thread.
+
+    Args:
+        name (str | None, optional): Span name. Defaults to the function's qualified name.
+        layer (str | None, optional): Recorded as the ``app.layer`` attribute. Defaults to None.
+
+    Returns:
+        Callable[[T], T]: The decorator; the identity when tracing is disabled.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+        span_name = name or fn.__qualname__
+        attributes = {"app.layer": layer} if layer else None
+
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def async_gen_wrapper(*args, **kwargs):
+                span = _tracer().start_span(span_name, attributes=attributes)
+                try:
+                    async for item in fn(*args, **kwargs):
+                        yield item
+                finally:
+                    span.end()
+            return async_gen_wrapper
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                span = _tracer().start_span(span_name, attributes=attributes)
+                try:
+                    yield from fn(*args, **kwargs)
+                finally:
+                    span.end()
+            return gen_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with _tracer().start_as_current_span(span_name, attributes=attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _tracer().start_as_current_span(span_name, attributes=attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def traced_class(layer: str) -> Callable[[T], T]:
+    """
+    Trace every static method of a service or repository class.
+
+    Args:
+        layer (str): Layer the class belongs to, e.g. "service" or "repository".
+
+    Returns:
+        Callable[[T], T]: The class decorator; the identity when tracing is disabled.
+    """
+    def decorate(cls):
+        if not ENABLED:
+            return cls
+        for attr, value in list(vars(cls).items()):
+            if isinstance(value, staticmethod):
+                fn = traced(f"{cls.__name__}.{attr}", layer)(value.__func__)
+                setattr(cls, attr, staticmethod(fn))
+        return cls
+
+    return decorate
+
+
+def instrument_statements(engine):
+    """
+    Record every SQL statement as a span of the current trace.
+
+    Args:
+        engine (Engine): The (sync) engine to instrument.
+    """
+    if not ENABLED:
+        return
+    from opentelemetry.trace import SpanKind
+    from sqlalchemy import event
+
+    system = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._otel_span = _tracer().start_span(
+            f"SQL {statement.split(None, 1)[0].upper() if statement else ''}".strip(),
+            kind=SpanKind.CLIENT,
+            attributes={
+                "db.system": system,
+                "db.statement": statement[:_STATEMENT_MAX_LENGTH],
+                "db.executemany": executemany,
+            },
+        )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_otel_span", None)
+        if span is not None:
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_otel_span", None)
+        if span is not None:
+            span.record_exception(exception_context.original_exception)
+            span.end()
+
+
+class TracingMiddleware:
+    """
+    Open the server span of each request, continuing a trace started upstream
+    (W3C ``traceparent``), and name it after the matched route template.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        from opentelemetry import propagate
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with _tracer().start_as_current_span(
+            method,
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"], "app.layer": "router"},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    span.update_name(f"{method} {route}")
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
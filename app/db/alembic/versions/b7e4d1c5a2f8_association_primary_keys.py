@@ -0,0 +1,48 @@
+"""association primary keys
+
+Revision ID: b7e4d1c5a2f8
+Revises: 3f1c2a7d9b10
+Create Date: 2026-10-18 10:04:37.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e4d1c5a2f8'
+down_revision: Union[str, None] = '3f1c2a7d9b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_ASSOCIATIONS = {
+    'user_role': ('user_id', 'role_id'),
+    'role_scope': ('role_id', 'scope_id'),
+}
+
+
+def upgrade() -> None:
+    for table, (left, right) in _ASSOCIATIONS.items():
+        # drop duplicate and dangling rows so the primary key can be created
+        op.execute(
+            f'CREATE TABLE {table}_dedup AS SELECT DISTINCT {left}, {right} FROM {table} '
+            f'WHERE {left} IS NOT NULL AND {right} IS NOT NULL'
+        )
+        op.execute(f'DELETE FROM {table}')
+        op.execute(f'INSERT INTO {table} ({left}, {right}) SELECT {left}, {right} FROM {table}_dedup')
+        op.drop_table(f'{table}_dedup')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(left, existing_type=sa.Integer(), nullable=False)
+            batch_op.alter_column(right, existing_type=sa.Integer(), nullable=False)
+            batch_op.create_primary_key(f'pk_{table}', [left, right])
+
+
+def downgrade() -> None:
+    for table, (left, right) in _ASSOCIATIONS.items():
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'pk_{table}', type_='primary')
+            batch_op.alter_column(left, existing_type=sa.Integer(), nullable=True)
+            batch_op.alter_column(right, existing_type=sa.Integer(), nullable=True)
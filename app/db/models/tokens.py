@@ -0,0 +1,23 @@
+from datetime import datetime
+from app.db.base import Base
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_token"
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
+    token_hash: Mapped[str] = mapped_column(unique=True, index=True)
+    family_id: Mapped[str] = mapped_column(index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
+    scopes: Mapped[str] = mapped_column(default="")
+    expires_at: Mapped[datetime]
+    used_at: Mapped[datetime | None] = mapped_column(default=None)
+    revoked_at: Mapped[datetime | None] = mapped_column(default=None)
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_token"
+    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
+    # an access token ``jti`` or a whole token family id
+    jti: Mapped[str] = mapped_column(unique=True, index=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
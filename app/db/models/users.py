@@ -6,15 +6,25 @@ from sqlalchemy import Table, Column, Integer, ForeignKey
 user_role = Table(
     "user_role",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("user.id")),
-    Column("role_id", Integer, ForeignKey("role.id"))
+    Column("user_id", Integer, ForeignKey("user.id"), primary_key=True),
+    Column("role_id", Integer, ForeignKey("role.id"), primary_key=True)
 )
 
 role_scope = Table(
     "role_scope",
     Base.metadata,
-    Column("role_id", Integer, ForeignKey("role.id")),
-    Column("scope_id", Integer, ForeignKey("scope.id"))
+    Column("role_id", Integer, ForeignKey("role.id"), primary_key=True),
+    Column("scope_id", Integer, ForeignKey("scope.id"), primary_key=True)
+)
+
+# Materialized user -> scope grants (the distinct pairs of user_role joined with
+# role_scope), kept up to date by the repositories so an authorization check
+# reads one user's rows by primary key.
+user_effective_scope = Table(
+    "user_effective_scope",
+    Base.metadata,
+    Column("user_id", Integer, ForeignKey("user.id"), primary_key=True),
+    Column("scope_id", Integer, ForeignKey("scope.id"), primary_key=True)
 )
 
 class Role(Base):
@@ -32,6 +42,15 @@ class Scope(Base):
     description: Mapped[str] = mapped_column(default="")
     roles: Mapped[set["Role"]] = relationship(back_populates="scopes", secondary=role_scope)
 
+# The bit each scope name is interned to in ``smask`` token claims. Bits are
+# handed out densely on first use and rows are never deleted, so a position
+# always means the same scope name, even after the scope is dropped.
+class ScopeBit(Base):
+    __tablename__ = "scope_bit"
+    __table_args__ = {"sqlite_autoincrement": True}
+    bit: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(unique=True)
+
 class User(Base):
     __tablename__ = "user"
     id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
@@ -0,0 +1,9 @@
+from app.db.base import Base
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class DataVersion(Base):
+    __tablename__ = "data_version"
+    # one counter per versioned entity ("user", "role", "scope")
+    name: Mapped[str] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
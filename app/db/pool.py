@@ -0,0 +1,161 @@
+import logging
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+from app.core import config
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CONNECTS, DB_POOL_OVERFLOW, DB_POOL_TIMEOUTS, DB_POOL_WAIT
+
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """
+    Counters for one connection pool, fed by the instrumented pool classes and
+    SQLAlchemy pool events.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.waits = 0
+        self.slow_waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.overflow_max = 0
+
+    def record_wait(self, seconds: float, overflow: int):
+        """
+        Record how long a caller waited to obtain a connection.
+
+        Args:
+            seconds (float): Time spent inside the pool's checkout.
+            overflow (int): The pool's overflow count after the checkout.
+        """
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.overflow_max = max(self.overflow_max, overflow)
+            slow = seconds * 1000 >= config.DB_POOL_WAIT_WARN_MS
+            if slow:
+                self.slow_waits += 1
+        DB_POOL_WAIT.labels(self.name).observe(seconds)
+        DB_POOL_OVERFLOW.labels(self.name).set(max(overflow, 0))
+        if slow:
+            logger.warning("pool %s: waited %.1f ms for a connection", self.name, seconds * 1000)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Pool | None = None) -> dict:
+        """
+        Return the counters, plus live gauges when the pool is given.
+
+        Args:
+            pool (Pool | None, optional): The pool to read gauges from. Defaults to None.
+
+        Returns:
+            dict: Counter and gauge values keyed by name.
+        """
+        with self._lock:
+            data = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "waits": self.waits,
+                "slow_waits": self.slow_waits,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "overflow_max": self.overflow_max,
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return data
+
+
+pool_stats: dict[str, PoolStats] = {}
+
+
+def get_pool_stats(name: str) -> PoolStats:
+    """
+    Return the stats of the pool registered under ``name``, creating them if needed.
+
+    Args:
+        name (str): Pool logging name, e.g. "sync" or "async".
+
+    Returns:
+        PoolStats: The pool's stats.
+    """
+    if name not in pool_stats:
+        pool_stats[name] = PoolStats(name)
+    return pool_stats[name]
+
+
+class _TimedCheckoutMixin:
+    """Times `_do_get`, i.e. queueing for a free slot plus opening overflow connections."""
+
+    def _do_get(self):
+        stats = get_pool_stats(self.logging_name or "default")
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            stats.increment("timeouts")
+            DB_POOL_TIMEOUTS.labels(stats.name).inc()
+            raise
+        stats.record_wait(time.perf_counter() - start, self.overflow())
+        return record
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(engine: Engine, name: str):
+    """
+    Count connects, checkouts, checkins and invalidations through pool events.
+
+    Args:
+        engine (Engine): The (sync) engine whose pool is instrumented.
+        name (str): Name the stats are registered under.
+    """
+    stats = get_pool_stats(name)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.increment("connects")
+        DB_POOL_CONNECTS.labels(name).inc()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.increment("checkouts")
+        DB_POOL_CHECKED_OUT.labels(name).inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        stats.increment("checkins")
+        DB_POOL_CHECKED_OUT.labels(name).dec()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
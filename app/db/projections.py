@@ -0,0 +1,64 @@
+from datetime import datetime
+
+
+class UserSummary:
+    """
+    Detached snapshot of the columns `UserPublic` serializes.
+
+    Unlike a mapped `User`, it is not tracked by the session, has no
+    relationships to lazy-load and costs one small slotted object per row.
+    """
+    __slots__ = ("first_name", "last_name", "id", "username", "disabled", "created_at", "updated_at")
+
+    def __init__(self,
+                 first_name: str | None,
+                 last_name: str | None,
+                 id: int,
+                 username: str,
+                 disabled: bool,
+                 created_at: datetime,
+                 updated_at: datetime):
+        self.first_name = first_name
+        self.last_name = last_name
+        self.id = id
+        self.username = username
+        self.disabled = disabled
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    def __repr__(self) -> str:
+        return f"UserSummary(id={self.id!r}, username={self.username!r})"
+
+
+class RoleSummary:
+    """
+    Detached snapshot of the columns `RolePublic` serializes.
+    """
+    __slots__ = ("name", "description", "id", "created_at", "updated_at")
+
+    def __init__(self, name: str, description: str, id: int, created_at: datetime, updated_at: datetime):
+        self.name = name
+        self.description = description
+        self.id = id
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    def __repr__(self) -> str:
+        return f"RoleSummary(id={self.id!r}, name={self.name!r})"
+
+
+class ScopeSummary:
+    """
+    Detached snapshot of the columns `ScopePublic` serializes.
+    """
+    __slots__ = ("name", "description", "id", "created_at", "updated_at")
+
+    def __init__(self, name: str, description: str, id: int, created_at: datetime, updated_at: datetime):
+        self.name = name
+        self.description = description
+        self.id = id
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    def __repr__(self) -> str:
+        return f"ScopeSummary(id={self.id!r}, name={self.name!r})"
@@ -0,0 +1,80 @@
+import logging
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core import config
+
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text kept for logs.
+_STATEMENT_MAX_LENGTH = 500
+
+
+class QueryStats:
+    """
+    SQL statements executed on behalf of one request.
+    """
+
+    __slots__ = ("count", "seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: str | None = None
+
+    def record(self, statement: str, seconds: float):
+        """
+        Account for one executed statement.
+
+        Args:
+            statement (str): The SQL sent to the database.
+            seconds (float): Time spent in the driver's execute.
+        """
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+# Stats of the request being served. Worker threads and greenlets run with a
+# copy of the request's context, so they all record into the same object.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def shorten_statement(statement: str) -> str:
+    """Collapse whitespace in a statement and cut it to a loggable length."""
+    statement = " ".join(statement.split())
+    if len(statement) > _STATEMENT_MAX_LENGTH:
+        return statement[:_STATEMENT_MAX_LENGTH] + "..."
+    return statement
+
+
+def instrument_queries(engine: Engine):
+    """
+    Time every statement through cursor events, attribute it to the current
+    request and log the slow ones.
+
+    Args:
+        engine (Engine): The (sync) engine to instrument.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context._query_start_time
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, seconds)
+        if seconds * 1000 >= config.DB_SLOW_QUERY_MS:
+            short = shorten_statement(statement)
+            logger.warning(
+                "slow query: %.1f ms: %s", seconds * 1000, short,
+                extra={"db_ms": round(seconds * 1000, 3), "statement": short},
+            )
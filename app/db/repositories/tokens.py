@@ -0,0 +1,170 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete
+from app.db.models.tokens import RefreshToken, RevokedToken
+from app.core.tracing import traced_class
+
+
+@traced_class("repository")
+class RefreshTokenRepository:
+    @staticmethod
+    def create_refresh_token(session: Session,
+                             token_hash: str,
+                             family_id: str,
+                             user_id: int,
+                             scopes: list[str],
+                             expires_at: datetime) -> RefreshToken:
+        """
+        Store a new refresh token, identified by the digest of its value.
+
+        Args:
+            session (Session): Database session.
+            token_hash (str): Digest of the refresh token.
+            family_id (str): Id shared by every token rotated from the same login.
+            user_id (int): Owner of the token.
+            scopes (list[str]): Scopes granted at login.
+            expires_at (datetime): Expiry of the token.
+
+        Returns:
+            RefreshToken: The stored token.
+        """
+        token = RefreshToken(
+            token_hash=token_hash,
+            family_id=family_id,
+            user_id=user_id,
+            scopes=" ".join(scopes),
+            expires_at=expires_at,
+        )
+        session.add(token)
+        session.flush()
+        return token
+
+    @staticmethod
+    def get_refresh_token(session: Session, token_hash: str) -> RefreshToken:
+        """
+        Retrieve a refresh token by the digest of its value.
+
+        Args:
+            session (Session): Database session.
+            token_hash (str): Digest of the refresh token.
+
+        Returns:
+            RefreshToken: The token, or None if unknown.
+        """
+        return session.scalar(select(RefreshToken).where(RefreshToken.token_hash == token_hash))
+
+    @staticmethod
+    def mark_used(session: Session, token_id: int, now: datetime) -> bool:
+        """
+        Mark a refresh token as used, unless it was already used or revoked.
+
+        The check and the write are one conditional UPDATE, so two concurrent
+        refreshes with the same token cannot both succeed.
+
+        Args:
+            session (Session): Database session.
+            token_id (int): Id of the refresh token.
+            now (datetime): Current time.
+
+        Returns:
+            bool: True if this call consumed the token.
+        """
+        result = session.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == token_id,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(used_at=now)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def revoke_family(session: Session, family_id: str, now: datetime):
+        """
+        Revoke every refresh token of a family.
+
+        Args:
+            session (Session): Database session.
+            family_id (str): Id of the token family.
+            now (datetime): Current time.
+        """
+        session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=now)
+        )
+
+    @staticmethod
+    def delete_expired(session: Session, now: datetime) -> int:
+        """
+        Delete refresh tokens that have expired.
+
+        Args:
+            session (Session): Database session.
+            now (datetime): Current time.
+
+        Returns:
+            int: The number of deleted tokens.
+        """
+        return session.execute(delete(RefreshToken).where(RefreshToken.expires_at <= now)).rowcount
+
+
+@traced_class("repository")
+class RevokedTokenRepository:
+    @staticmethod
+    def revoke(session: Session, jti: str, expires_at: datetime) -> RevokedToken:
+        """
+        Record a revoked token or token family id.
+
+        Args:
+            session (Session): Database session.
+            jti (str): The token id (``jti``) or family id (``fid``).
+            expires_at (datetime): When the entry can be forgotten.
+
+        Returns:
+            RevokedToken: The revocation entry.
+        """
+        existing = session.scalar(select(RevokedToken).where(RevokedToken.jti == jti))
+        if existing:
+            return existing
+        revoked = RevokedToken(jti=jti, expires_at=expires_at)
+        session.add(revoked)
+        session.flush()
+        return revoked
+
+    @staticmethod
+    def get_revoked_since(session: Session, last_id: int, now: datetime) -> list[tuple[int, str, datetime]]:
+        """
+        Retrieve unexpired revocations with an id greater than ``last_id``.
+
+        Args:
+            session (Session): Database session.
+            last_id (int): Highest id already synced; 0 for all.
+            now (datetime): Current time.
+
+        Returns:
+            list[tuple[int, str, datetime]]: ``(id, jti, expires_at)`` rows.
+        """
+        stmt = (
+            select(RevokedToken.id, RevokedToken.jti, RevokedToken.expires_at)
+            .where(RevokedToken.id > last_id, RevokedToken.expires_at > now)
+            .order_by(RevokedToken.id)
+        )
+        return [tuple(row) for row in session.execute(stmt)]
+
+    @staticmethod
+    def delete_expired(session: Session, now: datetime) -> int:
+        """
+        Delete revocations whose tokens have expired anyway.
+
+        Args:
+            session (Session): Database session.
+            now (datetime): Current time.
+
+        Returns:
+            int: The number of deleted entries.
+        """
+        return session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now)).rowcount
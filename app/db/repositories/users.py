@@ -1,68 +1,470 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select, update, delete, insert
-from app.db.models.users import User, Role, Scope
+from collections import defaultdict
+from itertools import starmap
+from typing import Callable, Iterator, Literal
+from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy.engine import Row
+from sqlalchemy import Column, Select, select, update, delete, insert, literal, exists, func
+from sqlalchemy.dialects import postgresql, sqlite
+from app.db.models.users import User, Role, Scope, ScopeBit, user_role, role_scope, user_effective_scope
+from app.db.projections import UserSummary, RoleSummary, ScopeSummary
 from app.schemas import users as users_schema
+from app.core.cache import user_scopes_cache
+from app.core.scopes import scope_catalog
+from app.core.tracing import traced_class
 
 
+# How the user -> role -> scope graph is loaded alongside the requested object.
+# "lazy" keeps the mapper default, "selectin" issues one extra SELECT ... IN per
+# relationship level and "joined" folds everything into the main query.
+LoaderStrategy = Literal["lazy", "selectin", "joined"]
+
+# How a membership change treats the links that already exist.
+MembershipAction = Literal["add", "remove", "replace"]
+
+_LOADERS = {"selectin": selectinload, "joined": joinedload}
+
+
+def _user_options(loader: LoaderStrategy) -> list:
+    """Loader options covering what `UserPublic_Admin` serializes."""
+    if loader == "lazy":
+        return []
+    load = _LOADERS[loader]
+    return [load(User.roles)]
+
+
+def _role_options(loader: LoaderStrategy) -> list:
+    """Loader options covering what `RolePublic_Admin` serializes."""
+    if loader == "lazy":
+        return []
+    load = _LOADERS[loader]
+    return [load(Role.users).options(load(User.roles)), load(Role.scopes)]
+
+
+def _scope_options(loader: LoaderStrategy) -> list:
+    """Loader options covering what `ScopePublic_Admin` serializes."""
+    if loader == "lazy":
+        return []
+    load = _LOADERS[loader]
+    return [load(Scope.roles).options(*_role_options(loader))]
+
+
+def _users_page_query(limit: int,
+                      after_id: int | None,
+                      username_prefix: str | None,
+                      disabled: bool | None,
+                      role_name: str | None) -> Select:
+    """Keyset page of users ordered by ID, with the optional filters applied."""
+    stmt = select(User)
+    if after_id is not None:
+        stmt = stmt.where(User.id > after_id)
+    if username_prefix:
+        stmt = stmt.where(User.username.startswith(username_prefix, autoescape=True))
+    if disabled is not None:
+        stmt = stmt.where(User.disabled == disabled)
+    if role_name:
+        stmt = stmt.where(User.roles.any(Role.name == role_name))
+    return stmt.order_by(User.id).limit(limit)
+
+
+def _named_page_query(model: type[Role] | type[Scope],
+                      limit: int,
+                      after_id: int | None,
+                      name_prefix: str | None) -> Select:
+    """Keyset page of roles or scopes ordered by ID, optionally filtered by name prefix."""
+    stmt = select(model)
+    if after_id is not None:
+        stmt = stmt.where(model.id > after_id)
+    if name_prefix:
+        stmt = stmt.where(model.name.startswith(name_prefix, autoescape=True))
+    return stmt.order_by(model.id).limit(limit)
+
+
+def _columns(model: type[User] | type[Role] | type[Scope], fields: tuple[str, ...]) -> list:
+    """Column attributes of ``model`` named by ``fields``, in order."""
+    return [getattr(model, field) for field in fields]
+
+
+def _summary_query(stmt: Select, model: type[User] | type[Role] | type[Scope], summary: type) -> Select:
+    """``stmt`` selecting only the columns of ``model`` that ``summary`` holds, in slot order."""
+    return stmt.with_only_columns(*_columns(model, summary.__slots__))
+
+
+def _summaries(session: Session, model: type[User] | type[Role] | type[Scope], summary: type) -> list:
+    """Every row of ``model`` as a detached ``summary``, selecting only its slots, ordered by ID."""
+    stmt = _summary_query(select(model).order_by(model.id), model, summary)
+    return list(starmap(summary, session.execute(stmt)))
+
+
+def _scope_names_for_user_query(user_id: int) -> Select:
+    """Names of the scopes granted to a user, read from `user_effective_scope`."""
+    return (
+        select(Scope.name)
+        .join(user_effective_scope, user_effective_scope.c.scope_id == Scope.id)
+        .where(user_effective_scope.c.user_id == user_id)
+    )
+
+
+def _effective_scope_pairs(user_ids=None) -> Select:
+    """Distinct ``(user_id, scope_id)`` grants derived from the association tables."""
+    stmt = (
+        select(user_role.c.user_id, role_scope.c.scope_id)
+        .join(role_scope, role_scope.c.role_id == user_role.c.role_id)
+        .distinct()
+    )
+    if user_ids is not None:
+        stmt = stmt.where(user_role.c.user_id.in_(user_ids))
+    return stmt
+
+
+def _refresh_effective_scopes(session: Session, user_ids, replace: bool = True):
+    """
+    Recompute `user_effective_scope` for some users inside the current transaction.
+
+    Args:
+        session (Session): Database session.
+        user_ids: A list of user IDs or a select of them.
+        replace (bool, optional): Delete the users' current rows first; only
+            brand-new users can skip this. Defaults to True.
+    """
+    if replace:
+        session.execute(delete(user_effective_scope).where(user_effective_scope.c.user_id.in_(user_ids)))
+    session.execute(
+        insert(user_effective_scope).from_select(["user_id", "scope_id"], _effective_scope_pairs(user_ids))
+    )
+
+
+def _role_member_ids(role_id: int) -> Select:
+    return select(user_role.c.user_id).where(user_role.c.role_id == role_id)
+
+
+def _scope_holder_ids(scope_id: int) -> Select:
+    return (
+        select(user_role.c.user_id)
+        .join(role_scope, role_scope.c.role_id == user_role.c.role_id)
+        .where(role_scope.c.scope_id == scope_id)
+    )
+
+
+def _stream_with_related(session: Session,
+                         stmt,
+                         batch_size: int,
+                         related: Callable[[list[int]], object]) -> Iterator[tuple[Row, list[str]]]:
+    """
+    Stream rows through a server-side cursor, attaching related names per batch.
+
+    Args:
+        session (Session): Database session.
+        stmt: Select of the owner columns, including ``id``.
+        batch_size (int): Rows fetched per round trip.
+        related (Callable): Builds a select of ``(owner_id, name)`` pairs for a list of owner IDs.
+
+    Yields:
+        tuple[Row, list[str]]: Each owner row with the names related to it.
+    """
+    result = session.execute(stmt.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        names = defaultdict(list)
+        for owner_id, name in session.execute(related([row.id for row in rows])):
+            names[owner_id].append(name)
+        for row in rows:
+            yield row, names[row.id]
+
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING.
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _add_links(session: Session,
+               owner_column: Column,
+               member_column: Column,
+               owner_id: int,
+               source_id: Column,
+               condition) -> int:
+    """
+    Link ``owner_id`` to every ``source_id`` matching ``condition`` with one INSERT ... SELECT.
+
+    Pairs that are already linked are skipped by a NOT EXISTS filter, and by
+    ON CONFLICT DO NOTHING where the dialect has it, so concurrent callers
+    cannot trip the association table's primary key.
+
+    Returns:
+        int: The number of links inserted.
+    """
+    pairs = select(literal(owner_id), source_id).where(
+        condition,
+        ~exists().where(owner_column == owner_id, member_column == source_id),
+    )
+    dialect = session.get_bind().dialect.name
+    stmt = _UPSERT_INSERTS.get(dialect, insert)(owner_column.table).from_select(
+        [owner_column.name, member_column.name], pairs,
+    )
+    if dialect in _UPSERT_INSERTS:
+        stmt = stmt.on_conflict_do_nothing()
+    return session.execute(stmt).rowcount
+
+
+def _intern_scope_bit(session: Session, name: str):
+    # concurrent writers may intern the same name; the unique name keeps one row
+    if session.scalar(select(ScopeBit.bit).where(ScopeBit.name == name)) is not None:
+        return
+    dialect = session.get_bind().dialect.name
+    stmt = _UPSERT_INSERTS.get(dialect, insert)(ScopeBit).values(name=name)
+    if dialect in _UPSERT_INSERTS:
+        stmt = stmt.on_conflict_do_nothing()
+    session.execute(stmt)
+
+
+def _remove_links(session: Session,
+                  owner_column: Column,
+                  member_column: Column,
+                  owner_id: int,
+                  source_id: Column,
+                  condition,
+                  keep: bool = False) -> int:
+    """
+    Unlink ``owner_id`` from every ``source_id`` matching ``condition`` with one DELETE ... IN.
+
+    With ``keep`` the match is inverted, unlinking every member that does not match.
+
+    Returns:
+        int: The number of links deleted.
+    """
+    members = select(source_id).where(condition)
+    in_members = member_column.in_(members)
+    stmt = delete(owner_column.table).where(owner_column == owner_id, ~in_members if keep else in_members)
+    return session.execute(stmt).rowcount
+
+
+def _change_links(session: Session,
+                  owner_column: Column,
+                  member_column: Column,
+                  owner_id: int,
+                  source_id: Column,
+                  condition,
+                  action: MembershipAction) -> tuple[int, int]:
+    """Apply a membership action; returns the number of links added and removed."""
+    if action == "remove":
+        return 0, _remove_links(session, owner_column, member_column, owner_id, source_id, condition)
+    removed = 0
+    if action == "replace":
+        removed = _remove_links(session, owner_column, member_column, owner_id, source_id, condition, keep=True)
+    return _add_links(session, owner_column, member_column, owner_id, source_id, condition), removed
+
+
+@traced_class("repository")
 class UserRepository:
     @staticmethod
-    def get_user_by_id(session: Session, id: int) -> User:
+    def get_user_by_id(session: Session, id: int, loader: LoaderStrategy = "lazy") -> User:
         """
         Retrieve a user by their ID.
 
         Args:
             session (Session): Database session.
             id (int): User ID.
+            loader (LoaderStrategy, optional): How to load the user's roles. Defaults to "lazy".
 
         Returns:
             User: The user with the specified ID.
         """
-        return session.get(User, id)
+        return session.get(User, id, options=_user_options(loader))
     
     @staticmethod
-    def get_user_by_username(session: Session, username: str) -> User:
+    def get_user_by_username(session: Session, username: str, loader: LoaderStrategy = "lazy") -> User:
         """
         Retrieve a user by their username.
 
         Args:
             session (Session): Database session.
             username (str): Username.
+            loader (LoaderStrategy, optional): How to load the user's roles. Defaults to "lazy".
 
         Returns:
             User: The user with the specified username.
         """
-        return session.scalar(select(User).where(User.username == username))
+        stmt = select(User).where(User.username == username).options(*_user_options(loader))
+        return session.scalars(stmt).unique().first()
     
     @staticmethod
-    def get_all_users(session: Session) -> list[User]:
+    def get_all_users(session: Session, loader: LoaderStrategy = "lazy") -> list[User]:
         """
         Retrieve all users.
 
         Args:
             session (Session): Database session.
+            loader (LoaderStrategy, optional): How to load the users' roles. Defaults to "lazy".
 
         Returns:
             list[User]: A list of all users.
         """
-        return session.scalars(select(User)).all()
+        return session.scalars(select(User).options(*_user_options(loader))).unique().all()
+
+    @staticmethod
+    def get_user_summaries(session: Session) -> list[UserSummary]:
+        """
+        Retrieve all users as detached summaries of their public columns.
+
+        Only the columns are selected; no `User` is loaded into the session.
+
+        Args:
+            session (Session): Database session.
+
+        Returns:
+            list[UserSummary]: Every user, ordered by ID.
+        """
+        return _summaries(session, User, UserSummary)
     
     @staticmethod
-    def create_user(session: Session, data: users_schema.UserCreate) -> User:
+    def get_users_page(session: Session,
+                       *,
+                       limit: int,
+                       after_id: int | None = None,
+                       username_prefix: str | None = None,
+                       disabled: bool | None = None,
+                       role_name: str | None = None) -> list[UserSummary]:
         """
-        Create a new user.
+        Retrieve one keyset page of users ordered by ID, as detached summaries.
+
+        Args:
+            session (Session): Database session.
+            limit (int): Maximum number of users to return.
+            after_id (int | None, optional): Only return users with a greater ID. Defaults to None.
+            username_prefix (str | None, optional): Only return usernames starting with this. Defaults to None.
+            disabled (bool | None, optional): Only return users with this disabled flag. Defaults to None.
+            role_name (str | None, optional): Only return users holding this role. Defaults to None.
+
+        Returns:
+            list[UserSummary]: Up to ``limit`` users.
+        """
+        stmt = _users_page_query(limit, after_id, username_prefix, disabled, role_name)
+        return list(starmap(UserSummary, session.execute(_summary_query(stmt, User, UserSummary))))
+    
+    @staticmethod
+    def get_users_page_rows(session: Session,
+                            fields: tuple[str, ...],
+                            *,
+                            limit: int,
+                            after_id: int | None = None,
+                            username_prefix: str | None = None,
+                            disabled: bool | None = None,
+                            role_name: str | None = None) -> list[Row]:
+        """
+        Retrieve one keyset page of users as column rows, without loading `User` objects.
+
+        Args:
+            session (Session): Database session.
+            fields (tuple[str, ...]): Names of the `User` columns to select, in order.
+            limit (int): Maximum number of users to return.
+            after_id (int | None, optional): Only return users with a greater ID. Defaults to None.
+            username_prefix (str | None, optional): Only return usernames starting with this. Defaults to None.
+            disabled (bool | None, optional): Only return users with this disabled flag. Defaults to None.
+            role_name (str | None, optional): Only return users holding this role. Defaults to None.
+
+        Returns:
+            list[Row]: Up to ``limit`` rows of the selected columns.
+        """
+        stmt = _users_page_query(limit, after_id, username_prefix, disabled, role_name)
+        return session.execute(stmt.with_only_columns(*_columns(User, fields))).all()
+    
+    @staticmethod
+    def stream_users_with_roles(session: Session, batch_size: int) -> Iterator[tuple[Row, list[str]]]:
+        """
+        Stream every user with their role names, ordered by ID.
+
+        Rows are fetched ``batch_size`` at a time through a server-side cursor,
+        so memory use does not depend on the size of the table.
+
+        Args:
+            session (Session): Database session.
+            batch_size (int): Rows fetched per round trip.
+
+        Yields:
+            tuple[Row, list[str]]: Each user's columns and role names.
+        """
+        stmt = select(
+            User.id, User.username, User.first_name, User.last_name,
+            User.disabled, User.created_at, User.updated_at,
+        ).order_by(User.id)
+        yield from _stream_with_related(
+            session, stmt, batch_size,
+            lambda ids: select(user_role.c.user_id, Role.name)
+            .join(Role, Role.id == user_role.c.role_id)
+            .where(user_role.c.user_id.in_(ids)),
+        )
+    
+    @staticmethod
+    def create_user(session: Session, data: users_schema.UserCreate, role_names: list[str] = ()) -> User:
+        """
+        Create a new user and link them to the given roles in one transaction.
+
+        The user is inserted with INSERT ... RETURNING and the role links with a
+        single INSERT ... SELECT, so no lookups precede the commit. A taken
+        username surfaces as an `IntegrityError` from the unique index.
 
         Args:
             session (Session): Database session.
             data (UserCreate): Data to create a new user.
+            role_names (list[str], optional): Names of the roles to grant. Defaults to none.
 
         Returns:
             User: The created user.
+
+        Raises:
+            IntegrityError: If the username already exists.
         """
-        user = User(**data.model_dump())
-        session.add(user)
+        user = session.scalar(insert(User).values(**data.model_dump()).returning(User))
+        if role_names:
+            session.execute(
+                insert(user_role).from_select(
+                    ["user_id", "role_id"],
+                    select(literal(user.id), Role.id).where(Role.name.in_(role_names)),
+                )
+            )
+            _refresh_effective_scopes(session, [user.id], replace=False)
         session.commit()
         return user
     
+    @staticmethod
+    def get_existing_usernames(session: Session, usernames: list[str]) -> set[str]:
+        """
+        Return which of the given usernames are already taken, in one query.
+
+        Args:
+            session (Session): Database session.
+            usernames (list[str]): Usernames to check.
+
+        Returns:
+            set[str]: The usernames that already exist.
+        """
+        if not usernames:
+            return set()
+        return set(session.scalars(select(User.username).where(User.username.in_(usernames))))
+
+    @staticmethod
+    def bulk_create_users(session: Session, rows: list[dict], role_names: list[str]) -> list[int]:
+        """
+        Insert many users and link each of them to the given roles.
+
+        Users are inserted with one batched INSERT ... RETURNING and their
+        `user_role` rows with one executemany. Nothing is committed.
+
+        Args:
+            session (Session): Database session.
+            rows (list[dict]): Column values of the users, with hashed passwords.
+            role_names (list[str]): Names of the roles every user gets.
+
+        Returns:
+            list[int]: The ids of the created users.
+        """
+        if not rows:
+            return []
+        user_ids = list(session.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), rows))
+        role_ids = list(session.scalars(select(Role.id).where(Role.name.in_(role_names))))
+        links = [{"user_id": user_id, "role_id": role_id} for user_id in user_ids for role_id in role_ids]
+        if links:
+            session.execute(insert(user_role), links)
+            _refresh_effective_scopes(session, user_ids, replace=False)
+        return user_ids
+
     @staticmethod
     def update_user(session: Session, user_id: int, data: users_schema.UserUpdate) -> User:
         """
@@ -100,8 +502,11 @@ class UserRepository:
         session.execute(update_stmt)
         user = UserRepository.get_user_by_id(session, user_id)
         user.roles.update(roles)
+        session.flush()
+        _refresh_effective_scopes(session, [user_id])
         session.commit()
-        return user
+        user_scopes_cache.delete(user_id)
+        return UserRepository.get_user_by_id(session, user_id, loader="selectin")
     
     @staticmethod
     def delete_user(session: Session, user_id: int):
@@ -113,24 +518,28 @@ class UserRepository:
             user_id (int): User ID.
         """
         user = UserRepository.get_user_by_id(session, user_id)
+        session.execute(delete(user_effective_scope).where(user_effective_scope.c.user_id == user_id))
         session.delete(user)
         session.commit()
+        user_scopes_cache.delete(user_id)
     
 
+@traced_class("repository")
 class RoleRepository:
     @staticmethod
-    def get_role_by_id(session: Session, role_id: int) -> Role:
+    def get_role_by_id(session: Session, role_id: int, loader: LoaderStrategy = "lazy") -> Role:
         """
         Retrieve a role by its ID.
 
         Args:
             session (Session): Database session.
             role_id (int): Role ID.
+            loader (LoaderStrategy, optional): How to load the role's users and scopes. Defaults to "lazy".
 
         Returns:
             Role: The role with the specified ID.
         """
-        return session.get(Role, role_id)
+        return session.get(Role, role_id, options=_role_options(loader))
     
     @staticmethod
     def get_role_by_name(session: Session, role_name: str) -> Role:
@@ -147,17 +556,99 @@ class RoleRepository:
         return session.scalar(select(Role).where(Role.name == role_name))
     
     @staticmethod
-    def get_all_roles(session: Session) -> list[Role]:
+    def get_all_roles(session: Session, loader: LoaderStrategy = "lazy") -> list[Role]:
         """
         Retrieve all roles.
 
         Args:
             session (Session): Database session.
+            loader (LoaderStrategy, optional): How to load the roles' users and scopes. Defaults to "lazy".
 
         Returns:
             list[Role]: A list of all roles.
         """
-        return session.scalars(select(Role)).all()
+        return session.scalars(select(Role).options(*_role_options(loader))).unique().all()
+
+    @staticmethod
+    def get_role_summaries(session: Session) -> list[RoleSummary]:
+        """
+        Retrieve all roles as detached summaries of their public columns.
+
+        Only the columns are selected; no `Role` is loaded into the session.
+
+        Args:
+            session (Session): Database session.
+
+        Returns:
+            list[RoleSummary]: Every role, ordered by ID.
+        """
+        return _summaries(session, Role, RoleSummary)
+    
+    @staticmethod
+    def get_roles_page(session: Session,
+                       *,
+                       limit: int,
+                       after_id: int | None = None,
+                       name_prefix: str | None = None) -> list[RoleSummary]:
+        """
+        Retrieve one keyset page of roles ordered by ID, as detached summaries.
+
+        Args:
+            session (Session): Database session.
+            limit (int): Maximum number of roles to return.
+            after_id (int | None, optional): Only return roles with a greater ID. Defaults to None.
+            name_prefix (str | None, optional): Only return role names starting with this. Defaults to None.
+
+        Returns:
+            list[RoleSummary]: Up to ``limit`` roles.
+        """
+        stmt = _summary_query(_named_page_query(Role, limit, after_id, name_prefix), Role, RoleSummary)
+        return list(starmap(RoleSummary, session.execute(stmt)))
+    
+    @staticmethod
+    def get_roles_page_rows(session: Session,
+                            fields: tuple[str, ...],
+                            *,
+                            limit: int,
+                            after_id: int | None = None,
+                            name_prefix: str | None = None) -> list[Row]:
+        """
+        Retrieve one keyset page of roles as column rows, without loading `Role` objects.
+
+        Args:
+            session (Session): Database session.
+            fields (tuple[str, ...]): Names of the `Role` columns to select, in order.
+            limit (int): Maximum number of roles to return.
+            after_id (int | None, optional): Only return roles with a greater ID. Defaults to None.
+            name_prefix (str | None, optional): Only return role names starting with this. Defaults to None.
+
+        Returns:
+            list[Row]: Up to ``limit`` rows of the selected columns.
+        """
+        stmt = _named_page_query(Role, limit, after_id, name_prefix)
+        return session.execute(stmt.with_only_columns(*_columns(Role, fields))).all()
+    
+    @staticmethod
+    def stream_roles_with_scopes(session: Session, batch_size: int) -> Iterator[tuple[Row, list[str]]]:
+        """
+        Stream every role with its scope names, ordered by ID.
+
+        Args:
+            session (Session): Database session.
+            batch_size (int): Rows fetched per round trip.
+
+        Yields:
+            tuple[Row, list[str]]: Each role's columns and scope names.
+        """
+        stmt = select(
+            Role.id, Role.name, Role.description, Role.created_at, Role.updated_at,
+        ).order_by(Role.id)
+        yield from _stream_with_related(
+            session, stmt, batch_size,
+            lambda ids: select(role_scope.c.role_id, Scope.name)
+            .join(Scope, Scope.id == role_scope.c.scope_id)
+            .where(role_scope.c.role_id.in_(ids)),
+        )
     
     @staticmethod
     def create_role(session: Session, data: users_schema.RoleCreate) -> Role:
@@ -176,8 +667,11 @@ class RoleRepository:
         
         role = Role(**data.model_dump(exclude=['users', 'scopes']), users=set(users), scopes=set(scopes))
         session.add(role)
+        session.flush()
+        _refresh_effective_scopes(session, _role_member_ids(role.id))
         session.commit()
-        return role
+        user_scopes_cache.clear()
+        return RoleRepository.get_role_by_id(session, role.id, loader="selectin")
     
     @staticmethod
     def update_role(session: Session, role_id: int, data: users_schema.RoleUpdate) -> Role:
@@ -192,17 +686,74 @@ class RoleRepository:
         Returns:
             Role: The updated role.
         """
-        users = session.scalars(select(User).where(User.username.in_(data.users))).all()
-        scopes = session.scalars(select(Scope).where(Scope.name.in_(data.scopes))).all()
-        
-        update_stmt = update(Role).where(Role.id == role_id).values(**data.model_dump(exclude_unset=True, exclude=["users", "scopes"]))
-        session.execute(update_stmt)
-        role = RoleRepository.get_role_by_id(session, role_id)
-        role.users.update(users)
-        role.scopes.update(scopes)
+        values = data.model_dump(exclude_unset=True, exclude=["users", "scopes"])
+        if values:
+            session.execute(update(Role).where(Role.id == role_id).values(**values))
+        if data.users:
+            _add_links(session, user_role.c.role_id, user_role.c.user_id, role_id,
+                       User.id, User.username.in_(data.users))
+        if data.scopes:
+            _add_links(session, role_scope.c.role_id, role_scope.c.scope_id, role_id,
+                       Scope.id, Scope.name.in_(data.scopes))
+        if data.users or data.scopes:
+            _refresh_effective_scopes(session, _role_member_ids(role_id))
         session.commit()
-        return role
+        user_scopes_cache.clear()
+        return RoleRepository.get_role_by_id(session, role_id, loader="selectin")
     
+    @staticmethod
+    def change_role_users(session: Session,
+                          role_id: int,
+                          action: MembershipAction,
+                          usernames: list[str]) -> tuple[int, int]:
+        """
+        Add, remove or replace the users holding a role, directly on `user_role`.
+
+        Args:
+            session (Session): Database session.
+            role_id (int): Role ID.
+            action (MembershipAction): "add", "remove" or "replace".
+            usernames (list[str]): Usernames of the users.
+
+        Returns:
+            tuple[int, int]: The number of links added and removed.
+        """
+        named_ids = select(User.id).where(User.username.in_(usernames))
+        # users dropped by a replace are not named in the request, so collect them first
+        affected = list(session.scalars(_role_member_ids(role_id))) if action == "replace" else []
+        counts = _change_links(session, user_role.c.role_id, user_role.c.user_id, role_id,
+                               User.id, User.username.in_(usernames), action)
+        _refresh_effective_scopes(session, named_ids)
+        if affected:
+            _refresh_effective_scopes(session, affected)
+        session.commit()
+        user_scopes_cache.clear()
+        return counts
+
+    @staticmethod
+    def change_role_scopes(session: Session,
+                           role_id: int,
+                           action: MembershipAction,
+                           scope_names: list[str]) -> tuple[int, int]:
+        """
+        Add, remove or replace the scopes granted by a role, directly on `role_scope`.
+
+        Args:
+            session (Session): Database session.
+            role_id (int): Role ID.
+            action (MembershipAction): "add", "remove" or "replace".
+            scope_names (list[str]): Names of the scopes.
+
+        Returns:
+            tuple[int, int]: The number of links added and removed.
+        """
+        counts = _change_links(session, role_scope.c.role_id, role_scope.c.scope_id, role_id,
+                               Scope.id, Scope.name.in_(scope_names), action)
+        _refresh_effective_scopes(session, _role_member_ids(role_id))
+        session.commit()
+        user_scopes_cache.clear()
+        return counts
+
     @staticmethod
     def delete_role(session: Session, role_id: int):
         """
@@ -213,24 +764,30 @@ class RoleRepository:
             role_id (int): Role ID.
         """
         role = RoleRepository.get_role_by_id(session, role_id)
+        affected = list(session.scalars(_role_member_ids(role_id)))
         session.delete(role)
+        session.flush()
+        _refresh_effective_scopes(session, affected)
         session.commit()
+        user_scopes_cache.clear()
 
 
+@traced_class("repository")
 class ScopeRepository:
     @staticmethod
-    def get_scope_by_id(session: Session, scope_id: int) -> Scope:
+    def get_scope_by_id(session: Session, scope_id: int, loader: LoaderStrategy = "lazy") -> Scope:
         """
         Retrieve a scope by its ID.
 
         Args:
             session (Session): Database session.
             scope_id (int): Scope ID.
+            loader (LoaderStrategy, optional): How to load the scope's roles graph. Defaults to "lazy".
 
         Returns:
             Scope: The scope with the specified ID.
         """
-        return session.get(Scope, scope_id)
+        return session.get(Scope, scope_id, options=_scope_options(loader))
     
     @staticmethod
     def get_scope_by_name(session: Session, scope_name: str) -> Scope:
@@ -247,17 +804,150 @@ class ScopeRepository:
         return session.scalar(select(Scope).where(Scope.name == scope_name))
     
     @staticmethod
-    def get_all_scopes(session: Session) -> list[Scope]:
+    def get_all_scopes(session: Session, loader: LoaderStrategy = "lazy") -> list[Scope]:
         """
         Retrieve all scopes.
 
         Args:
             session (Session): Database session.
+            loader (LoaderStrategy, optional): How to load the scopes' roles graph. Defaults to "lazy".
 
         Returns:
             list[Scope]: A list of all scopes.
         """
-        return session.scalars(select(Scope)).all()
+        return session.scalars(select(Scope).options(*_scope_options(loader))).unique().all()
+
+    @staticmethod
+    def get_scope_summaries(session: Session) -> list[ScopeSummary]:
+        """
+        Retrieve all scopes as detached summaries of their public columns.
+
+        Only the columns are selected; no `Scope` is loaded into the session.
+
+        Args:
+            session (Session): Database session.
+
+        Returns:
+            list[ScopeSummary]: Every scope, ordered by ID.
+        """
+        return _summaries(session, Scope, ScopeSummary)
+
+    @staticmethod
+    def get_scope_bits(session: Session) -> dict[str, int]:
+        """
+        Retrieve the bit every scope name has been interned to.
+
+        Names of deleted scopes keep their bit, so it is never handed to
+        another scope while tokens carrying it may still be live.
+
+        Args:
+            session (Session): Database session.
+
+        Returns:
+            dict[str, int]: Scope names mapped to their bit position.
+        """
+        return dict(session.execute(select(ScopeBit.name, ScopeBit.bit)).all())
+
+    @staticmethod
+    def get_scope_names_for_user(session: Session, user_id: int) -> set[str]:
+        """
+        Retrieve the names of every scope granted to a user through their roles.
+
+        Reads the user's rows of the materialized `user_effective_scope`
+        table by primary key, joined to `scope` for the names. The table is
+        recomputed by `_refresh_effective_scopes` in the same transaction as
+        every repository write to the user's roles or the roles' scopes.
+
+        Args:
+            session (Session): Database session.
+            user_id (int): User ID.
+
+        Returns:
+            set[str]: A set of scope names.
+        """
+        return set(session.scalars(_scope_names_for_user_query(user_id)).all())
+    
+    @staticmethod
+    def get_existing_scope_names(session: Session, scope_names: list[str]) -> set[str]:
+        """
+        Return which of the given scope names exist, in one query.
+
+        Args:
+            session (Session): Database session.
+            scope_names (list[str]): Scope names to check.
+
+        Returns:
+            set[str]: The scope names that exist.
+        """
+        if not scope_names:
+            return set()
+        return set(session.scalars(select(Scope.name).where(Scope.name.in_(scope_names))))
+
+    @staticmethod
+    def get_scopes_page(session: Session,
+                        *,
+                        limit: int,
+                        after_id: int | None = None,
+                        name_prefix: str | None = None) -> list[ScopeSummary]:
+        """
+        Retrieve one keyset page of scopes ordered by ID, as detached summaries.
+
+        Args:
+            session (Session): Database session.
+            limit (int): Maximum number of scopes to return.
+            after_id (int | None, optional): Only return scopes with a greater ID. Defaults to None.
+            name_prefix (str | None, optional): Only return scope names starting with this. Defaults to None.
+
+        Returns:
+            list[ScopeSummary]: Up to ``limit`` scopes.
+        """
+        stmt = _summary_query(_named_page_query(Scope, limit, after_id, name_prefix), Scope, ScopeSummary)
+        return list(starmap(ScopeSummary, session.execute(stmt)))
+    
+    @staticmethod
+    def get_scopes_page_rows(session: Session,
+                             fields: tuple[str, ...],
+                             *,
+                             limit: int,
+                             after_id: int | None = None,
+                             name_prefix: str | None = None) -> list[Row]:
+        """
+        Retrieve one keyset page of scopes as column rows, without loading `Scope` objects.
+
+        Args:
+            session (Session): Database session.
+            fields (tuple[str, ...]): Names of the `Scope` columns to select, in order.
+            limit (int): Maximum number of scopes to return.
+            after_id (int | None, optional): Only return scopes with a greater ID. Defaults to None.
+            name_prefix (str | None, optional): Only return scope names starting with this. Defaults to None.
+
+        Returns:
+            list[Row]: Up to ``limit`` rows of the selected columns.
+        """
+        stmt = _named_page_query(Scope, limit, after_id, name_prefix)
+        return session.execute(stmt.with_only_columns(*_columns(Scope, fields))).all()
+    
+    @staticmethod
+    def stream_scopes_with_roles(session: Session, batch_size: int) -> Iterator[tuple[Row, list[str]]]:
+        """
+        Stream every scope with its role names, ordered by ID.
+
+        Args:
+            session (Session): Database session.
+            batch_size (int): Rows fetched per round trip.
+
+        Yields:
+            tuple[Row, list[str]]: Each scope's columns and role names.
+        """
+        stmt = select(
+            Scope.id, Scope.name, Scope.description, Scope.created_at, Scope.updated_at,
+        ).order_by(Scope.id)
+        yield from _stream_with_related(
+            session, stmt, batch_size,
+            lambda ids: select(role_scope.c.scope_id, Role.name)
+            .join(Role, Role.id == role_scope.c.role_id)
+            .where(role_scope.c.scope_id.in_(ids)),
+        )
     
     @staticmethod
     def create_scope(session: Session, data: users_schema.ScopeCreate) -> Scope:
@@ -274,9 +964,14 @@ class ScopeRepository:
         roles = session.scalars(select(Role).where(Role.name.in_(data.roles))).all()
         scope = Scope(**data.model_dump(exclude=['roles']), roles=set(roles))
         session.add(scope)
+        session.flush()
+        _intern_scope_bit(session, scope.name)
+        if roles:
+            _refresh_effective_scopes(session, _scope_holder_ids(scope.id))
         session.commit()
-        session.refresh(scope)
-        return scope
+        user_scopes_cache.clear()
+        scope_catalog.invalidate()
+        return ScopeRepository.get_scope_by_id(session, scope.id, loader="selectin")
     
     @staticmethod
     def update_scope(session: Session, scope_id: int, data: users_schema.ScopeUpdate) -> Scope:
@@ -291,14 +986,19 @@ class ScopeRepository:
         Returns:
             Scope: The updated scope.
         """
-        roles = session.scalars(select(Role).where(Role.name.in_(data.roles))).all()
-        
-        update_stmt = update(Scope).where(Scope.id == scope_id).values(**data.model_dump(exclude_unset=True, exclude=["roles"]))
-        session.execute(update_stmt)
-        scope = ScopeRepository.get_scope_by_id(session, scope_id)
-        scope.roles.update(roles)
+        values = data.model_dump(exclude_unset=True, exclude=["roles"])
+        if values:
+            session.execute(update(Scope).where(Scope.id == scope_id).values(**values))
+            if "name" in values:
+                _intern_scope_bit(session, values["name"])
+        if data.roles:
+            _add_links(session, role_scope.c.scope_id, role_scope.c.role_id, scope_id,
+                       Role.id, Role.name.in_(data.roles))
+            _refresh_effective_scopes(session, _scope_holder_ids(scope_id))
         session.commit()
-        return scope
+        user_scopes_cache.clear()
+        scope_catalog.invalidate()
+        return ScopeRepository.get_scope_by_id(session, scope_id, loader="selectin")
     
     @staticmethod
     def delete_scope(session: Session, scope_id: int):
@@ -310,5 +1010,71 @@ class ScopeRepository:
             scope_id (int): Scope ID.
         """
         scope = ScopeRepository.get_scope_by_id(session, scope_id)
+        session.execute(delete(user_effective_scope).where(user_effective_scope.c.scope_id == scope_id))
         session.delete(scope)
-        session.commit()
\ No newline at end of file
+        session.commit()
+        user_scopes_cache.clear()
+        scope_catalog.invalidate()
+
+
+@traced_class("repository")
+class EffectiveScopeRepository:
+    @staticmethod
+    def refresh_users(session: Session, user_ids):
+        """
+        Recompute the effective scopes of some users without committing.
+
+        Call after changing `user_role` or `role_scope` outside this module.
+
+        Args:
+            session (Session): Database session.
+            user_ids: A list of user IDs or a select of them.
+        """
+        _refresh_effective_scopes(session, user_ids)
+
+    @staticmethod
+    def refresh_role_members(session: Session, role_id: int):
+        """
+        Recompute the effective scopes of every user holding a role, without committing.
+
+        Args:
+            session (Session): Database session.
+            role_id (int): Role ID.
+        """
+        _refresh_effective_scopes(session, _role_member_ids(role_id))
+
+    @staticmethod
+    def rebuild(session: Session) -> int:
+        """
+        Rebuild `user_effective_scope` from the association tables.
+
+        Args:
+            session (Session): Database session.
+
+        Returns:
+            int: The number of rows written.
+        """
+        session.execute(delete(user_effective_scope))
+        count = session.execute(
+            insert(user_effective_scope).from_select(["user_id", "scope_id"], _effective_scope_pairs())
+        ).rowcount
+        session.commit()
+        user_scopes_cache.clear()
+        return count
+
+    @staticmethod
+    def verify(session: Session) -> tuple[int, int]:
+        """
+        Compare `user_effective_scope` with the grants derived from the association tables.
+
+        Args:
+            session (Session): Database session.
+
+        Returns:
+            tuple[int, int]: The number of missing grants and of stale rows.
+        """
+        expected = _effective_scope_pairs()
+        actual = select(user_effective_scope.c.user_id, user_effective_scope.c.scope_id)
+        missing = session.scalar(select(func.count()).select_from(expected.except_(actual).subquery()))
+        stale = session.scalar(select(func.count()).select_from(actual.except_(expected).subquery()))
+        return missing, stale
@@ -0,0 +1,170 @@
+from itertools import starmap
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.db.models.users import User, Role, Scope
+from app.db.projections import UserSummary, RoleSummary, ScopeSummary
+from app.db.repositories.users import (
+    LoaderStrategy,
+    _user_options,
+    _role_options,
+    _scope_options,
+    _users_page_query,
+    _named_page_query,
+    _summary_query,
+    _scope_names_for_user_query,
+)
+from app.core.tracing import traced_class
+
+# asyncio sessions cannot lazy load, so every relationship a caller intends to
+# read must be requested up front through the `loader` argument.
+
+
+@traced_class("repository")
+class AsyncUserRepository:
+    @staticmethod
+    async def get_user_by_id(session: AsyncSession, id: int, loader: LoaderStrategy = "lazy") -> User:
+        """
+        Retrieve a user by their ID.
+
+        Args:
+            session (AsyncSession): Database session.
+            id (int): User ID.
+            loader (LoaderStrategy, optional): How to load the user's roles. Defaults to "lazy".
+
+        Returns:
+            User: The user with the specified ID.
+        """
+        return await session.get(User, id, options=_user_options(loader))
+
+    @staticmethod
+    async def get_user_by_username(session: AsyncSession, username: str, loader: LoaderStrategy = "lazy") -> User:
+        """
+        Retrieve a user by their username.
+
+        Args:
+            session (AsyncSession): Database session.
+            username (str): Username.
+            loader (LoaderStrategy, optional): How to load the user's roles. Defaults to "lazy".
+
+        Returns:
+            User: The user with the specified username.
+        """
+        stmt = select(User).where(User.username == username).options(*_user_options(loader))
+        return (await session.scalars(stmt)).unique().first()
+
+    @staticmethod
+    async def get_users_page(session: AsyncSession,
+                             *,
+                             limit: int,
+                             after_id: int | None = None,
+                             username_prefix: str | None = None,
+                             disabled: bool | None = None,
+                             role_name: str | None = None) -> list[UserSummary]:
+        """
+        Retrieve one keyset page of users ordered by ID, as detached summaries.
+
+        Args:
+            session (AsyncSession): Database session.
+            limit (int): Maximum number of users to return.
+            after_id (int | None, optional): Only return users with a greater ID. Defaults to None.
+            username_prefix (str | None, optional): Only return usernames starting with this. Defaults to None.
+            disabled (bool | None, optional): Only return users with this disabled flag. Defaults to None.
+            role_name (str | None, optional): Only return users holding this role. Defaults to None.
+
+        Returns:
+            list[UserSummary]: Up to ``limit`` users.
+        """
+        stmt = _users_page_query(limit, after_id, username_prefix, disabled, role_name)
+        return list(starmap(UserSummary, await session.execute(_summary_query(stmt, User, UserSummary))))
+
+
+@traced_class("repository")
+class AsyncRoleRepository:
+    @staticmethod
+    async def get_role_by_id(session: AsyncSession, role_id: int, loader: LoaderStrategy = "lazy") -> Role:
+        """
+        Retrieve a role by its ID.
+
+        Args:
+            session (AsyncSession): Database session.
+            role_id (int): Role ID.
+            loader (LoaderStrategy, optional): How to load the role's users and scopes. Defaults to "lazy".
+
+        Returns:
+            Role: The role with the specified ID.
+        """
+        return await session.get(Role, role_id, options=_role_options(loader))
+
+    @staticmethod
+    async def get_roles_page(session: AsyncSession,
+                             *,
+                             limit: int,
+                             after_id: int | None = None,
+                             name_prefix: str | None = None) -> list[RoleSummary]:
+        """
+        Retrieve one keyset page of roles ordered by ID, as detached summaries.
+
+        Args:
+            session (AsyncSession): Database session.
+            limit (int): Maximum number of roles to return.
+            after_id (int | None, optional): Only return roles with a greater ID. Defaults to None.
+            name_prefix (str | None, optional): Only return role names starting with this. Defaults to None.
+
+        Returns:
+            list[RoleSummary]: Up to ``limit`` roles.
+        """
+        stmt = _summary_query(_named_page_query(Role, limit, after_id, name_prefix), Role, RoleSummary)
+        return list(starmap(RoleSummary, await session.execute(stmt)))
+
+
+@traced_class("repository")
+class AsyncScopeRepository:
+    @staticmethod
+    async def get_scope_by_id(session: AsyncSession, scope_id: int, loader: LoaderStrategy = "lazy") -> Scope:
+        """
+        Retrieve a scope by its ID.
+
+        Args:
+            session (AsyncSession): Database session.
+            scope_id (int): Scope ID.
+            loader (LoaderStrategy, optional): How to load the scope's roles graph. Defaults to "lazy".
+
+        Returns:
+            Scope: The scope with the specified ID.
+        """
+        return await session.get(Scope, scope_id, options=_scope_options(loader))
+
+    @staticmethod
+    async def get_scopes_page(session: AsyncSession,
+                              *,
+                              limit: int,
+                              after_id: int | None = None,
+                              name_prefix: str | None = None) -> list[ScopeSummary]:
+        """
+        Retrieve one keyset page of scopes ordered by ID, as detached summaries.
+
+        Args:
+            session (AsyncSession): Database session.
+            limit (int): Maximum number of scopes to return.
+            after_id (int | None, optional): Only return scopes with a greater ID. Defaults to None.
+            name_prefix (str | None, optional): Only return scope names starting with this. Defaults to None.
+
+        Returns:
+            list[ScopeSummary]: Up to ``limit`` scopes.
+        """
+        stmt = _summary_query(_named_page_query(Scope, limit, after_id, name_prefix), Scope, ScopeSummary)
+        return list(starmap(ScopeSummary, await session.execute(stmt)))
+
+    @staticmethod
+    async def get_scope_names_for_user(session: AsyncSession, user_id: int) -> set[str]:
+        """
+        Retrieve the names of every scope granted to a user through their roles.
+
+        Args:
+            session (AsyncSession): Database session.
+            user_id (int): User ID.
+
+        Returns:
+            set[str]: A set of scope names.
+        """
+        return set((await session.scalars(_scope_names_for_user_query(user_id))).all())
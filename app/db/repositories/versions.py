@@ -0,0 +1,102 @@
+from sqlalchemy import event, inspect, select, update, insert
+from sqlalchemy.orm import Session, ORMExecuteState, sessionmaker
+from app.db.models.versions import DataVersion
+from app.core.tracing import traced_class
+
+
+# Tables whose writes change what the read endpoints return, mapped to the
+# version counters they bump. Association tables bump both sides.
+_VERSIONED_TABLES: dict[str, tuple[str, ...]] = {
+    "user": ("user",),
+    "role": ("role",),
+    "scope": ("scope",),
+    "user_role": ("user", "role"),
+    "role_scope": ("role", "scope"),
+}
+
+_CHANGED = "data_version_changes"
+
+
+@traced_class("repository")
+class DataVersionRepository:
+    @staticmethod
+    def get_versions(session: Session) -> dict[str, int]:
+        """
+        Retrieve every version counter in one query.
+
+        Args:
+            session (Session): Database session.
+
+        Returns:
+            dict[str, int]: Counter names mapped to their current version.
+        """
+        return dict(session.execute(select(DataVersion.name, DataVersion.version)).all())
+
+    @staticmethod
+    def bump(session: Session, names: set[str]):
+        """
+        Increment version counters in the session's transaction, creating missing ones.
+
+        Args:
+            session (Session): Database session.
+            names (set[str]): Names of the counters to bump.
+        """
+        result = session.execute(
+            update(DataVersion)
+            .where(DataVersion.name.in_(names))
+            .values(version=DataVersion.version + 1)
+        )
+        if result.rowcount < len(names):
+            existing = set(session.scalars(select(DataVersion.name).where(DataVersion.name.in_(names))))
+            session.execute(insert(DataVersion), [{"name": name, "version": 1} for name in names - existing])
+
+
+def _track(session: Session, table_name: str):
+    names = _VERSIONED_TABLES.get(table_name)
+    if names:
+        session.info.setdefault(_CHANGED, set()).update(names)
+
+
+def _track_statement(state: ORMExecuteState):
+    # bulk INSERT / UPDATE / DELETE statements run through Session.execute
+    if state.is_insert or state.is_update or state.is_delete:
+        _track(state.session, state.statement.table.name)
+
+
+def _track_flush(session: Session, flush_context, instances):
+    # unit-of-work changes, including many-to-many collection edits
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = inspect(obj)
+        _track(session, state.mapper.local_table.name)
+        for relationship in state.mapper.relationships:
+            if relationship.secondary is None:
+                continue
+            if obj in session.deleted or state.attrs[relationship.key].history.has_changes():
+                _track(session, relationship.secondary.name)
+
+
+def _bump_changed(session: Session):
+    # The counters are bumped in the writing transaction, so data and version
+    # commit together. The bump is the last statement before COMMIT, which keeps
+    # the counter row lock to the commit itself rather than the whole write.
+    session.flush()
+    names = session.info.pop(_CHANGED, None)
+    if names:
+        DataVersionRepository.bump(session, names)
+
+
+def _forget_changed(session: Session):
+    session.info.pop(_CHANGED, None)
+
+
+def track_data_versions(target: sessionmaker):
+    """
+    Bump the version counters on every commit of the sessions a factory makes.
+
+    Args:
+        target (sessionmaker): The session factory to register the listeners on.
+    """
+    event.listen(target, "do_orm_execute", _track_statement)
+    event.listen(target, "before_flush", _track_flush)
+    event.listen(target, "before_commit", _bump_changed)
+    event.listen(target, "after_rollback", _forget_changed)
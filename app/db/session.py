@@ -1,17 +1,59 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from fastapi import Depends
 from typing import Annotated
 from app.core import config
+from app.db.pool import InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool, instrument_pool
+from app.db.query_stats import instrument_queries
+from app.core.tracing import instrument_statements
+from app.db.repositories.versions import track_data_versions
+
+
+def engine_options(url: str, *, is_async: bool = False) -> dict:
+    """
+    Build `create_engine` keyword arguments from the pool settings in config.
+
+    Args:
+        url (str): Database URL the engine is created for.
+        is_async (bool, optional): Whether the engine uses an asyncio driver. Defaults to False.
+
+    Returns:
+        dict: Keyword arguments for `create_engine` / `create_async_engine`.
+    """
+    options = {
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_logging_name": "async" if is_async else "sync",
+    }
+    if url.startswith("sqlite"):
+        # SQLite pools per thread/file; the sizing knobs do not apply
+        options["connect_args"] = {} if is_async else {"check_same_thread": False}
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+    )
+    if config.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
 
-connect_args = ({"check_same_thread": False}
-                if (config.DATABASE_URL and config.DATABASE_URL.startswith("sqlite"))
-                else {})
 
 assert config.DATABASE_URL, "DATABASE_URL is not set in the environment"
-engine = create_engine(
-    config.DATABASE_URL, connect_args=connect_args
-)
+engine = create_engine(config.DATABASE_URL, **engine_options(config.DATABASE_URL))
+instrument_pool(engine, "sync")
+instrument_queries(engine)
+instrument_statements(engine)
+
+# The app's sessions bump the data version counters on commit; sessions made
+# elsewhere (scripts, benchmarks) do not pay for the listeners.
+SessionLocal = sessionmaker(engine)
+track_data_versions(SessionLocal)
 
 def get_session():
     """
@@ -20,7 +62,33 @@ def get_session():
     Yields:
         Session: A SQLAlchemy session.
     """
-    with Session(engine) as session:
+    with SessionLocal() as session:
         yield session
 
 SessionDep = Annotated[Session, Depends(get_session)]
+
+
+# The async engine is only built when the /v2 API is enabled, so the asyncio
+# drivers are not required otherwise.
+async_engine: AsyncEngine | None = (
+    create_async_engine(config.ASYNC_DATABASE_URL, **engine_options(config.ASYNC_DATABASE_URL, is_async=True))
+    if config.ASYNC_API_ENABLED else None
+)
+if async_engine is not None:
+    instrument_pool(async_engine.sync_engine, "async")
+    instrument_queries(async_engine.sync_engine)
+    instrument_statements(async_engine.sync_engine)
+# shares the sync factory's Session class, and so its data version listeners
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, sync_session_class=SessionLocal.class_)
+
+async def get_async_session():
+    """
+    Provide an asyncio database session.
+
+    Yields:
+        AsyncSession: A SQLAlchemy asyncio session.
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
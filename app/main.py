@@ -1,12 +1,71 @@
-from contextlib import asynccontextmanager
-from fastapi import FastAPI, APIRouter, Request
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, APIRouter, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 
-from app.api.v1.routers import auth, users
+from app.api.v1.routers import admin, auth, users, well_known
+from app.api.v2.routers import auth as auth_v2, users as users_v2
 from app.core import config
 from app.core.security import oauth2_scheme
+from app.core.cache import cache_backend
+from app.core.responses import ORJSONResponse
+from app.core.timing import QueryTimingMiddleware
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_metrics
+from app.core.tracing import TracingMiddleware, setup_tracing, shutdown_tracing
+from app.core.profiler import RequestProfilerMiddleware
+from app.core.scopes import scope_catalog
+from app.db.session import SessionLocal, async_engine
+from app.services.users import ScopeServices
+from app.services.auth import shutdown_password_executor
+from app.services.tokens import TokenServices
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_scope_catalog():
+    """
+    Reload the scope catalog in its own session, logging rather than raising on failure.
+    """
+    try:
+        with SessionLocal() as session:
+            ScopeServices.refresh_scope_catalog(session)
+    except Exception:
+        logger.exception("Could not refresh the scope catalog")
+
+
+async def keep_scope_catalog_fresh():
+    """
+    Load the scope catalog in the background and reload it whenever it goes stale.
+    """
+    while True:
+        if scope_catalog.needs_refresh():
+            await run_in_threadpool(refresh_scope_catalog)
+        await asyncio.sleep(min(config.SCOPE_CATALOG_REFRESH_SECONDS, 5))
+
+
+def sync_revocations():
+    """
+    Pull new token revocations in their own session, logging rather than raising on failure.
+    """
+    try:
+        with SessionLocal() as session:
+            TokenServices.sync_revocations(session)
+    except Exception:
+        logger.exception("Could not sync the token revocation list")
+
+
+async def keep_revocations_synced():
+    """
+    Keep the in-memory revocation list in step with the database.
+    """
+    while True:
+        await run_in_threadpool(sync_revocations)
+        await asyncio.sleep(config.REVOCATION_SYNC_SECONDS)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -17,12 +76,47 @@ async def lifespan(app: FastAPI):
         app (FastAPI): The FastAPI application instance.
     """
     # startup
+    cache_backend.start()
+    background_tasks = [
+        asyncio.create_task(keep_scope_catalog_fresh()),
+        asyncio.create_task(keep_revocations_synced()),
+    ]
     yield
     # shutdown
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    shutdown_password_executor()
+    cache_backend.close()
+    shutdown_tracing()
+    if async_engine is not None:
+        await async_engine.dispose()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if config.FAST_JSON_ENABLED else JSONResponse,
+)
 templates = Jinja2Templates(directory="app/templates")
 
+
+def _reset_openapi_schema(scopes: dict[str, str]):
+    # regenerate the cached schema so it advertises the current scopes
+    app.openapi_schema = None
+
+scope_catalog.subscribe(_reset_openapi_schema)
+
+app.add_middleware(QueryTimingMiddleware)
+if config.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+if config.TRACING_ENABLED:
+    setup_tracing()
+    app.add_middleware(TracingMiddleware)
+if config.PROFILER_REQUEST_SAMPLE_RATE > 0:
+    if config.PROFILER_REQUEST_SECRET:
+        app.add_middleware(RequestProfilerMiddleware)
+    else:
+        logger.warning("PROFILER_REQUEST_SAMPLE_RATE is set without PROFILER_REQUEST_SECRET; request profiling is off")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=config.ALLOW_ORIGINS,
@@ -33,6 +127,11 @@ app.add_middleware(
 
 app.include_router(auth.router)
 app.include_router(users.router)
+app.include_router(well_known.router)
+app.include_router(admin.router)
+if config.ASYNC_API_ENABLED:
+    app.include_router(auth_v2.router)
+    app.include_router(users_v2.router)
 
 @app.get("/", response_class=HTMLResponse)
 def read_root(request: Request):
@@ -51,3 +150,14 @@ def read_root(request: Request):
         context={"title": "FastAPI Scaffold by @ahmadkhidir"},
     )
 
+
+if config.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def read_metrics():
+        """
+        Expose the Prometheus metrics of every worker.
+
+        Returns:
+            Response: The metrics in the Prometheus text format.
+        """
+        return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
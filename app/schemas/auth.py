@@ -5,10 +5,18 @@ from pydantic import BaseModel
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
 
 
 class TokenPayload(BaseModel):
     sub: str | None = None
     exp: datetime | None = None
     scopes: list[str] = []
-
+    # compact alternative to ``scopes``: a bitmask over the scope catalog
+    smask: int | None = None
+    jti: str | None = None
+    fid: str | None = None
@@ -84,4 +84,22 @@ class UserPublic(UserBase):
     updated_at: datetime
 
 class UserPublic_Admin(UserPublic):
-    roles: list[RolePublic]
\ No newline at end of file
+    roles: list[RolePublic]
+
+class BulkCreateError(BaseModel):
+    index: int
+    username: str | None = None
+    detail: str
+
+class BulkCreateResult(BaseModel):
+    created: int = 0
+    errors: list[BulkCreateError] = []
+
+
+class MembershipUpdate(BaseModel):
+    names: list[str]
+
+class MembershipResult(BaseModel):
+    added: int = 0
+    removed: int = 0
+    unknown: list[str] = []
@@ -1,8 +1,19 @@
+import asyncio
+import contextvars
+import hashlib
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 import jwt
 from jwt import PyJWTError
 from passlib.context import CryptContext
+from fastapi import HTTPException, status
 from app.core import config
+from app.core.cache import token_cache
+from app.core.keys import key_ring
+from app.core.metrics import PASSWORD_HASH_DURATION, TOKEN_DECODE_DURATION
+from app.core.tracing import traced
 from app.schemas.auth import TokenPayload
 
 # Secret key and hashing
@@ -12,6 +23,7 @@ ACCESS_TOKEN_EXPIRE_MINUTES = config.ACCESS_TOKEN_EXPIRE_MINUTES
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+@traced("bcrypt.hash")
 def hash_password(password: str) -> str:
     """
     Hash a password using bcrypt.
@@ -22,8 +34,10 @@ def hash_password(password: str) -> str:
     Returns:
         str: The hashed password.
     """
-    return pwd_context.hash(password)
+    with PASSWORD_HASH_DURATION.labels("hash").time():
+        return pwd_context.hash(password)
 
+@traced("bcrypt.verify")
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password.
@@ -35,8 +49,153 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if the password matches, False otherwise.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    with PASSWORD_HASH_DURATION.labels("verify").time():
+        return pwd_context.verify(plain_password, hashed_password)
 
+_password_executor: Executor | None = None
+_password_executor_lock = threading.Lock()
+# Running plus queued password jobs; anything beyond this is rejected with a 503.
+_password_slots = threading.BoundedSemaphore(config.PASSWORD_POOL_WORKERS + config.PASSWORD_POOL_QUEUE_LIMIT)
+_SLOT_RETRY_SECONDS = 0.05
+
+def get_password_executor() -> Executor:
+    """
+    Return the pool dedicated to password hashing, creating it on first use.
+
+    Returns:
+        Executor: A thread or process pool sized by `PASSWORD_POOL_WORKERS`.
+    """
+    global _password_executor
+    if _password_executor is None:
+        with _password_executor_lock:
+            if _password_executor is None:
+                if config.PASSWORD_POOL_KIND == "process":
+                    _password_executor = ProcessPoolExecutor(max_workers=config.PASSWORD_POOL_WORKERS)
+                else:
+                    _password_executor = ThreadPoolExecutor(
+                        max_workers=config.PASSWORD_POOL_WORKERS,
+                        thread_name_prefix="password",
+                    )
+    return _password_executor
+
+def shutdown_password_executor():
+    """
+    Shut down the password pool, waiting for running jobs to finish.
+    """
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is not None:
+            _password_executor.shutdown(wait=True)
+            _password_executor = None
+
+def _in_caller_context(fn):
+    """
+    Run ``fn`` in copies of the caller's context when the pool is a thread pool,
+    so its spans join the request's trace. Process pools get ``fn`` unchanged.
+    """
+    if config.PASSWORD_POOL_KIND == "process":
+        return fn
+    context = contextvars.copy_context()
+    # a context can only be entered by one thread at a time, so every call gets its own copy
+    return lambda *args: context.copy().run(fn, *args)
+
+async def _run_password_job(fn, *args, wait: bool = False):
+    """
+    Run a password job on the dedicated pool without blocking the event loop.
+
+    Args:
+        fn (Callable): `hash_password` or `verify_password`.
+        *args: Arguments passed to ``fn``.
+        wait (bool, optional): Wait for a free slot instead of failing when the
+            pool and its queue are full. Defaults to False.
+
+    Returns:
+        Any: The result of ``fn``.
+
+    Raises:
+        HTTPException: If the pool and its queue are full and ``wait`` is False.
+    """
+    while wait and not _password_slots.acquire(blocking=False):
+        await asyncio.sleep(_SLOT_RETRY_SECONDS)
+    if not wait and not _password_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent authentication requests",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = get_password_executor().submit(_in_caller_context(fn), *args)
+    except BaseException:
+        _password_slots.release()
+        raise
+    # release when the job actually ends, even if the awaiting request is cancelled
+    future.add_done_callback(lambda _: _password_slots.release())
+    return await asyncio.wrap_future(future)
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password using bcrypt on the dedicated password pool.
+
+    Args:
+        password (str): The plain password to hash.
+
+    Returns:
+        str: The hashed password.
+
+    Raises:
+        HTTPException: If the password pool is saturated.
+    """
+    return await _run_password_job(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain password against a hashed password on the dedicated password pool.
+
+    Args:
+        plain_password (str): The plain password.
+        hashed_password (str): The hashed password.
+
+    Returns:
+        bool: True if the password matches, False otherwise.
+
+    Raises:
+        HTTPException: If the password pool is saturated.
+    """
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Hash many passwords on the dedicated password pool.
+
+    Meant for bulk imports: at most `PASSWORD_BULK_CONCURRENCY` hashes run at
+    a time, each holding a slot of the pool's queue limit like a login does,
+    so logins and registrations are not queued behind a whole batch. When the
+    pool is saturated the batch waits for free slots instead of failing.
+
+    Args:
+        passwords (list[str]): The plain passwords to hash.
+
+    Returns:
+        list[str]: The hashed passwords, in the same order.
+    """
+    hashes: list[str | None] = [None] * len(passwords)
+    # shared by the lanes: each takes the next password when its previous hash is done
+    pending = iter(enumerate(passwords))
+
+    async def lane():
+        for index, password in pending:
+            hashes[index] = await _run_password_job(hash_password, password, wait=True)
+
+    lanes = [asyncio.ensure_future(lane()) for _ in range(min(config.PASSWORD_BULK_CONCURRENCY, len(passwords)))]
+    try:
+        await asyncio.gather(*lanes)
+    except BaseException:
+        for task in lanes:
+            task.cancel()
+        raise
+    return hashes
+
+@traced("jwt.encode")
 def create_access_token(data: TokenPayload, expires_delta: timedelta = None):
     """
     Create a new access token.
@@ -51,28 +210,72 @@ def create_access_token(data: TokenPayload, expires_delta: timedelta = None):
     to_encode = data.model_copy()
     expire = datetime.now() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.exp = expire
-    return jwt.encode(to_encode.model_dump(), SECRET_KEY, algorithm=ALGORITHM)
+    # unset optional claims are left out; PyJWT rejects a null ``jti``
+    claims = to_encode.model_dump(exclude_none=True)
+    if key_ring.enabled:
+        key = key_ring.signing_key()
+        return jwt.encode(claims, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid})
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+@traced("jwt.decode")
+def _decode(token: str) -> dict:
+    """
+    Verify a token's signature and claims with the shared secret or the key ring.
+
+    Raises:
+        PyJWTError: If the token is malformed, expired, badly signed or has an unknown ``kid``.
+    """
+    if not key_ring.enabled:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    key = key_ring.verification_key(jwt.get_unverified_header(token).get("kid"))
+    if key is None:
+        raise jwt.InvalidKeyError("Unknown signing key")
+    return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+_NOT_CACHED = object()
+_INVALID_TOKEN = object()
 
 def decode_access_token(token: str) -> TokenPayload | None:
     """
     Decode an access token.
 
+    Validated payloads are cached by token digest until the token's ``exp``
+    (at most `TOKEN_CACHE_TTL`), so repeat requests skip signature checks and
+    validation. Invalid tokens are remembered for `TOKEN_CACHE_NEGATIVE_TTL`.
+
     Args:
         token (str): The JWT token to decode.
 
     Returns:
         TokenPayload | None: The decoded payload, or None if decoding fails.
     """
+    started = time.perf_counter()
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key, _NOT_CACHED)
+    if cached is not _NOT_CACHED:
+        TOKEN_DECODE_DURATION.labels("hit").observe(time.perf_counter() - started)
+        return None if cached is _INVALID_TOKEN else cached
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return TokenPayload.model_validate(payload)
+        payload = TokenPayload.model_validate(_decode(token))
     except PyJWTError:
-        return None
+        token_cache.set(key, _INVALID_TOKEN, ttl=config.TOKEN_CACHE_NEGATIVE_TTL)
+        payload = None
+    else:
+        ttl = payload.exp.timestamp() - time.time() if payload.exp else None
+        token_cache.set(key, payload, ttl=ttl)
+    TOKEN_DECODE_DURATION.labels("miss").observe(time.perf_counter() - started)
+    return payload
+
+# tokens signed by a key that left the ring must stop verifying right away
+key_ring.subscribe(lambda removed_kids: token_cache.clear())
 
 class AuthServices:
     pass
 
 AuthServices.hash_password = hash_password
 AuthServices.verify_password = verify_password
+AuthServices.hash_password_async = hash_password_async
+AuthServices.verify_password_async = verify_password_async
+AuthServices.hash_passwords_async = hash_passwords_async
 AuthServices.create_access_token = create_access_token
 AuthServices.decode_access_token = decode_access_token
\ No newline at end of file
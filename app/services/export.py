@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Callable, Iterator, Literal
+from sqlalchemy.engine import Row
+from app.db.session import Session, SessionLocal
+from app.db.repositories.users import UserRepository, RoleRepository, ScopeRepository
+from app.core import config
+from app.core.tracing import traced_class
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _render(stream: Callable[[Session, int], Iterator[tuple[Row, list[str]]]],
+            related_field: str,
+            format: ExportFormat) -> Iterator[str]:
+    """
+    Render a repository stream as NDJSON or CSV text chunks.
+
+    The generator owns its session, so the connection stays open for as long as
+    the response is being streamed and is released once the last row is sent.
+
+    Args:
+        stream (Callable): Repository method yielding ``(row, related names)`` pairs.
+        related_field (str): Name of the column holding the related names.
+        format (ExportFormat): Output format.
+
+    Yields:
+        str: One chunk of rendered rows per fetched batch.
+    """
+    batch_size = config.EXPORT_BATCH_SIZE
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if format == "csv" else None
+    header_written = False
+    pending = 0
+
+    with SessionLocal() as session:
+        for row, related in stream(session, batch_size):
+            record = dict(row._mapping)
+            if writer is None:
+                record[related_field] = related
+                buffer.write(json.dumps(record, default=_json_default, ensure_ascii=False))
+                buffer.write("\n")
+            else:
+                if not header_written:
+                    writer.writerow([*record.keys(), related_field])
+                    header_written = True
+                writer.writerow([
+                    *(v.isoformat() if isinstance(v, datetime) else v for v in record.values()),
+                    ";".join(related),
+                ])
+            pending += 1
+            if pending >= batch_size:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+@traced_class("service")
+class ExportServices:
+    @staticmethod
+    def export_users(format: ExportFormat) -> Iterator[str]:
+        """
+        Export every user with their role names.
+
+        Args:
+            format (ExportFormat): Output format.
+
+        Returns:
+            Iterator[str]: Rendered chunks, suitable for a streaming response.
+        """
+        return _render(UserRepository.stream_users_with_roles, "roles", format)
+
+    @staticmethod
+    def export_roles(format: ExportFormat) -> Iterator[str]:
+        """
+        Export every role with its scope names.
+
+        Args:
+            format (ExportFormat): Output format.
+
+        Returns:
+            Iterator[str]: Rendered chunks, suitable for a streaming response.
+        """
+        return _render(RoleRepository.stream_roles_with_scopes, "scopes", format)
+
+    @staticmethod
+    def export_scopes(format: ExportFormat) -> Iterator[str]:
+        """
+        Export every scope with its role names.
+
+        Args:
+            format (ExportFormat): Output format.
+
+        Returns:
+            Iterator[str]: Rendered chunks, suitable for a streaming response.
+        """
+        return _render(ScopeRepository.stream_scopes_with_roles, "roles", format)
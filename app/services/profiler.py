@@ -0,0 +1,83 @@
+import asyncio
+from typing import Literal
+from fastapi import HTTPException, status
+from app.core import config
+from app.core.profiler import Profile, SamplingProfiler, profiler_lock, request_profiles
+
+
+ProfileFormat = Literal["collapsed", "pstats"]
+
+MEDIA_TYPES: dict[ProfileFormat, str] = {
+    "collapsed": "text/plain; charset=utf-8",
+    "pstats": "application/octet-stream",
+}
+
+
+class ProfilerServices:
+    @staticmethod
+    async def profile(seconds: float, interval_ms: float | None = None) -> Profile:
+        """
+        Sample every thread of this worker for a while.
+
+        The event loop keeps serving requests meanwhile; only the sampling
+        thread is added.
+
+        Args:
+            seconds (float): How long to sample, at most `PROFILER_MAX_SECONDS`.
+            interval_ms (float | None, optional): Time between samples.
+                Defaults to `PROFILER_DEFAULT_INTERVAL_MS`.
+
+        Returns:
+            Profile: The samples.
+
+        Raises:
+            HTTPException: If a profile is already running on this worker.
+        """
+        if not profiler_lock.acquire(blocking=False):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+        try:
+            profiler = SamplingProfiler((interval_ms or config.PROFILER_DEFAULT_INTERVAL_MS) / 1000)
+            profiler.start()
+            try:
+                await asyncio.sleep(min(seconds, config.PROFILER_MAX_SECONDS))
+            finally:
+                profile = profiler.stop()
+        finally:
+            profiler_lock.release()
+        return profile
+
+    @staticmethod
+    def get_request_profile(profile_id: str) -> Profile:
+        """
+        Retrieve the profile of a sampled request.
+
+        Args:
+            profile_id (str): The id sent back in the request's ``X-Profile-Id`` header.
+
+        Returns:
+            Profile: The samples taken while the request ran.
+
+        Raises:
+            HTTPException: If no such profile is kept on this worker.
+        """
+        profile = request_profiles.get(profile_id)
+        if profile is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+        return profile
+
+    @staticmethod
+    def render(profile: Profile, format: ProfileFormat, include_idle: bool = False) -> bytes:
+        """
+        Render a profile in the requested format.
+
+        Args:
+            profile (Profile): The samples.
+            format (ProfileFormat): "collapsed" stacks for flame graphs, or a "pstats" file.
+            include_idle (bool, optional): Keep samples of idle threads. Defaults to False.
+
+        Returns:
+            bytes: The rendered profile.
+        """
+        if format == "pstats":
+            return profile.pstats(include_idle)
+        return profile.collapsed(include_idle).encode()
@@ -0,0 +1,155 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from fastapi import HTTPException, status
+from app.db.session import Session
+from app.db.models.users import User
+from app.db.repositories.tokens import RefreshTokenRepository, RevokedTokenRepository
+from app.db.repositories.users import UserRepository
+from app.core import config
+from app.core.revocation import revocation_list
+from app.core.scopes import scope_catalog
+from app.schemas.auth import Token, TokenPayload
+from app.services.auth import create_access_token
+from app.core.tracing import traced_class
+
+
+def _hash_refresh_token(refresh_token: str) -> str:
+    # refresh tokens are random, so a plain digest is enough to keep them out of the database
+    return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+    )
+
+
+@traced_class("service")
+class TokenServices:
+    @staticmethod
+    def issue_tokens(session: Session, user: User, scopes: list[str], family_id: str | None = None) -> Token:
+        """
+        Issue an access token and a refresh token for a user.
+
+        Args:
+            session (Session): Database session.
+            user (User): The authenticated user.
+            scopes (list[str]): Scopes requested at login.
+            family_id (str | None, optional): Family of a rotated refresh token;
+                a new family is started if None. Defaults to None.
+
+        Returns:
+            Token: The access and refresh tokens.
+        """
+        family_id = family_id or uuid.uuid4().hex
+        payload = TokenPayload(sub=user.username, scopes=scopes, jti=uuid.uuid4().hex, fid=family_id)
+        if config.TOKEN_SCOPE_MASK and scopes:
+            mask = scope_catalog.mask(scopes)
+            if mask is not None:
+                payload.scopes, payload.smask = [], mask
+        access_token = create_access_token(payload)
+        refresh_token = secrets.token_urlsafe(32)
+        RefreshTokenRepository.create_refresh_token(
+            session,
+            token_hash=_hash_refresh_token(refresh_token),
+            family_id=family_id,
+            user_id=user.id,
+            scopes=scopes,
+            expires_at=datetime.now() + timedelta(days=config.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        session.commit()
+        return Token(access_token=access_token, token_type="bearer", refresh_token=refresh_token)
+
+    @staticmethod
+    def refresh(session: Session, refresh_token: str) -> Token:
+        """
+        Exchange a refresh token for a new access token and refresh token.
+
+        Each refresh token can be used once. Presenting one that was already
+        used means it leaked, so its whole family is revoked, which also
+        invalidates the access tokens issued from it.
+
+        Args:
+            session (Session): Database session.
+            refresh_token (str): The refresh token.
+
+        Returns:
+            Token: The new access and refresh tokens.
+
+        Raises:
+            HTTPException: If the refresh token is unknown, expired, revoked or reused.
+        """
+        now = datetime.now()
+        stored = RefreshTokenRepository.get_refresh_token(session, _hash_refresh_token(refresh_token))
+        if not stored or stored.revoked_at or stored.expires_at <= now:
+            raise _invalid_refresh_token()
+        if not RefreshTokenRepository.mark_used(session, stored.id, now):
+            TokenServices.revoke_family(session, stored.family_id)
+            raise _invalid_refresh_token()
+        user = UserRepository.get_user_by_id(session, stored.user_id)
+        if not user or user.disabled:
+            session.rollback()
+            raise _invalid_refresh_token()
+        scopes = stored.scopes.split()
+        return TokenServices.issue_tokens(session, user, scopes, stored.family_id)
+
+    @staticmethod
+    def revoke_family(session: Session, family_id: str):
+        """
+        Revoke every refresh token of a family and the access tokens issued from it.
+
+        Args:
+            session (Session): Database session.
+            family_id (str): Id of the token family.
+        """
+        now = datetime.now()
+        # access tokens of the family are all gone once the longest-lived one expires
+        expires_at = now + timedelta(minutes=config.ACCESS_TOKEN_EXPIRE_MINUTES)
+        RefreshTokenRepository.revoke_family(session, family_id, now)
+        RevokedTokenRepository.revoke(session, family_id, expires_at)
+        session.commit()
+        revocation_list.add(family_id, expires_at)
+
+    @staticmethod
+    def logout(session: Session, payload: TokenPayload):
+        """
+        Revoke the access token and the refresh token family of the current session.
+
+        Args:
+            session (Session): Database session.
+            payload (TokenPayload): The decoded access token.
+        """
+        if payload.jti and payload.exp:
+            # ``exp`` is decoded as UTC; stored datetimes are naive like the ones tokens are signed with
+            expires_at = payload.exp.replace(tzinfo=None)
+            RevokedTokenRepository.revoke(session, payload.jti, expires_at)
+            session.commit()
+            revocation_list.add(payload.jti, expires_at)
+        if payload.fid:
+            TokenServices.revoke_family(session, payload.fid)
+
+    @staticmethod
+    def sync_revocations(session: Session):
+        """
+        Pull revocations into the in-memory revocation list.
+
+        Only rows from ``REVOCATION_SYNC_ID_LOOKBACK`` ids below the last sync
+        onwards are read, except for the periodic full rebuild, which also
+        purges expired tokens from the database.
+
+        Args:
+            session (Session): Database session.
+        """
+        now = datetime.now()
+        if revocation_list.needs_rebuild():
+            RevokedTokenRepository.delete_expired(session, now)
+            RefreshTokenRepository.delete_expired(session, now)
+            session.commit()
+            revocation_list.replace(RevokedTokenRepository.get_revoked_since(session, 0, now))
+        else:
+            # a lower id can commit after a higher one was synced; re-read a window below it
+            since = max(0, revocation_list.last_id - config.REVOCATION_SYNC_ID_LOOKBACK)
+            revocation_list.apply(RevokedTokenRepository.get_revoked_since(session, since, now))
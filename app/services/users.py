@@ -1,18 +1,75 @@
+from typing import Any, AsyncIterable
+from pydantic import ValidationError
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from app.db.session import Session
 from app.schemas import users
 from app.db.models.users import User, Role, Scope
-from app.db.repositories.users import UserRepository, RoleRepository, ScopeRepository
-from app.services.auth import hash_password
+from app.db.repositories.users import UserRepository, RoleRepository, ScopeRepository, EffectiveScopeRepository, LoaderStrategy, MembershipAction
+from app.services.auth import hash_password_async, hash_passwords_async
 from app.core import config
+from app.core.cache import user_scopes_cache
+from app.core.pagination import decode_cursor, paginate, paginate_rows
+from app.core.responses import fields_of
+from app.core.scopes import scope_catalog
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import HTTPException
+from app.core.tracing import traced_class
 
 
+_USER_PUBLIC_FIELDS = fields_of(users.UserPublic)
+_ROLE_PUBLIC_FIELDS = fields_of(users.RolePublic)
+_SCOPE_PUBLIC_FIELDS = fields_of(users.ScopePublic)
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"]
+        for err in error.errors()
+    )
+
+
+def _insert_user_chunk(session: Session,
+                       indexes: list[int],
+                       rows: list[dict]) -> tuple[int, list[users.BulkCreateError]]:
+    """
+    Insert and commit one chunk of a bulk import.
+
+    The chunk is inserted in one go; if that hits a unique violation (a
+    username taken since it was checked) each row is retried in its own
+    savepoint so only the offending rows are rejected.
+    """
+    role_names = [config.BASIC_ROLE_NAME]
+    try:
+        UserRepository.bulk_create_users(session, rows, role_names)
+        session.commit()
+        return len(rows), []
+    except IntegrityError:
+        session.rollback()
+
+    created, errors = 0, []
+    for index, row in zip(indexes, rows):
+        try:
+            with session.begin_nested():
+                UserRepository.bulk_create_users(session, [row], role_names)
+            created += 1
+        except IntegrityError:
+            errors.append(users.BulkCreateError(index=index, username=row["username"], detail="Username already exists"))
+    session.commit()
+    return created, errors
+
+
+@traced_class("service")
 class UserServices:
     @staticmethod
-    def create_user(session: Session, data: users.UserCreate):
+    async def create_user(session: Session, data: users.UserCreate):
         """
-        Create a new user.
+        Create a new user with the basic role.
+
+        Password hashing runs on the dedicated password pool and the insert in
+        the threadpool, so neither blocks the event loop. The user and their role
+        link are written in one transaction, and a taken username is detected by
+        the unique index rather than a prior lookup.
 
         Args:
             session (Session): Database session.
@@ -22,14 +79,81 @@ class UserServices:
             User: The created user.
 
         Raises:
-            HTTPException: If the username already exists.
+            HTTPException: If the username already exists or the password pool is saturated.
         """
-        if UserRepository.get_user_by_username(session, data.username):
-            raise HTTPException(status_code=400, detail="Username already exists")
-        data.password = hash_password(data.password)
-        user = UserRepository.create_user(session, data)
-        user = UserServices.admin_update_user(session, user.username, users.UserUpdate_Admin(roles=[config.BASIC_ROLE_NAME]))
-        return user
+        data = data.model_copy(update={"password": await hash_password_async(data.password)})
+
+        def _create():
+            try:
+                return UserRepository.create_user(session, data, [config.BASIC_ROLE_NAME])
+            except IntegrityError:
+                session.rollback()
+                raise HTTPException(status_code=400, detail="Username already exists")
+
+        return await run_in_threadpool(_create)
+
+    @staticmethod
+    async def bulk_create_users(session: Session, items: AsyncIterable[Any]) -> users.BulkCreateResult:
+        """
+        Create many users, each with the basic role.
+
+        Items are processed in chunks of `BULK_CREATE_CHUNK_SIZE`: one query
+        finds the usernames already taken, the passwords are hashed in parallel
+        on the password pool, then the users and their role links are inserted
+        in batches and committed. Invalid or duplicate rows are reported by
+        position instead of failing the whole import.
+
+        Args:
+            session (Session): Database session.
+            items (AsyncIterable[Any]): `UserCreate` payloads, either decoded JSON
+                values or raw JSON documents (bytes), in input order.
+
+        Returns:
+            BulkCreateResult: The number of created users and the rejected rows.
+        """
+        result = users.BulkCreateResult()
+        seen: set[str] = set()
+        chunk: list[tuple[int, users.UserCreate]] = []
+
+        async def flush():
+            existing = await run_in_threadpool(
+                UserRepository.get_existing_usernames, session, [data.username for _, data in chunk])
+            pending = []
+            for index, data in chunk:
+                if data.username in existing:
+                    result.errors.append(users.BulkCreateError(index=index, username=data.username, detail="Username already exists"))
+                else:
+                    pending.append((index, data))
+            hashes = await hash_passwords_async([data.password for _, data in pending])
+            rows = [{**data.model_dump(), "password": hashed} for (_, data), hashed in zip(pending, hashes)]
+            created, errors = await run_in_threadpool(
+                _insert_user_chunk, session, [index for index, _ in pending], rows)
+            result.created += created
+            result.errors.extend(errors)
+            chunk.clear()
+
+        index = 0
+        async for item in items:
+            try:
+                if isinstance(item, bytes):
+                    data = users.UserCreate.model_validate_json(item)
+                else:
+                    data = users.UserCreate.model_validate(item)
+            except ValidationError as e:
+                result.errors.append(users.BulkCreateError(index=index, detail=_validation_detail(e)))
+            else:
+                if data.username in seen:
+                    result.errors.append(users.BulkCreateError(index=index, username=data.username, detail="Duplicate username in request"))
+                else:
+                    seen.add(data.username)
+                    chunk.append((index, data))
+                    if len(chunk) >= config.BULK_CREATE_CHUNK_SIZE:
+                        await flush()
+            index += 1
+        if chunk:
+            await flush()
+        result.errors.sort(key=lambda error: error.index)
+        return result
 
     @staticmethod
     def get_user(session: Session, username: str):
@@ -46,17 +170,72 @@ class UserServices:
         return UserRepository.get_user_by_username(session, username)
 
     @staticmethod
-    def get_all_users(session: Session):
+    def list_users(session: Session,
+                   *,
+                   limit: int,
+                   cursor: str | None = None,
+                   username: str | None = None,
+                   disabled: bool | None = None,
+                   role: str | None = None):
         """
-        Retrieve all users.
+        Retrieve one page of users.
 
         Args:
             session (Session): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            username (str | None, optional): Username prefix filter. Defaults to None.
+            disabled (bool | None, optional): Disabled flag filter. Defaults to None.
+            role (str | None, optional): Role name filter. Defaults to None.
 
         Returns:
-            list[User]: A list of all users.
+            dict: The page items, as detached summaries, and the cursor of the next page.
+        """
+        rows = UserRepository.get_users_page(
+            session,
+            limit=limit + 1,
+            after_id=decode_cursor(cursor),
+            username_prefix=username,
+            disabled=disabled,
+            role_name=role,
+        )
+        return paginate(rows, limit)
+
+    @staticmethod
+    def list_user_rows(session: Session,
+                       *,
+                       limit: int,
+                       cursor: str | None = None,
+                       username: str | None = None,
+                       disabled: bool | None = None,
+                       role: str | None = None) -> dict:
         """
-        return UserRepository.get_all_users(session)
+        Retrieve one page of users, rendered straight from the selected columns.
+
+        The page has the shape and field order of ``Page[UserPublic]``, so it
+        can be serialized without hydrating or validating models.
+
+        Args:
+            session (Session): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            username (str | None, optional): Username prefix filter. Defaults to None.
+            disabled (bool | None, optional): Disabled flag filter. Defaults to None.
+            role (str | None, optional): Role name filter. Defaults to None.
+
+        Returns:
+            dict: The page items as dicts and the cursor of the next page.
+        """
+        rows = UserRepository.get_users_page_rows(
+            session,
+            _USER_PUBLIC_FIELDS,
+            limit=limit + 1,
+            after_id=decode_cursor(cursor),
+            username_prefix=username,
+            disabled=disabled,
+            role_name=role,
+        )
+        return paginate_rows(rows, limit)
 
     @staticmethod
     def update_user(session: Session, user: User, data: users.UserUpdate):
@@ -91,6 +270,7 @@ class UserServices:
         return user
 
 
+@traced_class("service")
 class RoleServices:
     @staticmethod
     def create_role(session: Session, role: users.RoleCreate):
@@ -112,31 +292,57 @@ class RoleServices:
         return RoleRepository.create_role(session, role)
 
     @staticmethod
-    def get_all_roles(session: Session):
+    def list_roles(session: Session, *, limit: int, cursor: str | None = None, name: str | None = None):
+        """
+        Retrieve one page of roles.
+
+        Args:
+            session (Session): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            name (str | None, optional): Role name prefix filter. Defaults to None.
+
+        Returns:
+            dict: The page items, as detached summaries, and the cursor of the next page.
+        """
+        rows = RoleRepository.get_roles_page(
+            session, limit=limit + 1, after_id=decode_cursor(cursor), name_prefix=name
+        )
+        return paginate(rows, limit)
+
+    @staticmethod
+    def list_role_rows(session: Session, *, limit: int, cursor: str | None = None, name: str | None = None) -> dict:
         """
-        Retrieve all roles.
+        Retrieve one page of roles, rendered straight from the selected columns.
 
         Args:
             session (Session): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            name (str | None, optional): Role name prefix filter. Defaults to None.
 
         Returns:
-            list[Role]: A list of all roles.
+            dict: The page items as dicts, shaped like ``Page[RolePublic]``, and the next cursor.
         """
-        return RoleRepository.get_all_roles(session)
+        rows = RoleRepository.get_roles_page_rows(
+            session, _ROLE_PUBLIC_FIELDS, limit=limit + 1, after_id=decode_cursor(cursor), name_prefix=name
+        )
+        return paginate_rows(rows, limit)
 
     @staticmethod
-    def get_role(session: Session, id: int):
+    def get_role(session: Session, id: int, loader: LoaderStrategy = "lazy"):
         """
         Retrieve a role by its ID.
 
         Args:
             session (Session): Database session.
             id (int): Role ID.
+            loader (LoaderStrategy, optional): How to load the role's users and scopes. Defaults to "lazy".
 
         Returns:
             Role: The role with the specified ID.
         """
-        return RoleRepository.get_role_by_id(session, id)
+        return RoleRepository.get_role_by_id(session, id, loader=loader)
 
     @staticmethod
     def update_role(session: Session, id: int, data: users.RoleUpdate):
@@ -153,6 +359,54 @@ class RoleServices:
         """
         return RoleRepository.update_role(session, id, data)
 
+    @staticmethod
+    def change_role_users(session: Session, id: int, action: MembershipAction, usernames: list[str]):
+        """
+        Add, remove or replace the users holding a role with set-based statements.
+
+        Args:
+            session (Session): Database session.
+            id (int): Role ID.
+            action (MembershipAction): "add", "remove" or "replace".
+            usernames (list[str]): Usernames of the users.
+
+        Returns:
+            MembershipResult: How many links were added and removed, and the unknown usernames.
+
+        Raises:
+            HTTPException: If the role is not found.
+        """
+        if not RoleRepository.get_role_by_id(session, id):
+            raise HTTPException(status_code=404, detail="Role not found")
+        existing = UserRepository.get_existing_usernames(session, usernames)
+        added, removed = RoleRepository.change_role_users(session, id, action, usernames)
+        unknown = sorted(set(usernames) - existing)
+        return users.MembershipResult(added=added, removed=removed, unknown=unknown)
+
+    @staticmethod
+    def change_role_scopes(session: Session, id: int, action: MembershipAction, scope_names: list[str]):
+        """
+        Add, remove or replace the scopes granted by a role with set-based statements.
+
+        Args:
+            session (Session): Database session.
+            id (int): Role ID.
+            action (MembershipAction): "add", "remove" or "replace".
+            scope_names (list[str]): Names of the scopes.
+
+        Returns:
+            MembershipResult: How many links were added and removed, and the unknown scope names.
+
+        Raises:
+            HTTPException: If the role is not found.
+        """
+        if not RoleRepository.get_role_by_id(session, id):
+            raise HTTPException(status_code=404, detail="Role not found")
+        existing = ScopeRepository.get_existing_scope_names(session, scope_names)
+        added, removed = RoleRepository.change_role_scopes(session, id, action, scope_names)
+        unknown = sorted(set(scope_names) - existing)
+        return users.MembershipResult(added=added, removed=removed, unknown=unknown)
+
     @staticmethod
     def delete_role(session: Session, id: int):
         """
@@ -196,9 +450,13 @@ class RoleServices:
         if not role:
             role = RoleRepository.create_role(session, users.RoleCreate(name=role_name, description=role_desc))
         role.scopes.update(scope_objects)
+        session.flush()
+        EffectiveScopeRepository.refresh_role_members(session, role.id)
         session.commit()
+        user_scopes_cache.clear()
 
 
+@traced_class("service")
 class ScopeServices:
     @staticmethod
     def create_scope(session: Session, scope: users.ScopeCreate):
@@ -217,66 +475,95 @@ class ScopeServices:
         """
         if ScopeRepository.get_scope_by_name(session, scope.name):
             raise HTTPException(status_code=400, detail="Scope already exists")
-        return ScopeRepository.create_scope(session, scope)
+        scope = ScopeRepository.create_scope(session, scope)
+        ScopeServices.refresh_scope_catalog(session)
+        return scope
 
     @staticmethod
-    def get_user_scopes(session: Session, username: str) -> set[str]:
+    def get_user_scopes(session: Session, user: User) -> frozenset[str]:
         """
         Retrieve all scopes for a user.
 
+        The result is cached per user id in the shared cache, so repeated calls
+        for the same user do not touch the database until the entry expires or
+        is invalidated, and concurrent misses load it only once.
+
         Args:
             session (Session): Database session.
-            username (str): Username.
+            user (User): The user whose scopes are resolved.
 
         Returns:
-            set[str]: A set of scope names.
+            frozenset[str]: A set of scope names.
         """
-        user = UserServices.get_user(session, username)
-        return set(scope.name for role in user.roles for scope in role.scopes)
+        return user_scopes_cache.get_or_set(
+            user.id,
+            lambda: frozenset(ScopeRepository.get_scope_names_for_user(session, user.id)),
+        )
 
     @staticmethod
-    def get_all_scopes(session: Session):
+    def list_scopes(session: Session, *, limit: int, cursor: str | None = None, name: str | None = None):
         """
-        Retrieve all scopes.
+        Retrieve one page of scopes.
 
         Args:
             session (Session): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            name (str | None, optional): Scope name prefix filter. Defaults to None.
 
         Returns:
-            list[Scope]: A list of all scopes.
+            dict: The page items, as detached summaries, and the cursor of the next page.
         """
-        return ScopeRepository.get_all_scopes(session)
+        rows = ScopeRepository.get_scopes_page(
+            session, limit=limit + 1, after_id=decode_cursor(cursor), name_prefix=name
+        )
+        return paginate(rows, limit)
 
     @staticmethod
-    def get_all_scopes_dict(session: Session) -> dict[str, str]:
+    def list_scope_rows(session: Session, *, limit: int, cursor: str | None = None, name: str | None = None) -> dict:
         """
-        Retrieve all scopes as a dictionary.
+        Retrieve one page of scopes, rendered straight from the selected columns.
 
         Args:
             session (Session): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            name (str | None, optional): Scope name prefix filter. Defaults to None.
 
         Returns:
-            dict[str, str]: A dictionary of scope names and descriptions.
+            dict: The page items as dicts, shaped like ``Page[ScopePublic]``, and the next cursor.
         """
-        try:
-            return {scope.name: scope.description for scope in ScopeServices.get_all_scopes(session)}
-        except Exception as e:
-            print("get_all_scopes_dict", e)
-            return {}
+        rows = ScopeRepository.get_scopes_page_rows(
+            session, _SCOPE_PUBLIC_FIELDS, limit=limit + 1, after_id=decode_cursor(cursor), name_prefix=name
+        )
+        return paginate_rows(rows, limit)
+
+    @staticmethod
+    def refresh_scope_catalog(session: Session):
+        """
+        Reload the live scope catalog from the database.
+
+        Args:
+            session (Session): Database session.
+        """
+        scopes = {scope.name: scope.description for scope in ScopeRepository.get_scope_summaries(session)}
+        bits = ScopeRepository.get_scope_bits(session)
+        scope_catalog.load(scopes, bits={name: bit for name, bit in bits.items() if name in scopes})
 
     @staticmethod
-    def get_scope(session: Session, id: int):
+    def get_scope(session: Session, id: int, loader: LoaderStrategy = "lazy"):
         """
         Retrieve a scope by its ID.
 
         Args:
             session (Session): Database session.
             id (int): Scope ID.
+            loader (LoaderStrategy, optional): How to load the scope's roles graph. Defaults to "lazy".
 
         Returns:
             Scope: The scope with the specified ID.
         """
-        return ScopeRepository.get_scope_by_id(session, id)
+        return ScopeRepository.get_scope_by_id(session, id, loader=loader)
 
     @staticmethod
     def update_scope(session: Session, id: int, data: users.ScopeUpdate):
@@ -291,7 +578,9 @@ class ScopeServices:
         Returns:
             Scope: The updated scope.
         """
-        return ScopeRepository.update_scope(session, id, data)
+        scope = ScopeRepository.update_scope(session, id, data)
+        ScopeServices.refresh_scope_catalog(session)
+        return scope
 
     @staticmethod
     def delete_scope(session: Session, id: int):
@@ -307,4 +596,5 @@ class ScopeServices:
         """
         if not ScopeRepository.get_scope_by_id(session, id):
             raise HTTPException(status_code=404, detail="Scope not found")
-        return ScopeRepository.delete_scope(session, id)
\ No newline at end of file
+        ScopeRepository.delete_scope(session, id)
+        ScopeServices.refresh_scope_catalog(session)
\ No newline at end of file
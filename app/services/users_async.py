@@ -0,0 +1,169 @@
+from fastapi.exceptions import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models.users import User
+from app.db.repositories.users import LoaderStrategy
+from app.db.repositories.users_async import AsyncUserRepository, AsyncRoleRepository, AsyncScopeRepository
+from app.core.cache import user_scopes_cache
+from app.core.pagination import decode_cursor, paginate
+from app.core.tracing import traced_class
+
+
+@traced_class("service")
+class AsyncUserServices:
+    @staticmethod
+    async def get_user(session: AsyncSession, username: str):
+        """
+        Retrieve a user by their username.
+
+        Args:
+            session (AsyncSession): Database session.
+            username (str): Username.
+
+        Returns:
+            User: The user with the specified username.
+        """
+        return await AsyncUserRepository.get_user_by_username(session, username)
+
+    @staticmethod
+    async def list_users(session: AsyncSession,
+                         *,
+                         limit: int,
+                         cursor: str | None = None,
+                         username: str | None = None,
+                         disabled: bool | None = None,
+                         role: str | None = None):
+        """
+        Retrieve one page of users.
+
+        Args:
+            session (AsyncSession): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            username (str | None, optional): Username prefix filter. Defaults to None.
+            disabled (bool | None, optional): Disabled flag filter. Defaults to None.
+            role (str | None, optional): Role name filter. Defaults to None.
+
+        Returns:
+            dict: The page items, as detached summaries, and the cursor of the next page.
+        """
+        rows = await AsyncUserRepository.get_users_page(
+            session,
+            limit=limit + 1,
+            after_id=decode_cursor(cursor),
+            username_prefix=username,
+            disabled=disabled,
+            role_name=role,
+        )
+        return paginate(rows, limit)
+
+
+@traced_class("service")
+class AsyncRoleServices:
+    @staticmethod
+    async def list_roles(session: AsyncSession, *, limit: int, cursor: str | None = None, name: str | None = None):
+        """
+        Retrieve one page of roles.
+
+        Args:
+            session (AsyncSession): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            name (str | None, optional): Role name prefix filter. Defaults to None.
+
+        Returns:
+            dict: The page items, as detached summaries, and the cursor of the next page.
+        """
+        rows = await AsyncRoleRepository.get_roles_page(
+            session, limit=limit + 1, after_id=decode_cursor(cursor), name_prefix=name
+        )
+        return paginate(rows, limit)
+
+    @staticmethod
+    async def get_role(session: AsyncSession, id: int, loader: LoaderStrategy = "selectin"):
+        """
+        Retrieve a role by its ID.
+
+        Args:
+            session (AsyncSession): Database session.
+            id (int): Role ID.
+            loader (LoaderStrategy, optional): How to load the role's users and scopes. Defaults to "selectin".
+
+        Returns:
+            Role: The role with the specified ID.
+
+        Raises:
+            HTTPException: If the role is not found.
+        """
+        role = await AsyncRoleRepository.get_role_by_id(session, id, loader=loader)
+        if not role:
+            raise HTTPException(status_code=404, detail="Role not found")
+        return role
+
+
+@traced_class("service")
+class AsyncScopeServices:
+    @staticmethod
+    async def get_user_scopes(session: AsyncSession, user: User) -> frozenset[str]:
+        """
+        Retrieve all scopes for a user, sharing the cache used by the sync API.
+
+        Args:
+            session (AsyncSession): Database session.
+            user (User): The user whose scopes are resolved.
+
+        Returns:
+            frozenset[str]: A set of scope names.
+        """
+        if user_scopes_cache.blocking:
+            # a networked backend must not block the event loop
+            scopes = await run_in_threadpool(user_scopes_cache.get, user.id)
+        else:
+            scopes = user_scopes_cache.get(user.id)
+        if scopes is None:
+            scopes = frozenset(await AsyncScopeRepository.get_scope_names_for_user(session, user.id))
+            if user_scopes_cache.blocking:
+                await run_in_threadpool(user_scopes_cache.set, user.id, scopes)
+            else:
+                user_scopes_cache.set(user.id, scopes)
+        return scopes
+
+    @staticmethod
+    async def list_scopes(session: AsyncSession, *, limit: int, cursor: str | None = None, name: str | None = None):
+        """
+        Retrieve one page of scopes.
+
+        Args:
+            session (AsyncSession): Database session.
+            limit (int): Page size.
+            cursor (str | None, optional): Cursor returned with the previous page. Defaults to None.
+            name (str | None, optional): Scope name prefix filter. Defaults to None.
+
+        Returns:
+            dict: The page items, as detached summaries, and the cursor of the next page.
+        """
+        rows = await AsyncScopeRepository.get_scopes_page(
+            session, limit=limit + 1, after_id=decode_cursor(cursor), name_prefix=name
+        )
+        return paginate(rows, limit)
+
+    @staticmethod
+    async def get_scope(session: AsyncSession, id: int, loader: LoaderStrategy = "selectin"):
+        """
+        Retrieve a scope by its ID.
+
+        Args:
+            session (AsyncSession): Database session.
+            id (int): Scope ID.
+            loader (LoaderStrategy, optional): How to load the scope's roles graph. Defaults to "selectin".
+
+        Returns:
+            Scope: The scope with the specified ID.
+
+        Raises:
+            HTTPException: If the scope is not found.
+        """
+        scope = await AsyncScopeRepository.get_scope_by_id(session, id, loader=loader)
+        if not scope:
+            raise HTTPException(status_code=404, detail="Scope not found")
+        return scope
@@ -0,0 +1,24 @@
+from app.db.session import Session
+from app.db.repositories.versions import DataVersionRepository
+from app.core.etag import make_etag
+from app.core.tracing import traced_class
+
+
+@traced_class("service")
+class VersionServices:
+    @staticmethod
+    def get_etag(session: Session, depends_on: tuple[str, ...], *parts) -> str:
+        """
+        Build the ETag of a response from the data versions it depends on.
+
+        Args:
+            session (Session): Database session.
+            depends_on (tuple[str, ...]): Version counters ("user", "role", "scope")
+                whose writes change the response.
+            *parts: Whatever else identifies the response (IDs, query parameters).
+
+        Returns:
+            str: A quoted ETag.
+        """
+        versions = DataVersionRepository.get_versions(session)
+        return make_etag(*(versions.get(name) for name in depends_on), *parts)
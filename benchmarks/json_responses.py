@@ -0,0 +1,106 @@
+"""
+Compare the default and the fast JSON paths of the list endpoints.
+
+The default path loads ORM objects, validates them against the response model
+and renders the result with FastAPI's `JSONResponse`. The fast path selects the
+response columns, builds dicts from the rows and renders them with orjson.
+Both bodies are checked to be byte-identical before anything is timed.
+
+Usage:
+    python -m benchmarks.json_responses [--users 5000] [--limit 500] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from statistics import median
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# the app's own engine is never used; the benchmark seeds an in-memory database
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.users import User
+from app.core.responses import ORJSONResponse
+from app.schemas.pagination import Page
+from app.schemas.users import UserPublic
+from app.services.users import UserServices
+
+
+def seed(session: Session, count: int):
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    session.execute(insert(User), [
+        {
+            "username": f"user{i:06d}",
+            "password": "x",
+            # non-ASCII text and microseconds exercise the escaping and datetime formats
+            "first_name": "Zoë" if i % 3 else "Ana",
+            "last_name": f"Nguyễn \"{i}\"",
+            "disabled": i % 7 == 0,
+            "created_at": start + timedelta(seconds=i, microseconds=i % 2 * 1234),
+            "updated_at": start + timedelta(days=1, seconds=i),
+        }
+        for i in range(count)
+    ])
+    session.commit()
+
+
+def default_body(session: Session, adapter: TypeAdapter, limit: int) -> bytes:
+    page = UserServices.list_users(session, limit=limit)
+    content = adapter.dump_python(adapter.validate_python(page, from_attributes=True), mode="json")
+    body = JSONResponse(content).body
+    session.expunge_all()
+    return body
+
+
+def fast_body(session: Session, limit: int) -> bytes:
+    return ORJSONResponse(UserServices.list_user_rows(session, limit=limit)).body
+
+
+def timed(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--limit", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    adapter = TypeAdapter(Page[UserPublic])
+    with Session(engine) as session:
+        seed(session, args.users)
+        expected = default_body(session, adapter, args.limit)
+        actual = fast_body(session, args.limit)
+        if expected != actual:
+            sys.exit("The fast path renders different bytes than the default path.")
+
+        results = {
+            "default": timed(lambda: default_body(session, adapter, args.limit), args.repeat),
+            "fast": timed(lambda: fast_body(session, args.limit), args.repeat),
+        }
+
+    print(f"{args.limit} of {args.users} users per page, {len(expected)} bytes, {args.repeat} runs")
+    for name, samples in results.items():
+        print(f"{name:>8}: median {median(samples) * 1000:8.2f} ms   min {min(samples) * 1000:8.2f} ms")
+    speedup = median(results["default"]) / median(results["fast"])
+    print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+HTTP load scenarios against a uvicorn server started on the seeded database.
+
+Each scenario keeps ``concurrency`` clients busy for ``duration`` seconds and
+reports the latency percentiles, the throughput and the number of failed
+requests.
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from statistics import quantiles
+import httpx
+from benchmarks.seed import ADMIN_USERNAME, PASSWORD
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """
+    The app served by uvicorn in a subprocess, for the duration of a ``with`` block.
+    """
+
+    def __init__(self, database_url: str, workers: int = 1):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.database_url = database_url
+        self.workers = workers
+        self.process = None
+
+    def __enter__(self) -> "Server":
+        env = dict(os.environ, DATABASE_URL=self.database_url)
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app",
+             "--port", str(self.port), "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=ROOT_DIR,
+            env=env,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError("The server exited during startup")
+            try:
+                httpx.get(self.url + "/", timeout=1)
+                return self
+            except httpx.TransportError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError("The server did not start within 30s")
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def _scenarios(token: str) -> dict[str, dict]:
+    auth = {"Authorization": f"Bearer {token}"}
+    return {
+        "login": {"method": "POST", "url": "/auth/login",
+                  "data": {"username": ADMIN_USERNAME, "password": PASSWORD}},
+        "me": {"method": "GET", "url": "/users/me", "headers": auth},
+        "list_users": {"method": "GET", "url": "/users", "params": {"limit": 50}, "headers": auth},
+        "list_roles": {"method": "GET", "url": "/users/roles", "params": {"limit": 50}, "headers": auth},
+        "list_scopes": {"method": "GET", "url": "/users/scopes", "params": {"limit": 50}, "headers": auth},
+    }
+
+
+async def _run_scenario(base_url: str, request: dict, concurrency: int, duration: float) -> dict[str, float]:
+    latencies: list[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.request(**request)
+                    ok = response.is_success
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    if len(latencies) < 2:
+        return {"p50_ms": 0.0, "p99_ms": 0.0, "rps": 0.0, "errors": errors + len(latencies)}
+    cuts = quantiles(latencies, n=100)
+    return {
+        "p50_ms": round(cuts[49] * 1000, 2),
+        "p99_ms": round(cuts[98] * 1000, 2),
+        "rps": round(len(latencies) / elapsed, 1),
+        "errors": errors,
+    }
+
+
+def run(database_url: str,
+        concurrency: int = 10,
+        duration: float = 5.0,
+        workers: int = 1,
+        only: str | None = None) -> dict[str, dict[str, float]]:
+    """
+    Serve the app and run every load scenario against it.
+
+    Args:
+        database_url (str): Database the server uses; it must already be seeded.
+        concurrency (int, optional): Concurrent clients. Defaults to 10.
+        duration (float, optional): Seconds each scenario runs. Defaults to 5.0.
+        workers (int, optional): uvicorn worker processes. Defaults to 1.
+        only (str | None, optional): Only run scenarios whose name contains this. Defaults to None.
+
+    Returns:
+        dict[str, dict[str, float]]: Scenario name to p50/p99 latency, requests per second and errors.
+    """
+    results = {}
+    with Server(database_url, workers) as server:
+        response = httpx.post(server.url + "/auth/login", data={"username": ADMIN_USERNAME, "password": PASSWORD})
+        response.raise_for_status()
+        for name, request in _scenarios(response.json()["access_token"]).items():
+            if only and only not in name:
+                continue
+            results[name] = asyncio.run(_run_scenario(server.url, request, concurrency, duration))
+            stats = results[name]
+            print(f"  {name:<15} p50 {stats['p50_ms']:>9.2f} ms   p99 {stats['p99_ms']:>9.2f} ms"
+                  f"   {stats['rps']:>9.1f} req/s   {stats['errors']} errors")
+    return results
@@ -0,0 +1,136 @@
+"""
+Micro-benchmarks of the auth helpers, the current-user dependency and the
+read methods of the repositories.
+
+Each benchmark reports the median time per call over a few timed runs, with
+caches warm as they are in a running server. Token checks are also timed
+``[cold]``, with the token cache emptied before each call, so the JWT
+signature check and payload validation are measured rather than a cache hit.
+"""
+import timeit
+from statistics import median
+from typing import Callable
+from fastapi.security import SecurityScopes
+from sqlalchemy.orm import Session
+from app.core.cache import token_cache
+from app.core.security import get_current_user
+from app.db.repositories.users import UserRepository, RoleRepository, ScopeRepository
+from app.schemas.auth import TokenPayload
+from app.services.auth import hash_password, verify_password, create_access_token, decode_access_token
+from app.services.users import ScopeServices
+from benchmarks.seed import ADMIN_USERNAME, PASSWORD, Scale, username
+
+# Listings that read every row are skipped above this many users.
+FULL_LISTING_MAX_USERS = 100_000
+
+
+def measure(fn: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Time a callable.
+
+    Args:
+        fn (Callable[[], object]): The code to time.
+        repeat (int, optional): Timed runs, each at least 0.2s long. Defaults to 5.
+
+    Returns:
+        float: Median seconds per call.
+    """
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return median(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def benchmarks(session: Session, scale: Scale) -> dict[str, Callable[[], object]]:
+    """
+    Build the micro-benchmarks against a seeded database.
+
+    Args:
+        session (Session): Database session.
+        scale (Scale): Scale the database was seeded with.
+
+    Returns:
+        dict[str, Callable[[], object]]: Benchmark name to the code it times.
+    """
+    ScopeServices.refresh_scope_catalog(session)
+    password_hash = hash_password(PASSWORD)
+    payload = TokenPayload(sub=ADMIN_USERNAME, scopes=["user:read"])
+    token = create_access_token(payload)
+    security_scopes = SecurityScopes(scopes=["user:read"])
+    middle = username(scale.users // 2)
+    user_id = UserRepository.get_user_by_username(session, middle).id
+    role_id = RoleRepository.get_role_by_name(session, "bench-role0000").id
+    scope_id = ScopeRepository.get_scope_by_name(session, "bench:scope0000").id
+
+    def fresh(fn):
+        # drop loaded objects so every call hits the database like a new request
+        def run():
+            result = fn()
+            session.expunge_all()
+            return result
+        return run
+
+    def cold(fn):
+        # forget verified tokens so every call checks the signature
+        def run():
+            token_cache.clear()
+            return fn()
+        return run
+
+    cases = {
+        "hash_password": lambda: hash_password(PASSWORD),
+        "verify_password": lambda: verify_password(PASSWORD, password_hash),
+        "create_access_token": lambda: create_access_token(payload),
+        "decode_access_token[cached]": lambda: decode_access_token(token),
+        "decode_access_token[cold]": cold(lambda: decode_access_token(token)),
+        "get_current_user[cached]": fresh(lambda: get_current_user(session, security_scopes, token)),
+        "get_current_user[cold]": cold(fresh(lambda: get_current_user(session, security_scopes, token))),
+        "UserRepository.get_user_by_id": fresh(lambda: UserRepository.get_user_by_id(session, user_id)),
+        "UserRepository.get_user_by_id[selectin]": fresh(
+            lambda: UserRepository.get_user_by_id(session, user_id, loader="selectin")),
+        "UserRepository.get_user_by_username": fresh(lambda: UserRepository.get_user_by_username(session, middle)),
+        "UserRepository.get_users_page": fresh(lambda: UserRepository.get_users_page(session, limit=50)),
+        "UserRepository.get_users_page[role]": fresh(
+            lambda: UserRepository.get_users_page(session, limit=50, role_name="bench-role0000")),
+        "UserRepository.get_users_page_rows": lambda: UserRepository.get_users_page_rows(
+            session, ("id", "username"), limit=50),
+        "UserRepository.get_existing_usernames": lambda: UserRepository.get_existing_usernames(
+            session, [username(i) for i in range(0, scale.users, max(scale.users // 100, 1))]),
+        "RoleRepository.get_role_by_id": fresh(lambda: RoleRepository.get_role_by_id(session, role_id)),
+        "RoleRepository.get_role_by_name": fresh(lambda: RoleRepository.get_role_by_name(session, "bench-role0000")),
+        "RoleRepository.get_roles_page": fresh(lambda: RoleRepository.get_roles_page(session, limit=50)),
+        "RoleRepository.get_role_summaries": lambda: RoleRepository.get_role_summaries(session),
+        "RoleRepository.get_all_roles": fresh(lambda: RoleRepository.get_all_roles(session)),
+        "ScopeRepository.get_scope_by_id": fresh(lambda: ScopeRepository.get_scope_by_id(session, scope_id)),
+        "ScopeRepository.get_scope_by_name": fresh(
+            lambda: ScopeRepository.get_scope_by_name(session, "bench:scope0000")),
+        "ScopeRepository.get_scope_names_for_user": lambda: ScopeRepository.get_scope_names_for_user(
+            session, user_id),
+        "ScopeRepository.get_scopes_page": fresh(lambda: ScopeRepository.get_scopes_page(session, limit=50)),
+        "ScopeRepository.get_scope_summaries": lambda: ScopeRepository.get_scope_summaries(session),
+        "ScopeRepository.get_all_scopes": fresh(lambda: ScopeRepository.get_all_scopes(session)),
+    }
+    if scale.users <= FULL_LISTING_MAX_USERS:
+        cases["UserRepository.get_all_users"] = fresh(lambda: UserRepository.get_all_users(session))
+        cases["UserRepository.get_user_summaries"] = lambda: UserRepository.get_user_summaries(session)
+    return cases
+
+
+def run(session: Session, scale: Scale, only: str | None = None) -> dict[str, dict[str, float]]:
+    """
+    Run the micro-benchmarks.
+
+    Args:
+        session (Session): Database session.
+        scale (Scale): Scale the database was seeded with.
+        only (str | None, optional): Only run benchmarks whose name contains this. Defaults to None.
+
+    Returns:
+        dict[str, dict[str, float]]: Benchmark name to ``{"us": microseconds per call}``.
+    """
+    results = {}
+    for name, fn in benchmarks(session, scale).items():
+        if only and only not in name:
+            continue
+        results[name] = {"us": round(measure(fn) * 1e6, 2)}
+        print(f"  {name:<45} {results[name]['us']:>12.2f} us")
+    return results
@@ -0,0 +1,136 @@
+"""
+Run the benchmark suite and compare it with the stored baseline.
+
+Usage:
+    python -m benchmarks.run [--scale small|medium|large] [--database-url URL]
+                             [--save-baseline] [--tolerance 0.5] [--skip-load] [--skip-micro]
+
+The database is seeded on first use (SQLite files live in benchmarks/.data;
+pass ``--database-url postgresql://...`` for a local Postgres). The run exits
+with status 1 if a result is worse than the baseline of the same scale by more
+than the tolerance.
+
+Timings only compare on the machine that recorded them, so the baseline is
+not committed: record one with ``--save-baseline`` (``make bench-baseline``)
+before changing the code, then compare with ``make bench``.
+"""
+import argparse
+import json
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT_DIR, "benchmarks", ".data")
+DEFAULT_BASELINE = os.path.join(ROOT_DIR, "benchmarks", "baseline.json")
+
+sys.path.insert(0, ROOT_DIR)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    List the results that regressed against a baseline.
+
+    Times and latencies regress when they grow by more than ``tolerance``;
+    throughput when it shrinks by as much. Any failed request is a regression.
+    Results missing from the baseline are not compared.
+
+    Args:
+        results (dict): Results of this run.
+        baseline (dict): Stored results of the same scale.
+        tolerance (float): Allowed relative slowdown, e.g. 0.5 for 50%.
+
+    Returns:
+        list[str]: One line per regression.
+    """
+    regressions = []
+    for name, stats in results.get("micro", {}).items():
+        base = baseline.get("micro", {}).get(name)
+        if base and stats["us"] > base["us"] * (1 + tolerance):
+            regressions.append(f"micro {name}: {stats['us']} us vs {base['us']} us")
+    for name, stats in results.get("load", {}).items():
+        if stats["errors"]:
+            regressions.append(f"load {name}: {stats['errors']} failed requests")
+        base = baseline.get("load", {}).get(name)
+        if not base:
+            continue
+        for key in ("p50_ms", "p99_ms"):
+            if stats[key] > base[key] * (1 + tolerance):
+                regressions.append(f"load {name} {key}: {stats[key]} vs {base[key]}")
+        if stats["rps"] < base["rps"] / (1 + tolerance):
+            regressions.append(f"load {name} rps: {stats['rps']} vs {base['rps']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("--scale", choices=["small", "medium", "large"], default="small")
+    parser.add_argument("--database-url", help="Defaults to a SQLite file per scale in benchmarks/.data.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline of its scale.")
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--output", help="Also write the results to this JSON file.")
+    parser.add_argument("--only", help="Only run benchmarks whose name contains this.")
+    parser.add_argument("--skip-micro", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if not database_url:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        database_url = f"sqlite:///{os.path.join(DATA_DIR, f'bench-{args.scale}.db')}"
+    # the app reads its database from the environment when it is imported
+    os.environ["DATABASE_URL"] = database_url
+
+    from sqlalchemy.orm import Session
+    from app.db.base import Base
+    from app.db.session import engine
+    from benchmarks import micro, load, seed
+
+    scale = seed.SCALES[args.scale]
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        if not seed.is_seeded(session, scale):
+            print(f"Seeding {args.scale}: {scale.users} users, {scale.roles} roles, {scale.scopes} scopes")
+            seed.seed(session, scale)
+
+    results = {}
+    if not args.skip_micro:
+        print("Micro-benchmarks")
+        with Session(engine) as session:
+            results["micro"] = micro.run(session, scale, args.only)
+    if not args.skip_load:
+        print(f"Load ({args.concurrency} clients, {args.duration:g}s per scenario)")
+        results["load"] = load.run(database_url, args.concurrency, args.duration, args.workers, args.only)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    if args.save_baseline:
+        baselines[args.scale] = results
+        with open(args.baseline, "w") as f:
+            json.dump(baselines, f, indent=2)
+            f.write("\n")
+        print(f"Baseline for {args.scale} saved to {args.baseline}")
+        return
+    if args.scale not in baselines:
+        print(f"No baseline for {args.scale}; run with --save-baseline to store one.")
+        return
+    regressions = compare(results, baselines[args.scale], args.tolerance)
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}:")
+        for line in regressions:
+            print("  " + line)
+        sys.exit(1)
+    print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Seed a database with benchmark users, roles and scopes.
+
+Every seeded user shares one password hash, so seeding does not pay for
+bcrypt once per row. Users are named ``bench0000000``, ``bench0000001``, ...;
+the first one also holds the admin role and is used to authenticate.
+"""
+import random
+from dataclasses import dataclass
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from app import cli
+from app.core import config
+from app.db.models.users import User, Role, Scope, user_role, role_scope
+from app.db.repositories.users import RoleRepository, EffectiveScopeRepository
+from app.services.auth import hash_password
+
+PASSWORD = "bench-password"
+ADMIN_USERNAME = "bench0000000"
+CHUNK_SIZE = 10_000
+SCOPES_PER_ROLE = 10
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    roles: int
+    scopes: int
+
+
+SCALES = {
+    "small": Scale(users=1_000, roles=20, scopes=50),
+    "medium": Scale(users=100_000, roles=200, scopes=200),
+    "large": Scale(users=1_000_000, roles=1_000, scopes=500),
+}
+
+
+def username(index: int) -> str:
+    return f"bench{index:07d}"
+
+
+def _chunks(rows, size: int):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def is_seeded(session: Session, scale: Scale) -> bool:
+    """
+    Check whether the database already holds the users of a scale.
+
+    Args:
+        session (Session): Database session.
+        scale (Scale): The requested scale.
+
+    Returns:
+        bool: True if exactly ``scale.users`` benchmark users exist.
+    """
+    count = session.scalar(select(func.count()).select_from(User).where(User.username.startswith("bench")))
+    return count == scale.users
+
+
+def seed(session: Session, scale: Scale):
+    """
+    Insert the benchmark data of a scale into an empty database.
+
+    Args:
+        session (Session): Database session.
+        scale (Scale): How many users, roles and scopes to create.
+    """
+    rng = random.Random(42)
+    cli.init_db()
+    basic_role = RoleRepository.get_role_by_name(session, config.BASIC_ROLE_NAME)
+    admin_role = RoleRepository.get_role_by_name(session, config.ADMIN_ROLE_NAME)
+
+    scope_ids = session.scalars(
+        insert(Scope).returning(Scope.id, sort_by_parameter_order=True),
+        [{"name": f"bench:scope{i:04d}", "description": f"benchmark scope {i}"} for i in range(scale.scopes)],
+    ).all()
+    role_ids = session.scalars(
+        insert(Role).returning(Role.id, sort_by_parameter_order=True),
+        [{"name": f"bench-role{i:04d}", "description": f"benchmark role {i}"} for i in range(scale.roles)],
+    ).all()
+    session.execute(insert(role_scope), [
+        {"role_id": role_id, "scope_id": scope_id}
+        for role_id in role_ids
+        for scope_id in rng.sample(scope_ids, min(SCOPES_PER_ROLE, len(scope_ids)))
+    ])
+
+    password = hash_password(PASSWORD)
+    users = (
+        {"username": username(i), "password": password, "first_name": "Bench", "last_name": f"User {i}"}
+        for i in range(scale.users)
+    )
+    for chunk in _chunks(users, CHUNK_SIZE):
+        user_ids = session.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), chunk).all()
+        links = []
+        for user_id in user_ids:
+            links.append({"user_id": user_id, "role_id": basic_role.id})
+            links.append({"user_id": user_id, "role_id": rng.choice(role_ids)})
+        session.execute(insert(user_role), links)
+    admin_id = session.scalar(select(User.id).where(User.username == ADMIN_USERNAME))
+    session.execute(insert(user_role), [{"user_id": admin_id, "role_id": admin_role.id}])
+    session.commit()
+    EffectiveScopeRepository.rebuild(session)
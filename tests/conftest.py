@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+# The engine is created from DATABASE_URL when app.db.session is imported, so
+# point it at a throwaway SQLite file before any app module is loaded.
+_db_dir = tempfile.mkdtemp(prefix="app-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["ASYNC_API_ENABLED"] = "true"
+
+import pytest
+from contextlib import contextmanager
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from app.core import config
+from app.db.base import Base
+from app.db.models.users import User
+from app.db.repositories.users import EffectiveScopeRepository, RoleRepository
+from app.db.session import engine, get_session
+from app.services.auth import hash_password
+
+ADMIN_USERNAME = "admin"
+ADMIN_PASSWORD = "admin-password"
+
+
+@pytest.fixture(scope="session")
+def database():
+    """
+    Create the schema, the default roles and scopes and an admin user.
+    """
+    from app import cli
+
+    Base.metadata.create_all(engine)
+    cli.init_db()
+    with next(get_session()) as session:
+        admin = User(
+            username=ADMIN_USERNAME,
+            password=hash_password(ADMIN_PASSWORD),
+            first_name="Admin",
+            last_name="User",
+            roles={
+                RoleRepository.get_role_by_name(session, config.BASIC_ROLE_NAME),
+                RoleRepository.get_role_by_name(session, config.ADMIN_ROLE_NAME),
+            },
+        )
+        session.add(admin)
+        session.flush()
+        EffectiveScopeRepository.refresh_users(session, [admin.id])
+        session.commit()
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="session")
+def client(database):
+    """
+    Test client running the app's lifespan.
+    """
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def session(database):
+    with next(get_session()) as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    """
+    Authorization header of the admin user.
+    """
+    response = client.post("/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def count_queries(database):
+    """
+    Count the statements sent to the database inside a ``with`` block.
+
+    Yields:
+        Callable: Context manager yielding the list of statements executed so far.
+    """
+    @contextmanager
+    def counting():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    return counting
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from app.core.revocation import revocation_list
+from app.db.models.tokens import RevokedToken
+from app.schemas.auth import TokenPayload
+from app.services.auth import create_access_token, decode_access_token
+from app.services.tokens import TokenServices
+from tests.conftest import ADMIN_PASSWORD, ADMIN_USERNAME
+
+
+def test_token_without_jti_decodes():
+    token = create_access_token(TokenPayload(sub=ADMIN_USERNAME, scopes=["me"]))
+
+    payload = decode_access_token(token)
+
+    assert payload is not None
+    assert payload.sub == ADMIN_USERNAME
+    assert payload.jti is None
+
+
+def test_login_then_read_me(client):
+    response = client.post("/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    token = response.json()["access_token"]
+
+    response = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["username"] == ADMIN_USERNAME
+
+
+def test_refresh_rotates_and_rejects_reuse(client):
+    response = client.post("/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    refresh_token = response.json()["refresh_token"]
+
+    rotated = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert rotated.status_code == 200, rotated.text
+    assert rotated.json()["refresh_token"] != refresh_token
+
+    replayed = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert replayed.status_code == 401
+
+
+def test_sync_picks_up_a_lower_id_committed_late(session):
+    TokenServices.sync_revocations(session)
+    base = (session.scalar(select(func.max(RevokedToken.id))) or 0) + 10
+    expires_at = datetime.now() + timedelta(minutes=5)
+    session.add(RevokedToken(id=base + 5, jti="late-sync-high", expires_at=expires_at))
+    session.commit()
+    TokenServices.sync_revocations(session)
+    assert revocation_list.last_id >= base + 5
+
+    # inserted earlier, committed after the higher id was already synced
+    session.add(RevokedToken(id=base + 1, jti="late-sync-low", expires_at=expires_at))
+    session.commit()
+    TokenServices.sync_revocations(session)
+
+    assert not revocation_list.needs_rebuild()
+    assert revocation_list.is_revoked("late-sync-low")
@@ -0,0 +1,127 @@
+import threading
+import time
+import pytest
+from app.core import config
+from app.core.cache import CacheNamespace, LocalCacheBackend, RedisCacheBackend
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _worker(server, name: str = "things") -> CacheNamespace:
+    # one backend per simulated worker, all talking to the same server
+    backend = RedisCacheBackend(client=fakeredis.FakeRedis(server=server))
+    return CacheNamespace(backend, name, ttl=60)
+
+
+def test_values_round_trip_through_redis(server):
+    cache = _worker(server)
+
+    cache.set(1, ["a", "b"])
+
+    assert cache.get(1) == ["a", "b"]
+    assert cache.get(2, "missing") == "missing"
+    assert _worker(server).get(1) == ["a", "b"]
+
+
+def test_clear_invalidates_every_worker(server, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_GENERATION_TTL", 60)
+    first, second = _worker(server), _worker(server)
+    first.set(1, "old")
+    assert second.get(1) == "old"
+
+    first.clear()
+    # `second` still trusts its generation until told otherwise
+    assert second.get(1) == "old"
+    second.backend.start()
+    try:
+        first.clear()
+        deadline = time.monotonic() + 5
+        while second.get(1) is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        second.backend.close()
+
+    assert second.get(1) is None
+    assert first.get(1) is None
+
+
+def test_generation_is_reread_after_its_ttl(server, monkeypatch):
+    monkeypatch.setattr(config, "CACHE_GENERATION_TTL", 0)
+    first, second = _worker(server), _worker(server)
+    first.set(1, "old")
+    assert second.get(1) == "old"
+
+    first.clear()
+
+    assert second.get(1) is None
+
+
+@pytest.mark.parametrize("shared_backend", [True, False])
+def test_get_or_set_loads_once(server, shared_backend):
+    if shared_backend:
+        caches = [_worker(server)] * 8
+    else:
+        caches = [_worker(server) for _ in range(8)]
+    calls = []
+    start = threading.Barrier(len(caches))
+    results = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return "loaded"
+
+    def run(cache):
+        start.wait()
+        results.append(cache.get_or_set("key", loader))
+
+    threads = [threading.Thread(target=run, args=(cache,)) for cache in caches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["loaded"] * len(caches)
+    assert len(calls) == 1
+
+
+def test_unreachable_redis_falls_through_to_the_loader(server):
+    cache = _worker(server)
+    cache.set(1, "cached")
+    server.connected = False
+
+    assert cache.get_or_set(2, lambda: "loaded") == "loaded"
+    assert cache.get(1, "default") == "default"
+    cache.set(3, "value")
+    cache.delete(1)
+    cache.clear()
+    assert cache.stats()["errors"] > 0
+
+    server.connected = True
+    assert cache.get_or_set(2, lambda: "reloaded") == "reloaded"
+
+
+def test_local_backend_get_or_set():
+    cache = CacheNamespace(LocalCacheBackend(maxsize=10), "local-things", ttl=60)
+
+    assert cache.get_or_set(1, lambda: {"a"}) == {"a"}
+    assert cache.get_or_set(1, lambda: {"b"}) == {"a"}
+    cache.clear()
+    assert cache.get(1) is None
+
+
+def test_authentication_survives_a_cache_outage(client, admin_headers, server, monkeypatch):
+    from app.core.cache import user_scopes_cache
+
+    server.connected = False
+    monkeypatch.setattr(user_scopes_cache, "backend", RedisCacheBackend(client=fakeredis.FakeRedis(server=server)))
+    monkeypatch.setattr(user_scopes_cache, "_generation", None)
+
+    response = client.get("/users/me", headers=admin_headers)
+
+    assert response.status_code == 200, response.text
@@ -0,0 +1,70 @@
+import pytest
+from app.core.etag import rendered_cache
+from app.db.models.users import Role, Scope, User
+
+
+def _add_users(session, role: Role, prefix: str, count: int):
+    for i in range(count):
+        role.users.add(User(username=f"{prefix}-{i}", password="x", first_name="F", last_name="L"))
+
+
+@pytest.fixture
+def role_graph(session, request):
+    """
+    A scope granted to a role, both ready to have members added.
+    """
+    name = request.node.name
+    role = Role(name=f"{name}-role", description="")
+    scope = Scope(name=f"{name}:read", description="")
+    role.scopes.add(scope)
+    session.add(role)
+    session.commit()
+    return role, scope
+
+
+def _statements(client, headers, count_queries, path: str) -> int:
+    # the first call warms the per-worker caches (token, scopes, versions);
+    # the rendered body is dropped so the measured call loads the graph
+    assert client.get(path, headers=headers).status_code == 200
+    rendered_cache.clear()
+    with count_queries() as statements:
+        response = client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    return len(statements)
+
+
+def test_read_role_query_count_does_not_grow_with_members(client, admin_headers, session, count_queries, role_graph):
+    role, _ = role_graph
+    path = f"/users/roles/{role.id}"
+
+    _add_users(session, role, "small", 2)
+    session.commit()
+    small = _statements(client, admin_headers, count_queries, path)
+
+    _add_users(session, role, "large", 40)
+    session.commit()
+    large = _statements(client, admin_headers, count_queries, path)
+
+    assert len(client.get(path, headers=admin_headers).json()["users"]) == 42
+    assert large == small
+
+
+def test_read_scope_query_count_does_not_grow_with_members(client, admin_headers, session, count_queries, role_graph):
+    _, scope = role_graph
+    path = f"/users/scopes/{scope.id}"
+
+    extra = Role(name="scope-role", description="")
+    scope.roles.add(extra)
+    _add_users(session, extra, "scope-small", 2)
+    session.commit()
+    small = _statements(client, admin_headers, count_queries, path)
+
+    for i in range(10):
+        role = Role(name=f"scope-role-{i}", description="")
+        scope.roles.add(role)
+        _add_users(session, role, f"scope-large-{i}", 5)
+    session.commit()
+    large = _statements(client, admin_headers, count_queries, path)
+
+    assert len(client.get(path, headers=admin_headers).json()["roles"]) == 12
+    assert large == small
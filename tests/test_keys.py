@@ -0,0 +1,57 @@
+import os
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+from app.core.keys import KeyRing
+
+
+def _write_key(keys_dir, kid: str) -> bytes:
+    pem = ed25519.Ed25519PrivateKey.generate().private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    (keys_dir / f"{kid}.pem").write_bytes(pem)
+    return pem
+
+
+@pytest.fixture
+def ring(tmp_path):
+    _write_key(tmp_path, "first")
+    ring = KeyRing(str(tmp_path), None, reload_seconds=0)
+    assert ring.signing_key().kid == "first"
+    return ring
+
+
+def test_half_written_key_keeps_previous_ring(ring, tmp_path):
+    pem = _write_key(tmp_path, "second")
+    (tmp_path / "second.pem").write_bytes(pem[: len(pem) // 2])
+
+    assert ring.signing_key().kid == "first"
+    assert ring.verification_key("first") is not None
+
+
+def test_missing_directory_keeps_previous_ring(ring, tmp_path):
+    for name in os.listdir(tmp_path):
+        os.remove(tmp_path / name)
+    os.rmdir(tmp_path)
+
+    assert ring.signing_key().kid == "first"
+
+
+def test_active_kid_before_its_file_keeps_previous_ring(ring, tmp_path):
+    ring.active_kid = "next"
+    _write_key(tmp_path, "other")
+    assert ring.signing_key().kid == "first"
+
+    _write_key(tmp_path, "next")
+    assert ring.signing_key().kid == "next"
+
+
+def test_first_load_failure_raises(tmp_path):
+    ring = KeyRing(str(tmp_path / "missing"), None, reload_seconds=60)
+
+    with pytest.raises(FileNotFoundError):
+        ring.signing_key()
+    with pytest.raises(FileNotFoundError):
+        ring.signing_key()
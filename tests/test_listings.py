@@ -0,0 +1,34 @@
+import pytest
+from app.db.projections import RoleSummary, ScopeSummary, UserSummary
+from app.services.users import RoleServices, ScopeServices, UserServices
+
+
+def test_list_services_return_detached_summaries(session):
+    pages = [
+        (UserServices.list_users(session, limit=2), UserSummary),
+        (RoleServices.list_roles(session, limit=2), RoleSummary),
+        (ScopeServices.list_scopes(session, limit=2), ScopeSummary),
+    ]
+
+    for page, summary in pages:
+        assert page["items"]
+        assert all(type(item) is summary for item in page["items"])
+    assert not session.identity_map
+
+
+@pytest.mark.parametrize("path", ["/users", "/users/roles", "/users/scopes", "/v2/users", "/v2/users/roles", "/v2/users/scopes"])
+def test_list_pages_follow_cursors(client, admin_headers, path):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, headers=admin_headers, params=params)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == len(set(seen)) > 0
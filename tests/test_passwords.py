@@ -0,0 +1,56 @@
+import asyncio
+import threading
+import time
+from app.services import auth
+
+
+def test_bulk_hashing_is_capped_and_keeps_order(monkeypatch):
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_hash(password: str) -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return f"hashed-{password}"
+
+    monkeypatch.setattr(auth, "hash_password", fake_hash)
+    monkeypatch.setattr(auth.config, "PASSWORD_BULK_CONCURRENCY", 2)
+    passwords = [str(i) for i in range(10)]
+
+    hashes = asyncio.run(auth.hash_passwords_async(passwords))
+
+    assert hashes == [f"hashed-{p}" for p in passwords]
+    assert peak <= 2
+
+
+def test_bulk_hashing_waits_for_free_slots(monkeypatch):
+    monkeypatch.setattr(auth, "hash_password", lambda password: password[::-1])
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(auth, "_password_slots", slots)
+    slots.acquire()
+    threading.Timer(0.1, slots.release).start()
+
+    assert asyncio.run(auth.hash_passwords_async(["abc", "de"])) == ["cba", "ed"]
+    # every slot taken by the batch was given back
+    assert slots.acquire(blocking=False)
+
+
+def test_bulk_create_users(client, admin_headers):
+    payload = [
+        {"username": f"bulk-{i}", "password": f"pw-{i}", "first_name": "Bulk", "last_name": "User"}
+        for i in range(3)
+    ] + [{"username": "bulk-0", "password": "pw", "first_name": "Dup", "last_name": "User"}]
+
+    response = client.post("/users/bulk", json=payload, headers=admin_headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["created"] == 3
+    assert [error["index"] for error in response.json()["errors"]] == [3]
+    login = client.post("/auth/login", data={"username": "bulk-1", "password": "pw-1"})
+    assert login.status_code == 200, login.text
@@ -0,0 +1,47 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core import config
+from app.core.profiler import RequestProfilerMiddleware, profiler_lock, request_profiles
+
+
+def _client(monkeypatch, secret: str) -> TestClient:
+    monkeypatch.setattr(config, "PROFILER_REQUEST_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(config, "PROFILER_REQUEST_SECRET", secret)
+    app = FastAPI()
+    app.add_middleware(RequestProfilerMiddleware)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def profiled_client(monkeypatch):
+    return _client(monkeypatch, "s3cret")
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-Profile": "1"}, {"X-Profile": "wrong"}])
+def test_header_without_the_secret_is_ignored(profiled_client, headers):
+    response = profiled_client.get("/ping", headers=headers)
+
+    assert response.status_code == 200
+    assert "x-profile-id" not in response.headers
+    assert not profiler_lock.locked()
+
+
+def test_header_with_the_secret_is_profiled(profiled_client):
+    response = profiled_client.get("/ping", headers={"X-Profile": "s3cret"})
+
+    assert response.status_code == 200
+    assert request_profiles.get(response.headers["x-profile-id"]) is not None
+
+
+def test_empty_secret_disables_the_header(monkeypatch):
+    client = _client(monkeypatch, "")
+
+    response = client.get("/ping", headers={"X-Profile": ""})
+
+    assert "x-profile-id" not in response.headers
@@ -0,0 +1,62 @@
+import pytest
+from fastapi import HTTPException
+from fastapi.security import SecurityScopes
+from app.core import security
+from app.core.scopes import ScopeCatalog, scope_catalog as global_catalog
+from app.db.repositories.users import ScopeRepository
+from app.schemas.auth import TokenPayload
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    catalog = ScopeCatalog(max_age=300)
+    catalog.load({"user:read": "", "role:read": ""}, bits={"user:read": 1, "role:read": 2})
+    monkeypatch.setattr(security, "scope_catalog", catalog)
+    return catalog
+
+
+def _check(scopes: list[str], payload: TokenPayload, user_scopes: set[str]):
+    security._check_scopes(SecurityScopes(scopes=scopes), payload, frozenset(user_scopes), "Bearer")
+
+
+def test_mask_token_with_grant_unknown_to_catalog(catalog):
+    payload = TokenPayload(sub="someone", smask=1 << 1)
+
+    # "scope:new" was created on another worker and is not in this catalog yet
+    _check(["user:read"], payload, {"user:read", "scope:new"})
+
+    assert catalog.needs_refresh()
+
+
+def test_mask_token_without_the_bit_is_rejected(catalog):
+    payload = TokenPayload(sub="someone", smask=1 << 2)
+
+    with pytest.raises(HTTPException) as excinfo:
+        _check(["user:read"], payload, {"user:read", "scope:new"})
+    assert excinfo.value.status_code == 401
+
+
+def test_known_scopes_use_the_masks(catalog):
+    _check(["user:read"], TokenPayload(sub="someone"), {"user:read", "role:read"})
+    _check(["role:read"], TokenPayload(sub="someone", scopes=["role:read"]), {"user:read", "role:read"})
+
+    with pytest.raises(HTTPException):
+        _check(["role:read"], TokenPayload(sub="someone", scopes=["user:read"]), {"user:read", "role:read"})
+    assert not catalog.needs_refresh()
+
+
+def test_scope_bits_are_dense_and_never_reused(client, admin_headers, session):
+    created = client.post("/users/scopes", json={"name": "bits:first", "description": ""}, headers=admin_headers)
+    assert created.status_code in (200, 201), created.text
+    first_bit = ScopeRepository.get_scope_bits(session)["bits:first"]
+    assert client.delete(f"/users/scopes/{created.json()['id']}", headers=admin_headers).status_code == 200
+
+    client.post("/users/scopes", json={"name": "bits:second", "description": ""}, headers=admin_headers)
+    bits = ScopeRepository.get_scope_bits(session)
+
+    assert bits["bits:second"] == max(bits.values())
+    assert bits["bits:second"] != first_bit
+    assert bits["bits:first"] == first_bit
+    # the deleted name keeps its bit in the database but leaves the live catalog
+    assert global_catalog.bit("bits:first") is None
+    assert global_catalog.bit("bits:second") == bits["bits:second"]
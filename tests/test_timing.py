@@ -0,0 +1,16 @@
+from app.core import config
+
+
+def test_server_timing_is_off_by_default(client):
+    response = client.post("/auth/login", data={"username": "nobody", "password": "wrong"})
+
+    assert "server-timing" not in response.headers
+
+
+def test_server_timing_counts_queries_when_enabled(client, admin_headers, monkeypatch):
+    monkeypatch.setattr(config, "SERVER_TIMING_ENABLED", True)
+
+    response = client.get("/users/me", headers=admin_headers)
+
+    assert 'db;dur=' in response.headers["server-timing"]
+    assert "queries" in response.headers["server-timing"]
@@ -0,0 +1,35 @@
+import pytest
+from app.services.auth import decode_access_token
+from tests.conftest import ADMIN_PASSWORD, ADMIN_USERNAME
+
+
+@pytest.mark.parametrize("path", ["/v2/users/roles/999999", "/v2/users/scopes/999999"])
+def test_unknown_id_is_not_found(client, admin_headers, path):
+    response = client.get(path, headers=admin_headers)
+
+    assert response.status_code == 404
+
+
+def test_read_role(client, admin_headers):
+    role = client.get("/users/roles", headers=admin_headers).json()["items"][0]
+
+    response = client.get(f"/v2/users/roles/{role['id']}", headers=admin_headers)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == role["name"]
+
+
+def test_login_issues_revocable_tokens(client):
+    response = client.post("/v2/auth/login", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    assert response.status_code == 200, response.text
+    tokens = response.json()
+    payload = decode_access_token(tokens["access_token"])
+    assert payload.jti and payload.fid
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert client.get("/v2/users/me", headers=headers).status_code == 200
+
+    rotated = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert rotated.status_code == 200, rotated.text
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    assert client.get("/v2/users/me", headers=headers).status_code == 401
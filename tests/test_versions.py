@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from app.db.models.users import Role
+from app.db.models.versions import DataVersion
+from app.db.repositories.versions import DataVersionRepository
+from app.db.session import engine
+
+
+def test_role_write_changes_etag(client, admin_headers, session):
+    role = Role(name="versioned-role", description="before")
+    session.add(role)
+    session.commit()
+    path = f"/users/roles/{role.id}"
+    first = client.get(path, headers=admin_headers)
+
+    role.description = "after"
+    session.commit()
+    second = client.get(path, headers=admin_headers)
+
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json()["description"] == "after"
+    stale = client.get(path, headers={**admin_headers, "If-None-Match": first.headers["ETag"]})
+    assert stale.status_code == 200
+    fresh = client.get(path, headers={**admin_headers, "If-None-Match": second.headers["ETag"]})
+    assert fresh.status_code == 304
+
+
+def test_versions_are_bumped_in_the_writing_transaction(session):
+    log = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        log.append(statement.split()[0:3])
+
+    def commit(conn):
+        log.append(["COMMIT"])
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "commit", commit)
+    try:
+        session.add(Role(name="versioned-role-2", description=""))
+        session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(engine, "commit", commit)
+
+    insert = log.index(["INSERT", "INTO", "role"])
+    bump = log.index(["UPDATE", "data_version", "SET"])
+    assert insert < bump
+    assert log[bump + 1:] == [["COMMIT"]]
+
+
+def test_failed_bump_rolls_back_the_write(session, monkeypatch):
+    def fail(session, names):
+        raise RuntimeError("data_version is unavailable")
+
+    monkeypatch.setattr(DataVersionRepository, "bump", fail)
+    session.add(Role(name="versioned-role-3", description=""))
+    with pytest.raises(RuntimeError):
+        session.commit()
+    session.rollback()
+
+    assert session.scalar(select(Role).where(Role.name == "versioned-role-3")) is None
+
+
+def test_plain_sessions_do_not_track_versions(database):
+    version = select(DataVersion.version).where(DataVersion.name == "role")
+    with Session(engine) as session:
+        before = session.scalar(version)
+        session.add(Role(name="versioned-role-4", description=""))
+        session.commit()
+
+        assert session.scalar(version) == before